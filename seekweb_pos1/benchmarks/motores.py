@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Compara os motores de base de dados (MySQL e SQLite) com o trabalho típico de uma caixa.
+
+Uso (a partir da pasta do projeto):
+    python benchmarks/motores.py                 # só SQLite, num ficheiro temporário
+    python benchmarks/motores.py --mysql         # também o MySQL do config.ini
+
+Atenção: com --mysql são gravadas vendas de teste na base de dados configurada;
+use uma base de dados de testes.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import Config
+from core.database import Database
+from core.migracoes import atualizar_base_dados
+from core.motores import MotorSQLite
+from core.periodo import Periodo
+from models.produto import Produto
+from models.venda import Venda
+
+QUERY_DIA = """
+SELECT COALESCE(SUM(quantidade), 0) as quantidade, COALESCE(SUM(total_com_iva), 0) as total
+FROM resumo_vendas_dia
+WHERE data >= %s AND data < %s
+"""
+
+QUERY_SEMANA = """
+SELECT data, SUM(total_com_iva) as total
+FROM resumo_vendas_dia
+WHERE data >= %s AND data < %s
+GROUP BY data
+ORDER BY data
+"""
+
+def medir(funcao, repeticoes):
+    """Tempos em milissegundos de cada chamada"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+def resumo(tempos):
+    ordenados = sorted(tempos)
+    p95 = ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))]
+    return f"média {statistics.mean(tempos):7.3f} ms | p50 {statistics.median(tempos):7.3f} ms | p95 {p95:7.3f} ms"
+
+def executar(db, args):
+    """Leituras por código de barras, vendas completas e consultas do dashboard"""
+    produto_modelo = Produto(db)  # sem catálogo: mede a ida à base de dados
+    venda_modelo = Venda(db)
+
+    produto = max(db.execute_query(
+        "SELECT p.*, t.taxa as taxa_iva FROM produtos p JOIN taxas_iva t ON p.taxa_iva_id = t.id WHERE p.ativo = 1"),
+        key=lambda p: p['stock'])
+    preco = float(produto['preco_venda'])
+    iva = round(preco * float(produto['taxa_iva']) / 100, 2)
+    dados = {'empresa_id': produto['empresa_id'], 'caixa_id': args.caixa, 'usuario_id': 1, 'cliente_id': None,
+             'total_sem_iva': preco, 'total_iva': iva, 'total_com_iva': preco + iva}
+    itens = [{'produto_id': produto['id'], 'quantidade': 1, 'preco_unitario': preco,
+              'taxa_iva_id': produto['taxa_iva_id'], 'valor_iva': iva, 'subtotal': preco + iva, 'desconto': 0.0}]
+    pagamentos = [{'forma_pagamento_id': 1, 'valor': preco + iva, 'troco': 0}]
+
+    resultados = {}
+    # Os prints dos modelos ficam fora do terminal (mas dentro do tempo, como na aplicação)
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultados['produto por código'] = medir(
+            lambda: produto_modelo.obter_por_codigo_barras(produto['codigo_barras']), args.leituras)
+        resultados['venda completa'] = medir(
+            lambda: venda_modelo.processar_venda_completa(dados, itens, pagamentos), args.vendas)
+        resultados['dashboard: vendas hoje'] = medir(
+            lambda: db.execute_query(QUERY_DIA, Periodo.hoje().datas), args.consultas)
+        resultados['dashboard: semana'] = medir(
+            lambda: db.execute_query(QUERY_SEMANA, Periodo.ultimos_dias(7).datas), args.consultas)
+    return resultados
+
+def config_sqlite(pasta):
+    """config.ini temporário com o motor SQLite e o schema de teste"""
+    ficheiro = os.path.join(pasta, 'benchmark.db')
+    MotorSQLite.aplicar_schema(ficheiro, 'schema_sqlite.sql')
+    config = Config(os.path.join(pasta, 'config.ini'))
+    config.config['Database']['motor'] = 'sqlite'
+    config.config['Database']['ficheiro'] = ficheiro
+    return config
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de base de dados")
+    parser.add_argument('--mysql', action='store_true', help="incluir o MySQL do config.ini (grava vendas de teste)")
+    parser.add_argument('--leituras', type=int, default=2000)
+    parser.add_argument('--vendas', type=int, default=200)
+    parser.add_argument('--consultas', type=int, default=200)
+    parser.add_argument('--caixa', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        configs = [('sqlite', config_sqlite(pasta))]
+        if args.mysql:
+            config = Config()
+            config.config['Database']['motor'] = 'mysql'
+            configs.insert(0, ('mysql', config))
+
+        for nome, config in configs:
+            db = Database(config)
+            with contextlib.redirect_stdout(io.StringIO()):
+                atualizar_base_dados(db)
+            if nome == 'sqlite':
+                # Stock suficiente para todas as vendas do teste
+                db.execute_update("UPDATE produtos SET stock = %s", (args.vendas * 10,))
+            print(f"\n⏱️ {db.motor.descricao()}")
+            for operacao, tempos in executar(db, args).items():
+                print(f"   {operacao:<24} {resumo(tempos)}")
+            db.close()
+
+if __name__ == "__main__":
+    main()
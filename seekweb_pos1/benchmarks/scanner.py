@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Latência e débito do scanner serial, da leitura à linha do carrinho, sem hardware (Linux).
+
+Um scanner virtual (pty) envia códigos ao Scanner real em modo COM; as leituras seguem o
+caminho da caixa: Scanner -> FilaScans (procura no catálogo) -> carrinho na thread principal.
+
+Uso (a partir da pasta do projeto):
+    python benchmarks/scanner.py                              # 500 leituras a 20/s
+    python benchmarks/scanner.py --taxa 100 --ruido 0.02 --partido 0.1 --duplicado 0.05
+    python benchmarks/scanner.py --gravacao leituras.txt      # fluxo gravado ('ms código' por linha)
+    python benchmarks/scanner.py --balanca --tramas 5000      # também uma balança em modo contínuo
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer
+from benchmarks.motores import config_sqlite, resumo
+from benchmarks.simulador_serial import PortaVirtual, SimuladorScanner, SimuladorBalanca, fluxo_sintetico, ler_gravacao
+from core.catalogo import CatalogoProdutos
+from core.database import Database
+from core.fila_scans import FilaScans
+from core.migracoes import atualizar_base_dados
+from models.carrinho import Carrinho
+from models.produto import Produto
+from utils.scanner import Scanner
+
+class Registo(QObject):
+    """Recebe sinais na thread principal (como a janela de vendas) e guarda-os com a hora de chegada"""
+
+    def __init__(self, carrinho=None):
+        super().__init__()
+        self.carrinho = carrinho
+        self.recebidos = []
+
+    def registar(self, *argumentos):
+        self.recebidos.append((argumentos, time.monotonic()))
+
+    def adicionar(self, codigo, quantidade, produto, capturado):
+        if produto:
+            self.carrinho.adicionar(produto, quantidade)
+        self.registar(codigo, quantidade, produto is not None)
+
+def correr_ate(app, terminado, limite):
+    """Corre o ciclo de eventos até terminado() ou até `limite` segundos"""
+    fim = time.monotonic() + limite
+    timer = QTimer()
+    timer.timeout.connect(lambda: (terminado() or time.monotonic() > fim) and app.quit())
+    timer.start(20)
+    app.exec_()
+    timer.stop()
+
+def config_scanner(config, porta):
+    config.config['Scanner'] = {'tipo': 'com', 'porta_com': porta.caminho, 'velocidade': '9600',
+                                'timeout': '1', 'terminadores': 'CR,LF'}
+    return config
+
+def latencias_carrinho(enviados, entregas):
+    """Liga cada entrega às leituras que a originaram (pela ordem, por código): ms desde o envio"""
+    por_codigo = defaultdict(deque)
+    for codigo, enviado, integra in enviados:
+        if integra:
+            por_codigo[codigo].append(enviado)
+    latencias = []
+    for (codigo, quantidade, encontrado), chegada in entregas:
+        pendentes = por_codigo.get(codigo)
+        if not encontrado or not pendentes:
+            continue
+        # Leituras agrupadas numa só entrega: conta a mais antiga
+        primeira = pendentes[0]
+        for _ in range(min(quantidade, len(pendentes))):
+            pendentes.popleft()
+        latencias.append((chegada - primeira) * 1000)
+    return latencias
+
+def medir_scanner(app, db, config, fluxo, args):
+    catalogo = CatalogoProdutos(db)
+    catalogo.carregar()
+    carrinho = Carrinho()
+    registo = Registo(carrinho)
+
+    with PortaVirtual() as porta:
+        scanner = Scanner(config_scanner(config, porta))
+        fila = FilaScans(Produto(db, catalogo).obter_por_codigo_barras, capacidade=args.fila_maxima,
+                         janela_duplicados=args.janela_duplicados_ms / 1000)
+        scanner.codigo_lido.connect(fila.receber)
+        fila.produto_lido.connect(registo.adicionar)
+        scanner.iniciar_leitura()
+
+        erros = {'ruido': args.ruido, 'partido': args.partido,
+                 'sem_terminador': args.sem_terminador, 'duplicado': args.duplicado}
+        simulador = SimuladorScanner(porta, fluxo, erros=erros, semente=args.semente)
+        cpu = time.process_time()
+        simulador.iniciar()
+        # Termina quando o simulador acabou e nada chega há meio segundo
+        correr_ate(app, lambda: simulador.terminado and fila.profundidade() == 0 and time.monotonic() - (
+            registo.recebidos[-1][1] if registo.recebidos else 0) > 0.5, limite=fluxo[-1][0] + 30)
+        cpu = time.process_time() - cpu
+        simulador.parar()
+        scanner.fechar()
+        fila.encerrar()
+
+    entregas = registo.recebidos
+    latencias = latencias_carrinho(simulador.enviados, entregas)
+    itens = sum(quantidade for (_, quantidade, encontrado), _ in entregas if encontrado)
+    duracao = entregas[-1][1] - simulador.enviados[0][1] if entregas else 0
+
+    metricas = fila.metricas()
+    resultados = {'titulo': f"Scanner serial virtual: {len(simulador.enviados)} leituras em {fluxo[-1][0]:.1f} s"}
+    if latencias:
+        resultados['leitura -> carrinho'] = f"{resumo(latencias)} | máx {max(latencias):7.3f} ms"
+    if duracao > 0:
+        resultados['débito'] = f"{itens / duracao:7.1f} itens/s | CPU {cpu:.2f} s"
+    resultados['carrinho'] = (f"{itens} itens em {len(carrinho)} linhas | "
+                              f"não encontrados {sum(1 for (_, _, encontrado), _ in entregas if not encontrado)}")
+    resultados['erros injetados'] = ', '.join(f"{p} {n}" for p, n in simulador.contagem_erros.items())
+    resultados['fila'] = (f"duplicados {metricas['duplicados']} | agrupados {metricas['agrupados']} | "
+                          f"recusados {metricas['recusados']} | profundidade máx {metricas['profundidade_maxima']}")
+    return resultados
+
+def medir_balanca(app, config, args):
+    """Débito do enquadramento serial com uma balança a enviar tramas sem pausa"""
+    registo = Registo()
+    with PortaVirtual() as porta:
+        scanner = Scanner(config_scanner(config, porta))
+        scanner.codigo_lido.connect(registo.registar)
+        scanner.iniciar_leitura()
+
+        balanca = SimuladorBalanca(porta, peso=1.25, intervalo=0, tramas=args.tramas)
+        inicio, cpu = time.monotonic(), time.process_time()
+        balanca.iniciar()
+        correr_ate(app, lambda: len(registo.recebidos) >= args.tramas, limite=30)
+        duracao, cpu = time.monotonic() - inicio, time.process_time() - cpu
+        balanca.parar()
+        scanner.fechar()
+
+    esperada = SimuladorBalanca.trama(1.25)
+    intactas = sum(1 for (trama, _), _ in registo.recebidos if trama == esperada)
+    return {'titulo': f"Balança virtual (modo contínuo): {balanca.enviadas} tramas",
+            'débito': f"{len(registo.recebidos) / duracao:7.0f} tramas/s | CPU {cpu:.2f} s | "
+                      f"intactas {intactas}/{len(registo.recebidos)}"}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do scanner serial com um scanner virtual")
+    parser.add_argument('--leituras', type=int, default=500)
+    parser.add_argument('--taxa', type=float, default=20, help="leituras por segundo")
+    parser.add_argument('--gravacao', help="fluxo gravado em vez do sintético")
+    for padrao in ('ruido', 'partido', 'sem-terminador', 'duplicado'):
+        parser.add_argument(f'--{padrao}', type=float, default=0.0, help="probabilidade por leitura")
+    parser.add_argument('--semente', type=int, default=1)
+    parser.add_argument('--fila-maxima', type=int, default=50)
+    parser.add_argument('--janela-duplicados-ms', type=int, default=300)
+    parser.add_argument('--balanca', action='store_true', help="medir também uma balança em modo contínuo")
+    parser.add_argument('--tramas', type=int, default=5000)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as pasta:
+        config = config_sqlite(pasta)
+        db = Database(config)
+        with contextlib.redirect_stdout(io.StringIO()):
+            atualizar_base_dados(db)
+
+        if args.gravacao:
+            fluxo = ler_gravacao(args.gravacao, args.taxa)
+        else:
+            codigos = [linha['codigo_barras'] for linha in db.execute_query(
+                "SELECT codigo_barras FROM produtos WHERE ativo = 1 AND codigo_barras IS NOT NULL")]
+            fluxo = fluxo_sintetico(codigos, args.leituras, args.taxa, args.semente)
+
+        medicoes = [lambda: medir_scanner(app, db, config, fluxo, args)]
+        if args.balanca:
+            medicoes.append(lambda: medir_balanca(app, config, args))
+        for medicao in medicoes:
+            # Os prints do scanner e dos modelos ficam fora do terminal (mas dentro do tempo)
+            with contextlib.redirect_stdout(io.StringIO()):
+                resultados = medicao()
+            print(f"\n⏱️ {resultados.pop('titulo')}")
+            for operacao, texto in resultados.items():
+                print(f"   {operacao:<24} {texto}")
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""Scanner e balança virtuais numa pty, para exercitar o código serial sem hardware (Linux).
+
+PortaVirtual cria o par pty: `caminho` (ex.: /dev/pts/5) vai para [Scanner] porta_com e o
+Scanner abre-o com o pyserial como se fosse uma porta COM; os simuladores escrevem do outro lado.
+"""
+
+import os
+import random
+import threading
+import time
+import tty
+
+# Padrões de erro do SimuladorScanner (probabilidade por leitura):
+#   ruido          um carácter do código trocado (código que não existe)
+#   partido        o código chega em duas escritas separadas por `pausa_partido`
+#   sem_terminador falta o terminador: junta-se à leitura seguinte
+#   duplicado      o scanner lê a mesma etiqueta duas vezes seguidas
+ERROS = ('ruido', 'partido', 'sem_terminador', 'duplicado')
+
+class PortaVirtual:
+    """Par pty em modo raw: a aplicação abre `caminho`, o simulador escreve em `mestre`"""
+
+    def __init__(self):
+        self.mestre, self._escravo = os.openpty()
+        tty.setraw(self._escravo)
+        self.caminho = os.ttyname(self._escravo)
+
+    def escrever(self, dados):
+        os.write(self.mestre, dados)
+
+    def fechar(self):
+        for fd in (self.mestre, self._escravo):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+def fluxo_sintetico(codigos, leituras, taxa, semente=None):
+    """[(instante, código)] com `taxa` leituras por segundo; nunca o mesmo código duas vezes seguidas"""
+    aleatorio = random.Random(semente)
+    fluxo, anterior = [], None
+    for i in range(leituras):
+        codigo = aleatorio.choice([c for c in codigos if c != anterior] or codigos)
+        fluxo.append((i / taxa, codigo))
+        anterior = codigo
+    return fluxo
+
+def ler_gravacao(ficheiro, taxa=10):
+    """Fluxo gravado: uma leitura por linha, 'código' ou 'ms código' (ms desde o início da gravação).
+
+    Linhas sem tempo ficam espaçadas a `taxa` leituras por segundo; '#' inicia um comentário.
+    """
+    fluxo, instante = [], 0.0
+    with open(ficheiro, encoding='utf-8') as f:
+        for linha in f:
+            partes = linha.split('#', 1)[0].split()
+            if not partes:
+                continue
+            if len(partes) > 1:
+                instante = float(partes[0]) / 1000
+                codigo = partes[1]
+            else:
+                instante = instante + 1 / taxa if fluxo else 0.0
+                codigo = partes[0]
+            fluxo.append((instante, codigo))
+    return fluxo
+
+class _Emissor:
+    """Thread que escreve na porta virtual até acabar ou até parar()"""
+
+    def __init__(self, porta):
+        self.porta = porta
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._correr, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+        self.esperar()
+
+    def esperar(self, limite=None):
+        if self._thread:
+            self._thread.join(limite)
+
+    @property
+    def terminado(self):
+        return self._thread is not None and not self._thread.is_alive()
+
+    def _esperar_ate(self, instante):
+        """Dorme até `instante` (time.monotonic()); False se foi pedido para parar"""
+        espera = instante - time.monotonic()
+        return not self._parar.wait(espera) if espera > 0 else not self._parar.is_set()
+
+    def _correr(self):
+        raise NotImplementedError
+
+class SimuladorScanner(_Emissor):
+    """Reproduz um fluxo [(instante, código)] como um scanner serial.
+
+    `erros` = {padrão: probabilidade} (ver ERROS). `enviados` regista cada leitura pretendida:
+    (código, instante do envio em time.monotonic(), íntegra), em que íntegra é False quando um
+    erro impede que o código chegue tal como foi lido (ruído, terminador em falta).
+    """
+
+    def __init__(self, porta, fluxo, terminador=b'\r\n', erros=None, pausa_partido=0.02, semente=None):
+        super().__init__(porta)
+        self.fluxo = fluxo
+        self.terminador = terminador
+        self.erros = {padrao: probabilidade for padrao, probabilidade in (erros or {}).items() if probabilidade}
+        desconhecidos = set(self.erros) - set(ERROS)
+        if desconhecidos:
+            raise ValueError(f"Padrões de erro desconhecidos: {', '.join(sorted(desconhecidos))}")
+        self.pausa_partido = pausa_partido
+        self._aleatorio = random.Random(semente)
+        self.enviados = []
+        self.contagem_erros = dict.fromkeys(ERROS, 0)
+
+    def _sorteia(self, padrao):
+        if self._aleatorio.random() < self.erros.get(padrao, 0):
+            self.contagem_erros[padrao] += 1
+            return True
+        return False
+
+    def _correr(self):
+        inicio = time.monotonic()
+        juntar_seguinte = False
+        for instante, codigo in self.fluxo:
+            if not self._esperar_ate(inicio + instante):
+                return
+
+            dados = codigo.encode('utf-8')
+            # Trama limpa: chega como o código lido, salvo se se juntar ao resto da anterior
+            limpa = True
+            if self._sorteia('ruido'):
+                posicao = self._aleatorio.randrange(len(dados))
+                dados = dados[:posicao] + b'#' + dados[posicao + 1:]
+                limpa = False
+            integra = limpa and not juntar_seguinte
+            juntar_seguinte = self._sorteia('sem_terminador')
+            if juntar_seguinte:
+                limpa = integra = False
+            else:
+                dados += self.terminador
+
+            self.enviados.append((codigo, time.monotonic(), integra))
+            if self._sorteia('partido') and len(dados) > 1:
+                meio = len(dados) // 2
+                self.porta.escrever(dados[:meio])
+                if not self._esperar_ate(time.monotonic() + self.pausa_partido):
+                    return
+                self.porta.escrever(dados[meio:])
+            else:
+                self.porta.escrever(dados)
+            if self._sorteia('duplicado'):
+                if limpa and not integra:
+                    # A primeira cópia juntou-se à anterior: esta é a que chega ao carrinho
+                    self.enviados.append((codigo, time.monotonic(), True))
+                self.porta.escrever(dados)
+
+class SimuladorBalanca(_Emissor):
+    """Balança em modo contínuo: uma trama de peso a cada `intervalo` segundos.
+
+    Tramas no formato habitual 'ST,GS,+   1.250kg' (US enquanto o peso não estabiliza);
+    colocar() muda o peso com `instaveis` tramas US antes das estáveis. Com `tramas`, para
+    depois de enviar essa quantidade.
+    """
+
+    def __init__(self, porta, peso=0.0, intervalo=0.1, tramas=None, terminador=b'\r\n'):
+        super().__init__(porta)
+        self.peso = peso
+        self.intervalo = intervalo
+        self.tramas = tramas
+        self.terminador = terminador
+        self.enviadas = 0
+        self._instaveis = 0
+
+    def colocar(self, peso, instaveis=3):
+        self.peso = peso
+        self._instaveis = instaveis
+
+    @staticmethod
+    def trama(peso, estavel=True):
+        return f"{'ST' if estavel else 'US'},GS,{'-' if peso < 0 else '+'}{abs(peso):8.3f}kg"
+
+    def _correr(self):
+        proxima = time.monotonic()
+        while self.tramas is None or self.enviadas < self.tramas:
+            if self.intervalo and not self._esperar_ate(proxima):
+                return
+            if self._parar.is_set():
+                return
+            estavel = self._instaveis <= 0
+            self._instaveis -= 1
+            self.porta.escrever(self.trama(self.peso, estavel).encode('ascii') + self.terminador)
+            self.enviadas += 1
+            proxima += self.intervalo
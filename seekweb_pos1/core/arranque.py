@@ -0,0 +1,52 @@
+import builtins
+import sys
+import time
+
+class TemposImportacao:
+    """Mede quanto custa importar cada módulo durante o arranque.
+
+    Substitui temporariamente builtins.__import__: cada módulo importado pela primeira vez
+    fica com o tempo total (incluindo o que ele próprio importa) e o tempo próprio.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.tempos = {}  # módulo -> [total, próprio] em segundos
+        self._pilha = []
+        self._import_original = None
+
+    @classmethod
+    def iniciar(cls):
+        medidor = cls()
+        medidor._import_original = builtins.__import__
+        builtins.__import__ = medidor._importar
+        return medidor
+
+    def parar(self):
+        if self._import_original is not None:
+            builtins.__import__ = self._import_original
+            self._import_original = None
+
+    def _importar(self, nome, globals=None, locals=None, fromlist=(), level=0):
+        if level or nome in sys.modules:
+            return self._import_original(nome, globals, locals, fromlist, level)
+
+        self._pilha.append(0.0)
+        inicio = time.perf_counter()
+        try:
+            return self._import_original(nome, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - inicio
+            filhos = self._pilha.pop()
+            if self._pilha:
+                self._pilha[-1] += total
+            self.tempos.setdefault(nome, [total, total - filhos])
+
+    def relatorio(self, limite=15):
+        """Texto com os módulos mais caros (tempo total, que inclui os módulos que importam)"""
+        decorrido = (time.perf_counter() - self.inicio) * 1000
+        linhas = [f"⏱️ Importações do arranque ({decorrido:.0f} ms desde o início da medição):"]
+        mais_caros = sorted(self.tempos.items(), key=lambda par: par[1][0], reverse=True)[:limite]
+        for nome, (total, proprio) in mais_caros:
+            linhas.append(f"   {nome:<40} total {total * 1000:8.1f} ms | próprio {proprio * 1000:8.1f} ms")
+        return "\n".join(linhas)
@@ -0,0 +1,126 @@
+import threading
+import time
+from datetime import timedelta
+from core.pesquisa import IndiceProcura
+
+class CatalogoProdutos:
+    """Índice em memória dos produtos ativos, por código de barras, id e referência"""
+
+    # Recuar a marca de tempo cobre transações que fizeram commit depois de linhas mais recentes
+    MARGEM_SEGUNDOS = 30
+
+    QUERY_BASE = """
+        SELECT p.*, t.taxa as taxa_iva, c.nome as categoria_nome
+        FROM produtos p
+        LEFT JOIN taxas_iva t ON p.taxa_iva_id = t.id
+        LEFT JOIN categorias c ON p.categoria_id = c.id
+    """
+
+    def __init__(self, db, recarga_completa=300):
+        self.db = db
+        # taxas_iva e categorias não têm updated_at: uma recarga completa periódica apanha essas alterações
+        self.recarga_completa = recarga_completa
+        self._lock = threading.Lock()
+        self._por_id = {}
+        self._por_codigo = {}
+        self._por_referencia = {}
+        self._pesquisa = IndiceProcura()
+        self._ordenados = None
+        self._marca = None
+        self._ultima_recarga = 0.0
+
+    def carregar(self):
+        """Carrega o catálogo completo (substitui o índice atual)"""
+        produtos = self.db.execute_query(self.QUERY_BASE + " WHERE p.ativo = 1")
+        if produtos is None:
+            return False
+
+        por_id, por_codigo, por_referencia = {}, {}, {}
+        pesquisa = IndiceProcura()
+        for produto in produtos:
+            por_id[produto['id']] = produto
+            if produto.get('codigo_barras'):
+                por_codigo[produto['codigo_barras']] = produto
+            if produto.get('referencia'):
+                por_referencia[produto['referencia']] = produto
+            pesquisa.adicionar(produto)
+
+        with self._lock:
+            self._por_id, self._por_codigo, self._por_referencia = por_id, por_codigo, por_referencia
+            self._pesquisa = pesquisa
+            self._ordenados = None
+            self._marca = max((p['updated_at'] for p in produtos if p.get('updated_at')), default=None)
+            self._ultima_recarga = time.monotonic()
+
+        print(f"📚 Catálogo carregado: {len(por_id)} produtos")
+        return True
+
+    def atualizar(self):
+        """Aplica as alterações desde a última consulta (polling de produtos.updated_at)"""
+        if self._marca is None or time.monotonic() - self._ultima_recarga >= self.recarga_completa:
+            return self.carregar()
+
+        alterados = self.db.execute_query(
+            self.QUERY_BASE + " WHERE p.updated_at >= %s",
+            (self._marca - timedelta(seconds=self.MARGEM_SEGUNDOS),)
+        )
+        if alterados is None:
+            return False
+
+        with self._lock:
+            for produto in alterados:
+                self._remover(produto['id'])
+                if produto.get('ativo'):
+                    self._indexar(produto)
+                if produto.get('updated_at') and produto['updated_at'] > self._marca:
+                    self._marca = produto['updated_at']
+        return True
+
+    def _indexar(self, produto):
+        self._por_id[produto['id']] = produto
+        if produto.get('codigo_barras'):
+            self._por_codigo[produto['codigo_barras']] = produto
+        if produto.get('referencia'):
+            self._por_referencia[produto['referencia']] = produto
+        self._pesquisa.adicionar(produto)
+        self._ordenados = None
+
+    def _remover(self, produto_id):
+        antigo = self._por_id.pop(produto_id, None)
+        if antigo is None:
+            return
+        self._pesquisa.remover(produto_id)
+        self._ordenados = None
+        if self._por_codigo.get(antigo.get('codigo_barras')) is antigo:
+            del self._por_codigo[antigo['codigo_barras']]
+        if self._por_referencia.get(antigo.get('referencia')) is antigo:
+            del self._por_referencia[antigo['referencia']]
+
+    def por_codigo_barras(self, codigo_barras):
+        return self._por_codigo.get(codigo_barras)
+
+    def por_id(self, produto_id):
+        return self._por_id.get(produto_id)
+
+    def por_referencia(self, referencia):
+        return self._por_referencia.get(referencia)
+
+    def procurar(self, filtro=None):
+        """Produtos que correspondem ao filtro (sem acentos, por relevância); sem filtro, todos por nome"""
+        with self._lock:
+            if not filtro or not filtro.strip():
+                if self._ordenados is None:
+                    self._ordenados = sorted(self._por_id.values(), key=lambda p: p['nome'])
+                return list(self._ordenados)
+            return [self._por_id[i] for i in self._pesquisa.procurar(filtro)]
+
+    def guardar(self, produto):
+        """Indexa um produto obtido diretamente da base de dados"""
+        if produto and produto.get('ativo', True):
+            with self._lock:
+                self._remover(produto['id'])
+                self._indexar(produto)
+
+    @property
+    def carregado(self):
+        return self._ultima_recarga > 0
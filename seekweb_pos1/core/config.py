@@ -14,11 +14,18 @@ class Config:
     def create_default_config(self):
         # Cria configuração padrão se não existir
         self.config['Database'] = {
+            'motor': 'mysql',
+            'ficheiro': 'dados/seekweb.db',
             'host': 'localhost',
             'user': 'root',
             'password': '',
             'database': 'bd_seekweb',
-            'port': '3306'
+            'port': '3306',
+            'pool_size': '5',
+            'pool_timeout': '10',
+            'pool_ping_intervalo': '30',
+            'timeout_ligacao': '3',
+            'timeout_leitura': '10'
         }
         
         with open(self.config_file, 'w') as f:
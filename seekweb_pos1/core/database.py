@@ -1,49 +1,286 @@
-import mysql.connector
-from mysql.connector import Error
 import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from core.motores import ERROS_BD as Error, criar_motor
 
 class Database:
     def __init__(self, config):
         self.config = config
-        self.connection = None
+        # Motor escolhido no config.ini: servidor MySQL ou ficheiro SQLite local
+        self.motor = criar_motor(config)
+        self.pool_size = max(1, config.getint('Database', 'pool_size', fallback=5))
+        self.pool_timeout = config.getint('Database', 'pool_timeout', fallback=10)
+        self.pool_ping_intervalo = config.getint('Database', 'pool_ping_intervalo', fallback=30)
+
+        # Conexões livres (LIFO para reutilizar as mais "quentes") e arrendamentos por thread
+        self._livres = queue.LifoQueue(maxsize=self.pool_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._criadas = 0
+        self._metricas = {
+            'checkouts': 0,
+            'esperas': 0,
+            'tempo_espera_total': 0.0,
+            'conexoes_criadas': 0,
+            'conexoes_descartadas': 0,
+            'health_checks_falhados': 0,
+            'timeouts': 0
+        }
         self.connect()
-    
+
     def connect(self):
+        """Abre a primeira conexão do pool (falha cedo se a base de dados não estiver disponível)"""
         try:
-            self.connection = mysql.connector.connect(
-                host=self.config.get('Database', 'host'),
-                user=self.config.get('Database', 'user'),
-                password=self.config.get('Database', 'password'),
-                database=self.config.get('Database', 'database'),
-                port=self.config.getint('Database', 'port')
-            )
-            print("✅ Conectado à base de dados MySQL")
+            conexao = self._nova_conexao()
+            self._devolver(conexao)
+            print(f"✅ Conectado à base de dados {self.motor.descricao()} (pool de {self.pool_size} conexões)")
         except Error as e:
             print(f"❌ Erro ao conectar à base de dados: {e}")
             raise
-    
+
+    def _nova_conexao(self):
+        """Cria uma conexão nova no motor configurado"""
+        conexao = self.motor.ligar()
+        conexao._pool_ultimo_uso = time.monotonic()
+        with self._lock:
+            self._criadas += 1
+            self._metricas['conexoes_criadas'] += 1
+        return conexao
+
+    def _descartar(self, conexao):
+        """Fecha uma conexão e liberta o seu lugar no pool"""
+        try:
+            conexao.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._criadas -= 1
+            self._metricas['conexoes_descartadas'] += 1
+
+    def _conexao_saudavel(self, conexao):
+        """Health check: só faz ping se a conexão esteve parada mais que o intervalo"""
+        if time.monotonic() - getattr(conexao, '_pool_ultimo_uso', 0) < self.pool_ping_intervalo:
+            return True
+        try:
+            conexao.ping(reconnect=False)
+            return True
+        except Error:
+            with self._lock:
+                self._metricas['health_checks_falhados'] += 1
+            return False
+
+    def _checkout(self):
+        """Retira uma conexão saudável do pool, criando uma nova se houver lugar"""
+        inicio = time.monotonic()
+        limite = inicio + self.pool_timeout
+
+        while True:
+            try:
+                conexao = self._livres.get_nowait()
+            except queue.Empty:
+                conexao = None
+                with self._lock:
+                    pode_criar = self._criadas < self.pool_size
+                    if pode_criar:
+                        # Reservar o lugar antes de sair do lock
+                        self._criadas += 1
+                if pode_criar:
+                    try:
+                        conexao = self._nova_conexao()
+                    finally:
+                        with self._lock:
+                            self._criadas -= 1
+                else:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        with self._lock:
+                            self._metricas['timeouts'] += 1
+                        raise self.motor.ErroPool(
+                            f"Pool esgotado: nenhuma conexão livre após {self.pool_timeout}s")
+                    with self._lock:
+                        self._metricas['esperas'] += 1
+                    try:
+                        conexao = self._livres.get(timeout=restante)
+                    except queue.Empty:
+                        continue
+
+            if self._conexao_saudavel(conexao):
+                break
+            self._descartar(conexao)
+
+        with self._lock:
+            self._metricas['checkouts'] += 1
+            self._metricas['tempo_espera_total'] += time.monotonic() - inicio
+        return conexao
+
+    def _devolver(self, conexao):
+        """Devolve uma conexão ao pool"""
+        conexao._pool_ultimo_uso = time.monotonic()
+        try:
+            self._livres.put_nowait(conexao)
+        except queue.Full:
+            self._descartar(conexao)
+
+    @contextmanager
+    def lease(self):
+        """Arrenda uma conexão à thread atual até o bloco terminar (reentrante)"""
+        if getattr(self._local, 'conexao', None) is not None:
+            self._local.profundidade += 1
+            try:
+                yield self._local.conexao
+            finally:
+                self._local.profundidade -= 1
+            return
+
+        conexao = self._checkout()
+        self._local.conexao = conexao
+        self._local.profundidade = 1
+        perdida = False
+        try:
+            yield conexao
+        except Error as e:
+            perdida = self.motor.erro_de_ligacao(e)
+            raise
+        finally:
+            self._local.conexao = None
+            self._local.profundidade = 0
+            if perdida or getattr(conexao, '_pool_perdida', False):
+                # Não devolver ao pool uma conexão que já se sabe estar morta
+                self._descartar(conexao)
+            else:
+                self._devolver(conexao)
+
+    def disponivel(self):
+        """Verifica se a base de dados responde (usado para decidir se uma venda vai para o diário offline)"""
+        try:
+            with self.lease() as conexao:
+                conexao.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def explicar(self, query, params=None):
+        """Plano de execução da query: [{'tabela', 'indice', 'detalhe'}] em qualquer motor"""
+        with self.lease() as conexao:
+            return self.motor.plano(conexao, query, params)
+
+    def pool_metrics(self):
+        """Devolve métricas do pool de conexões"""
+        with self._lock:
+            metricas = dict(self._metricas)
+            metricas['conexoes_abertas'] = self._criadas
+        metricas['conexoes_livres'] = self._livres.qsize()
+        metricas['conexoes_em_uso'] = metricas['conexoes_abertas'] - metricas['conexoes_livres']
+        metricas['pool_size'] = self.pool_size
+        return metricas
+
     def execute_query(self, query, params=None):
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(query, params or ())
-            result = cursor.fetchall()
-            cursor.close()
-            return result
+            with self.lease() as conexao:
+                cursor = conexao.cursor(dictionary=True)
+                cursor.execute(query, params or ())
+                result = cursor.fetchall()
+                cursor.close()
+                return result
         except Error as e:
             print(f"❌ Erro na query: {e}")
+            if self.in_transaction():
+                raise
             return None
-    
+
+    @contextmanager
+    def transaction(self):
+        """Agrupa várias escritas num único commit; qualquer exceção faz rollback de tudo"""
+        if getattr(self._local, 'em_transacao', False):
+            # Transação aninhada: junta-se à transação exterior
+            yield self._local.conexao
+            return
+
+        with self.lease() as conexao:
+            conexao.start_transaction()
+            self._local.em_transacao = True
+            try:
+                yield conexao
+                conexao.commit()
+            except BaseException:
+                try:
+                    conexao.rollback()
+                except Error as e:
+                    # Com a ligação perdida o servidor já descartou a transação
+                    print(f"⚠️ Rollback falhou: {e}")
+                    conexao._pool_perdida = self.motor.erro_de_ligacao(e)
+                raise
+            finally:
+                self._local.em_transacao = False
+
+    def in_transaction(self):
+        """Indica se a thread atual está dentro de Database.transaction()"""
+        return getattr(self._local, 'em_transacao', False)
+
+    def _executar_escrita(self, query, params, many=False):
+        """Executa uma escrita; fora de transação faz commit, dentro propaga erros para o rollback"""
+        if self.in_transaction():
+            cursor = self._local.conexao.cursor()
+            if many:
+                cursor.executemany(query, params)
+            else:
+                cursor.execute(query, params or ())
+            return cursor
+
+        with self.lease() as conexao:
+            try:
+                cursor = conexao.cursor()
+                if many:
+                    cursor.executemany(query, params)
+                else:
+                    cursor.execute(query, params or ())
+                conexao.commit()
+                return cursor
+            except Error:
+                conexao.rollback()
+                raise
+
     def execute_insert(self, query, params=None):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            self.connection.commit()
-            return cursor.lastrowid
+            return self._executar_escrita(query, params).lastrowid
         except Error as e:
             print(f"❌ Erro no insert: {e}")
-            self.connection.rollback()
+            if self.in_transaction():
+                raise
             return None
-    
+
+    def execute_update(self, query, params=None):
+        """Executa UPDATE/DELETE e devolve o número de linhas afetadas (None em caso de erro)"""
+        try:
+            return self._executar_escrita(query, params).rowcount
+        except Error as e:
+            print(f"❌ Erro no update: {e}")
+            if self.in_transaction():
+                raise
+            return None
+
+    def execute_many(self, query, params_seq):
+        """Insere várias linhas num só round trip (o conector reescreve o INSERT em VALUES multi-linha)"""
+        params_seq = list(params_seq)
+        if not params_seq:
+            return 0
+        try:
+            return self._executar_escrita(query, params_seq, many=True).rowcount
+        except Error as e:
+            print(f"❌ Erro no insert em lote: {e}")
+            if self.in_transaction():
+                raise
+            return None
+
     def close(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
\ No newline at end of file
+        while True:
+            try:
+                conexao = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            if conexao.is_connected():
+                conexao.close()
+            with self._lock:
+                self._criadas -= 1
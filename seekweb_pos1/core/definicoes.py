@@ -0,0 +1,168 @@
+import configparser
+import os
+import threading
+from core.config import Config
+
+# Valores aceites por getboolean (os mesmos do configparser)
+BOOLEANOS = configparser.ConfigParser.BOOLEAN_STATES
+
+class Definicoes:
+    """Definições em memória: o config.ini da caixa e a tabela configuracoes da empresa.
+
+    As duas fontes são lidas uma vez; get/getint/getfloat/getboolean têm a interface do
+    Config mas são consultas a um dicionário, com a conversão de tipo feita uma só vez.
+    As linhas de configuracoes ficam na secção 'Sistema' (Definicoes.SECCAO_BD).
+    verificar() recarrega quando o config.ini muda no disco ou a versão das configurações
+    sobe na base de dados; notificar() avisa os subscritores do que mudou.
+    """
+
+    SECCAO_BD = 'Sistema'
+    CHAVE_VERSAO = 'versao'
+
+    def __init__(self, config: Config, db=None, empresa_id=1):
+        self.ficheiro = config.config_file
+        self.db = db
+        self.empresa_id = empresa_id
+        self._lock = threading.Lock()
+        self._subscritores = []
+        self._versao_bd = None
+        self._valores_bd = {}
+        self._mtime = self._mtime_ficheiro()
+        self._valores_ini = self._ler_ini(config.config)
+        self._publicar()
+        if db is not None:
+            self.ligar_base_dados(db)
+
+    # --- Leitura (caminho rápido) -----------------------------------------------------------
+
+    def get(self, section, key, fallback=None):
+        return self._estado[0].get((section, key.lower()), fallback)
+
+    def getint(self, section, key, fallback=0):
+        return self._tipado(section, key, int, fallback)
+
+    def getfloat(self, section, key, fallback=0.0):
+        return self._tipado(section, key, float, fallback)
+
+    def getboolean(self, section, key, fallback=False):
+        return self._tipado(section, key, _booleano, fallback)
+
+    def seccao(self, section):
+        """Dicionário chave -> texto de uma secção"""
+        return {chave: valor for (nome, chave), valor in self._estado[0].items() if nome == section}
+
+    def _tipado(self, section, key, tipo, fallback):
+        chave = (section, key.lower(), tipo)
+        valores, tipados = self._estado
+        if chave not in tipados:
+            valor = valores.get(chave[:2])
+            if valor is None:
+                return fallback
+            # ValueError sobe, como no Config: um valor inválido no config.ini não passa em silêncio
+            tipados[chave] = tipo(valor.strip())
+        return tipados[chave]
+
+    # --- Carregamento -----------------------------------------------------------------------
+
+    def ligar_base_dados(self, db):
+        """Passa a incluir a tabela configuracoes (depois de o Database e as migrações existirem)"""
+        self.db = db
+        with self._lock:
+            self._carregar_bd()
+            self._publicar()
+
+    def _publicar(self):
+        # Troca o estado inteiro de uma vez: quem lê noutra thread nunca vê meia recarga
+        valores = dict(self._valores_ini)
+        valores.update(((self.SECCAO_BD, chave), valor) for chave, valor in self._valores_bd.items())
+        self._estado = (valores, {})
+
+    @staticmethod
+    def _ler_ini(parser):
+        return {(seccao, chave): valor
+                for seccao in parser.sections()
+                for chave, valor in parser.items(seccao, raw=True)}
+
+    def _mtime_ficheiro(self):
+        try:
+            return os.stat(self.ficheiro).st_mtime_ns
+        except OSError:
+            return None
+
+    def _consultar_versao(self):
+        linhas = self.db.execute_query(
+            "SELECT valor FROM configuracoes WHERE empresa_id = %s AND chave = %s",
+            (self.empresa_id, self.CHAVE_VERSAO))
+        if linhas is None:
+            raise RuntimeError("não foi possível consultar a versão das configurações")
+        return linhas[0]['valor'] if linhas else None
+
+    def _carregar_bd(self):
+        linhas = self.db.execute_query(
+            "SELECT chave, valor FROM configuracoes WHERE empresa_id = %s", (self.empresa_id,))
+        if linhas is None:
+            print("⚠️ Configurações da base de dados não carregadas; a usar só o config.ini")
+            return False
+        self._valores_bd = {linha['chave'].lower(): linha['valor'] if linha['valor'] is not None else ''
+                            for linha in linhas if linha['chave'] != self.CHAVE_VERSAO}
+        self._versao_bd = next((linha['valor'] for linha in linhas if linha['chave'] == self.CHAVE_VERSAO), None)
+        return True
+
+    def verificar(self):
+        """Recarrega o que mudou (config.ini no disco, versão na base de dados); devolve as chaves alteradas.
+
+        Faz IO: chamar fora da thread da GUI e entregar o resultado a notificar().
+        """
+        with self._lock:
+            anteriores = self._estado[0]
+            mtime = self._mtime_ficheiro()
+            if mtime != self._mtime:
+                parser = configparser.ConfigParser()
+                parser.read(self.ficheiro)
+                self._valores_ini = self._ler_ini(parser)
+                self._mtime = mtime
+                print("🔄 config.ini alterado: definições recarregadas")
+
+            if self.db is not None:
+                try:
+                    if self._consultar_versao() != self._versao_bd:
+                        self._carregar_bd()
+                        print("🔄 Configurações da base de dados recarregadas")
+                except Exception as e:
+                    print(f"⚠️ Não foi possível verificar as configurações: {e}")
+
+            self._publicar()
+            atuais = self._estado[0]
+            return {chave for chave in set(anteriores) | set(atuais) if anteriores.get(chave) != atuais.get(chave)}
+
+    def incrementar_versao(self):
+        """Sobe a versão das configurações (depois de as gravar) para as outras caixas recarregarem"""
+        return self.db.execute_insert("""
+            INSERT INTO configuracoes (empresa_id, chave, valor) VALUES (%s, %s, '1')
+            ON DUPLICATE KEY UPDATE valor = valor + 1
+        """, (self.empresa_id, self.CHAVE_VERSAO))
+
+    # --- Subscritores -----------------------------------------------------------------------
+
+    def subscrever(self, callback, seccao=None):
+        """callback(alteradas) quando mudam chaves (de `seccao`, se indicada); alteradas = {(secção, chave)}"""
+        self._subscritores.append((callback, seccao))
+
+    def notificar(self, alteradas):
+        """Chama os subscritores afetados (na thread de quem chama, normalmente a da GUI)"""
+        if not alteradas:
+            return
+        for callback, seccao in list(self._subscritores):
+            afetadas = alteradas if seccao is None else {chave for chave in alteradas if chave[0] == seccao}
+            if not afetadas:
+                continue
+            try:
+                callback(afetadas)
+            except Exception as e:
+                print(f"❌ Erro ao aplicar definições alteradas: {e}")
+
+def _booleano(valor):
+    try:
+        return BOOLEANOS[valor.lower()]
+    except KeyError:
+        raise ValueError(f"Não é um booleano: {valor}")
@@ -0,0 +1,68 @@
+import os
+import json
+import sqlite3
+import threading
+import uuid
+
+class DiarioOffline:
+    """Diário local (SQLite em modo WAL) das vendas feitas sem ligação ao MySQL"""
+
+    def __init__(self, caminho='dados/diario_vendas.db'):
+        self.caminho = caminho
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Depois de uma venda vir para o diário por falta de servidor, as seguintes vêm diretamente
+        # (sem voltar a esperar pelo timeout) até um reenvio chegar ao servidor
+        self.servidor_em_baixo = False
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        # Uma venda registada tem de sobreviver a uma falha de energia
+        self._conexao.execute("PRAGMA synchronous=FULL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS vendas_pendentes (
+                numero_venda TEXT PRIMARY KEY,
+                dados TEXT NOT NULL,
+                criado_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        print(f"📒 Diário offline em {caminho} ({self.quantidade()} vendas pendentes)")
+
+    @staticmethod
+    def numero_local(caixa_id):
+        """Número de venda gerado sem a base de dados (não colide com a sequência do servidor)"""
+        return f"V{int(caixa_id):02d}-L{uuid.uuid4().hex[:12].upper()}"
+
+    def registar(self, dados_venda, itens, pagamentos):
+        """Guarda a venda no diário; registar a mesma venda duas vezes não a duplica"""
+        dados = json.dumps({'venda': dados_venda, 'itens': itens, 'pagamentos': pagamentos}, default=str)
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR IGNORE INTO vendas_pendentes (numero_venda, dados) VALUES (?, ?)",
+                (dados_venda['numero_venda'], dados)
+            )
+
+    def pendentes(self, limite=200):
+        """Vendas por enviar, pela ordem em que foram feitas"""
+        with self._lock:
+            linhas = self._conexao.execute(
+                "SELECT numero_venda, dados FROM vendas_pendentes ORDER BY rowid LIMIT ?", (limite,)
+            ).fetchall()
+        return [dict(json.loads(dados), numero_venda=numero) for numero, dados in linhas]
+
+    def remover(self, numeros):
+        with self._lock:
+            self._conexao.execute("BEGIN")
+            self._conexao.executemany("DELETE FROM vendas_pendentes WHERE numero_venda = ?",
+                                      [(numero,) for numero in numeros])
+            self._conexao.execute("COMMIT")
+
+    def quantidade(self):
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM vendas_pendentes").fetchone()[0]
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+
+class ExecutorConsultas(QObject):
+    """Executa consultas à base de dados numa pool de threads e entrega o resultado na thread da GUI"""
+    _concluido = pyqtSignal(object, object, object)  # callback, (chave, geração), valor
+
+    def __init__(self, max_threads=4, parent=None):
+        super().__init__(parent)
+        self._pool = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix='consulta')
+        self._lock = threading.Lock()
+        self._geracoes = {}
+        self._pendentes = {}
+        # O objeto vive na thread da GUI: sinais emitidos pelos workers chegam em fila
+        self._concluido.connect(self._entregar)
+
+    def submeter(self, funcao, *args, ao_concluir=None, ao_falhar=None, chave=None, **kwargs):
+        """Agenda funcao(*args, **kwargs) e devolve um Future.
+
+        ao_concluir(resultado) e ao_falhar(erro) correm na thread da GUI. Com `chave`,
+        uma submissão nova torna obsoletas as anteriores com a mesma chave: as que ainda
+        não começaram são canceladas e o resultado das restantes é ignorado.
+        """
+        geracao = None
+        if chave is not None:
+            with self._lock:
+                geracao = self._geracoes.get(chave, 0) + 1
+                self._geracoes[chave] = geracao
+                anterior = self._pendentes.get(chave)
+            if anterior is not None:
+                anterior.cancel()
+
+        future = self._pool.submit(funcao, *args, **kwargs)
+        if chave is not None:
+            with self._lock:
+                self._pendentes[chave] = future
+        future.add_done_callback(
+            lambda f: self._ao_terminar(f, ao_concluir, ao_falhar, (chave, geracao)))
+        return future
+
+    def _ao_terminar(self, future, ao_concluir, ao_falhar, marca):
+        """Corre na thread do worker: reencaminha o resultado para a thread da GUI"""
+        if future.cancelled():
+            return
+        erro = future.exception()
+        if erro is None:
+            self._concluido.emit(ao_concluir, marca, future.result())
+        else:
+            print(f"❌ Erro em consulta assíncrona: {erro}")
+            self._concluido.emit(ao_falhar, marca, erro)
+
+    def _entregar(self, callback, marca, valor):
+        """Corre na thread da GUI"""
+        chave, geracao = marca
+        if chave is not None:
+            with self._lock:
+                if self._geracoes.get(chave) != geracao:
+                    return  # Resultado obsoleto
+                self._pendentes.pop(chave, None)
+        if callback:
+            callback(valor)
+
+    def encerrar(self):
+        """Cancela trabalho pendente e liberta as threads"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, pyqtSignal
+
+class FilaScans(QObject):
+    """Fila limitada entre o scanner e o carrinho, processada por ordem numa thread própria.
+
+    - Leituras repetidas do mesmo código dentro de `janela_duplicados` segundos (o scanner que
+      lê duas vezes a mesma etiqueta) são descartadas.
+    - Um código igual ao último ainda por processar soma quantidade em vez de ocupar lugar.
+    - Com a fila cheia a leitura é recusada e `fila_cheia` avisa o operador (o scanner não
+      pode ser travado, por isso a contrapressão é o aviso para voltar a ler).
+    A procura do produto corre na thread da fila; `produto_lido` chega à thread da GUI pela
+    mesma ordem das leituras.
+    """
+    # código, quantidade, produto (None se não existe), instante da captura
+    produto_lido = pyqtSignal(str, int, object, float)
+    fila_cheia = pyqtSignal(str)
+
+    def __init__(self, procurar, capacidade=50, janela_duplicados=0.3, parent=None):
+        super().__init__(parent)
+        self.procurar = procurar
+        self.capacidade = capacidade
+        self.janela_duplicados = janela_duplicados
+        self._fila = deque()  # [codigo, quantidade, capturado]
+        self._condicao = threading.Condition()
+        self._ultima_leitura = (None, 0.0)
+        self._a_encerrar = False
+        self._contadores = dict(recebidos=0, processados=0, duplicados=0, agrupados=0,
+                                recusados=0, profundidade_maxima=0)
+        self._latencia_total = 0.0
+        self._latencia_maxima = 0.0
+        self._thread = threading.Thread(target=self._trabalhar, name='fila-scans', daemon=True)
+        self._thread.start()
+
+    def receber(self, codigo, capturado=None):
+        """Aceita uma leitura (thread da GUI ou do scanner); False se foi descartada ou recusada"""
+        codigo = codigo.strip()
+        if not codigo:
+            return False
+        capturado = capturado if capturado is not None else time.monotonic()
+
+        with self._condicao:
+            self._contadores['recebidos'] += 1
+            ultimo_codigo, ultimo_instante = self._ultima_leitura
+            self._ultima_leitura = (codigo, capturado)
+            if codigo == ultimo_codigo and capturado - ultimo_instante < self.janela_duplicados:
+                self._contadores['duplicados'] += 1
+                return False
+
+            if self._fila and self._fila[-1][0] == codigo:
+                self._fila[-1][1] += 1
+                self._contadores['agrupados'] += 1
+                return True
+
+            if len(self._fila) >= self.capacidade:
+                self._contadores['recusados'] += 1
+                recusado = True
+            else:
+                recusado = False
+                self._fila.append([codigo, 1, capturado])
+                self._contadores['profundidade_maxima'] = max(
+                    self._contadores['profundidade_maxima'], len(self._fila))
+                self._condicao.notify()
+
+        if recusado:
+            self.fila_cheia.emit(codigo)
+            return False
+        return True
+
+    def profundidade(self):
+        with self._condicao:
+            return len(self._fila)
+
+    def metricas(self):
+        """Contadores para monitorização (profundidade atual, descartes, latência captura->produto)"""
+        with self._condicao:
+            metricas = dict(self._contadores, profundidade=len(self._fila))
+            processados = metricas['processados']
+            metricas['latencia_media_ms'] = self._latencia_total / processados * 1000 if processados else 0.0
+            metricas['latencia_maxima_ms'] = self._latencia_maxima * 1000
+        return metricas
+
+    def _trabalhar(self):
+        while True:
+            with self._condicao:
+                while not self._fila and not self._a_encerrar:
+                    self._condicao.wait()
+                if self._a_encerrar:
+                    break
+                # Fica na fila durante a procura: uma leitura igual que chegue entretanto ainda
+                # soma à quantidade, lida só quando a entrada sai da fila
+                codigo, _, capturado = self._fila[0]
+
+            try:
+                produto = self.procurar(codigo)
+            except Exception as e:
+                print(f"❌ Erro ao procurar o código {codigo}: {e}")
+                produto = None
+
+            with self._condicao:
+                _, quantidade, _ = self._fila.popleft()
+                latencia = time.monotonic() - capturado
+                self._contadores['processados'] += 1
+                self._latencia_total += latencia
+                self._latencia_maxima = max(self._latencia_maxima, latencia)
+            self.produto_lido.emit(codigo, quantidade, produto, capturado)
+
+    def encerrar(self, espera=2):
+        """Termina a thread; leituras ainda na fila são descartadas"""
+        with self._condicao:
+            self._a_encerrar = True
+            self._condicao.notify()
+        self._thread.join(timeout=espera)
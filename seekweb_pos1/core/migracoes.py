@@ -0,0 +1,182 @@
+import os
+import re
+import datetime
+from core.motores import ERROS_BD
+from core.periodo import Periodo
+
+PASTA_MIGRACOES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migracoes')
+
+# 001_nome.sql aplica-se a todos os motores; 002_nome.sqlite.sql só ao SQLite
+FICHEIRO_MIGRACAO = re.compile(r"^(\d+)_(\w+?)(?:\.(mysql|sqlite))?\.sql$")
+
+# Consultas sobre as tabelas de vendas (relatório de clientes e reconstrução dos resumos diários)
+# na forma de Periodo.filtro, e o índice que cada tabela deve usar
+CONSULTAS_CRITICAS = [
+    ("Clientes mais frequentes", """
+        SELECT c.nome, COUNT(*) as total_compras, SUM(v.total_com_iva) as total_gasto
+        FROM vendas v
+        JOIN clientes c ON v.cliente_id = c.id
+        WHERE v.created_at >= %s AND v.created_at < %s AND v.estado = 'paga'
+        GROUP BY c.id, c.nome
+    """, 'periodo', {'v': 'idx_vendas_estado_data'}),
+    ("Vendas pagas por dia", """
+        SELECT DATE(v.created_at) as data, COUNT(*) as total_vendas, SUM(v.total_com_iva) as total_faturado
+        FROM vendas v
+        WHERE v.created_at >= %s AND v.created_at < %s AND v.estado = 'paga'
+        GROUP BY DATE(v.created_at)
+    """, 'periodo', {'v': 'idx_vendas_estado_data'}),
+    ("Itens vendidos por dia", """
+        SELECT p.nome, SUM(vi.quantidade) as total_vendido, SUM(vi.subtotal) as total_faturado
+        FROM venda_itens vi
+        JOIN produtos p ON vi.produto_id = p.id
+        JOIN vendas v ON vi.venda_id = v.id
+        WHERE v.created_at >= %s AND v.created_at < %s AND v.estado = 'paga'
+        GROUP BY p.id, p.nome
+    """, 'periodo', {'v': 'idx_vendas_estado_data', 'vi': 'idx_venda_itens_venda'}),
+    ("Pagamentos por dia", """
+        SELECT fp.nome, COUNT(*) as total_utilizacoes, SUM(vp.valor) as total_valor
+        FROM venda_pagamentos vp
+        JOIN formas_pagamento fp ON vp.forma_pagamento_id = fp.id
+        JOIN vendas v ON vp.venda_id = v.id
+        WHERE v.created_at >= %s AND v.created_at < %s AND v.estado = 'paga'
+        GROUP BY fp.id, fp.nome
+    """, 'periodo', {'v': 'idx_vendas_estado_data', 'vp': 'idx_venda_pagamentos_venda'}),
+    ("Movimentos do caixa do dia", """
+        SELECT mc.tipo, SUM(mc.valor) as total
+        FROM movimentos_caixa mc
+        WHERE mc.created_at >= %s AND mc.created_at < %s
+        GROUP BY mc.tipo
+    """, 'dia', {'mc': 'idx_movimentos_caixa_data'}),
+    ("Atualização incremental do catálogo", """
+        SELECT p.id FROM produtos p WHERE p.updated_at >= %s
+    """, 'marca', {'p': 'idx_produtos_updated_at'}),
+]
+
+# Migrações que criam tabelas derivadas e o passo que as preenche com o histórico
+def _preencher_resumos(db):
+    from models.resumos import ResumosDiarios
+    ResumosDiarios(db).reconstruir()
+
+PREENCHIMENTOS = {3: _preencher_resumos}
+
+def atualizar_base_dados(db):
+    """Aplica as migrações pendentes e preenche as tabelas que elas criaram; True se tudo correu bem"""
+    aplicadas = Migracoes(db).aplicar()
+    if aplicadas is None:
+        return False
+    for versao in aplicadas:
+        if versao in PREENCHIMENTOS:
+            PREENCHIMENTOS[versao](db)
+    return True
+
+class Migracoes:
+    """Aplica por ordem os ficheiros de migracoes/ que ainda não constam de schema_migracoes"""
+
+    def __init__(self, db, pasta=PASTA_MIGRACOES):
+        self.db = db
+        self.pasta = pasta
+
+    def disponiveis(self):
+        """[(versao, nome, caminho)] das migrações deste motor, por ordem de versão"""
+        migracoes = []
+        for ficheiro in os.listdir(self.pasta):
+            encontrado = FICHEIRO_MIGRACAO.match(ficheiro)
+            if encontrado is None:
+                continue
+            versao, nome, motor = encontrado.groups()
+            if motor and motor != self.db.motor.nome:
+                continue
+            migracoes.append((int(versao), nome, os.path.join(self.pasta, ficheiro)))
+        return sorted(migracoes)
+
+    def _criar_tabela(self):
+        self.db.execute_update("""
+            CREATE TABLE IF NOT EXISTS schema_migracoes (
+                versao INT PRIMARY KEY,
+                nome VARCHAR(255) NOT NULL,
+                aplicada_em TIMESTAMP NULL
+            )
+        """)
+
+    def aplicadas(self):
+        self._criar_tabela()
+        linhas = self.db.execute_query("SELECT versao FROM schema_migracoes") or []
+        return {linha['versao'] for linha in linhas}
+
+    def pendentes(self):
+        aplicadas = self.aplicadas()
+        return [migracao for migracao in self.disponiveis() if migracao[0] not in aplicadas]
+
+    def aplicar(self):
+        """Aplica as migrações pendentes; devolve as versões aplicadas (None se uma falhar)"""
+        pendentes = self.pendentes()
+        if not pendentes:
+            print("✅ Base de dados atualizada: nenhuma migração pendente")
+            return []
+
+        for versao, nome, caminho in pendentes:
+            print(f"🔧 Migração {versao:03d} {nome}...")
+            if not self._executar_ficheiro(caminho):
+                print(f"❌ Migração {versao:03d} falhou; as seguintes não foram aplicadas")
+                return None
+            self.db.execute_insert(
+                "INSERT INTO schema_migracoes (versao, nome, aplicada_em) VALUES (%s, %s, %s)",
+                (versao, nome, datetime.datetime.now())
+            )
+            print(f"✅ Migração {versao:03d} aplicada")
+        return [versao for versao, _, _ in pendentes]
+
+    def _executar_ficheiro(self, caminho):
+        """Executa as instruções do ficheiro uma a uma (DDL no MySQL faz commit implícito)"""
+        with open(caminho, 'r', encoding='utf-8') as f:
+            linhas = [linha for linha in f.read().splitlines() if not linha.strip().startswith('--')]
+
+        with self.db.lease() as conexao:
+            cursor = conexao.cursor()
+            try:
+                for instrucao in "\n".join(linhas).split(';'):
+                    if not instrucao.strip():
+                        continue
+                    try:
+                        cursor.execute(instrucao)
+                    except ERROS_BD as e:
+                        # Uma migração interrompida a meio pode ser repetida: o que já existe é ignorado
+                        if getattr(e, 'errno', None) == 1061 or 'already exists' in str(e):
+                            print(f"   ↪️ Já existia: {e}")
+                            continue
+                        print(f"❌ Erro na migração: {e}")
+                        return False
+            finally:
+                cursor.close()
+        return True
+
+    def verificar_indices(self):
+        """Confere com EXPLAIN se as consultas críticas usam os índices; devolve as falhas.
+
+        Em tabelas quase vazias o otimizador pode preferir ler a tabela inteira: a verificação
+        só é conclusiva numa base de dados com dados reais.
+        """
+        params = {
+            'periodo': Periodo.ultimos_dias(30).params,
+            'dia': Periodo.hoje().params,
+            'marca': (datetime.datetime.now() - datetime.timedelta(seconds=30),)
+        }
+
+        falhas = []
+        for nome, query, tipo_params, esperados in CONSULTAS_CRITICAS:
+            try:
+                plano = {linha['tabela']: linha for linha in self.db.explicar(query, params[tipo_params])}
+            except ERROS_BD as e:
+                print(f"❌ {nome}: {e}")
+                falhas.append((nome, str(e)))
+                continue
+
+            for tabela, indice in esperados.items():
+                linha = plano.get(tabela)
+                if linha and linha['indice'] == indice:
+                    print(f"✅ {nome}: {tabela} usa {indice}")
+                else:
+                    detalhe = linha['detalhe'] if linha else 'tabela fora do plano'
+                    print(f"⚠️ {nome}: {tabela} não usa {indice} ({detalhe})")
+                    falhas.append((nome, f"{tabela}: {detalhe}"))
+        return falhas
@@ -0,0 +1,256 @@
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+try:
+    import mysql.connector
+    from mysql.connector import errors as erros_mysql
+    from mysql.connector.constants import DEFAULT_CONFIGURATION as _CONFIGURACAO_MYSQL
+    # read_timeout/write_timeout só existem nas versões recentes do conector (9.3+)
+    TIMEOUT_LEITURA_MYSQL = 'read_timeout' in _CONFIGURACAO_MYSQL
+    # Timeouts (connect/leitura/escrita) das versões recentes: a conexão fica fechada
+    ERROS_TIMEOUT_MYSQL = tuple(getattr(erros_mysql, nome) for nome in
+                                ('ConnectionTimeoutError', 'ReadTimeoutError', 'WriteTimeoutError')
+                                if hasattr(erros_mysql, nome))
+except ImportError:
+    # Numa loja só com SQLite o conector MySQL não precisa de estar instalado
+    mysql = None
+    erros_mysql = None
+    TIMEOUT_LEITURA_MYSQL = False
+    ERROS_TIMEOUT_MYSQL = ()
+
+# Erros de base de dados de qualquer motor (para os except do Database)
+ERROS_BD = (sqlite3.Error,) + ((mysql.connector.Error,) if mysql else ())
+
+class MotorMySQL:
+    """Servidor MySQL (várias caixas a partilhar a mesma base de dados)"""
+    nome = 'mysql'
+    local = False
+
+    # Erros do cliente que indicam servidor inacessível ou ligação perdida
+    ERROS_LIGACAO = {2002, 2003, 2005, 2006, 2013, 2055}
+
+    def __init__(self, config):
+        if mysql is None:
+            raise RuntimeError("mysql-connector-python não está instalado (motor = mysql no config.ini)")
+        self.config = config
+        self.ErroPool = erros_mysql.PoolError
+
+    def descricao(self):
+        return f"MySQL em {self.config.get('Database', 'host')}"
+
+    def ligar(self):
+        # Sem timeouts, uma rede que perde pacotes prende o connect (minutos de SYN) ou uma leitura
+        # num socket meio aberto; a venda corre na thread da GUI e nunca chegaria ao diário offline
+        timeout_ligacao = self.config.getint('Database', 'timeout_ligacao', fallback=3)
+        timeout_leitura = self.config.getint('Database', 'timeout_leitura', fallback=10)
+        if TIMEOUT_LEITURA_MYSQL:
+            timeouts = dict(connection_timeout=timeout_ligacao,
+                            read_timeout=timeout_leitura, write_timeout=timeout_leitura)
+        else:
+            # Conectores mais antigos: na implementação pura, connection_timeout é o timeout do
+            # socket e vale também para as leituras (na extensão C só limitaria o connect)
+            timeouts = dict(connection_timeout=max(timeout_ligacao, timeout_leitura), use_pure=True)
+        return mysql.connector.connect(
+            host=self.config.get('Database', 'host'),
+            user=self.config.get('Database', 'user'),
+            password=self.config.get('Database', 'password'),
+            database=self.config.get('Database', 'database'),
+            port=self.config.getint('Database', 'port'),
+            # Sem autocommit, uma conexão só de leitura ficaria presa num snapshot antigo
+            autocommit=True,
+            **timeouts
+        )
+
+    def erro_de_ligacao(self, erro):
+        """Indica se o erro se deve à ligação (e não à query)"""
+        return (isinstance(erro, (erros_mysql.InterfaceError,) + ERROS_TIMEOUT_MYSQL)
+                or getattr(erro, 'errno', None) in self.ERROS_LIGACAO)
+
+    def plano(self, conexao, query, params=None):
+        """EXPLAIN: uma linha por tabela com o índice escolhido (key) pelo otimizador"""
+        cursor = conexao.cursor(dictionary=True)
+        cursor.execute("EXPLAIN " + query, params or ())
+        linhas = cursor.fetchall()
+        cursor.close()
+        return [{
+            'tabela': linha['table'],
+            'indice': linha['key'],
+            'detalhe': f"{linha['type']} {linha.get('Extra') or ''}".strip()
+        } for linha in linhas]
+
+class PoolEsgotadoSQLite(sqlite3.OperationalError):
+    pass
+
+class MotorSQLite:
+    """Ficheiro SQLite local (loja com uma só caixa: sem servidor para instalar nem manter)"""
+    nome = 'sqlite'
+    local = True
+    ErroPool = PoolEsgotadoSQLite
+
+    def __init__(self, config):
+        self.config = config
+        self.ficheiro = config.get('Database', 'ficheiro', fallback='dados/seekweb.db')
+
+    def descricao(self):
+        return f"SQLite em {self.ficheiro}"
+
+    def ligar(self):
+        conexao = sqlite3.connect(
+            self.ficheiro,
+            factory=ConexaoSQLite,
+            # Equivalente ao autocommit=True do MySQL; as transações abrem com start_transaction()
+            isolation_level=None,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            timeout=self.config.getint('Database', 'pool_timeout', fallback=10)
+        )
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        conexao.execute("PRAGMA foreign_keys=ON")
+        return conexao
+
+    def erro_de_ligacao(self, erro):
+        # Um ficheiro local não "perde a ligação"
+        return False
+
+    def plano(self, conexao, query, params=None):
+        """EXPLAIN QUERY PLAN no mesmo formato do MySQL (tabela, índice, detalhe)"""
+        cursor = conexao.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + query, params or ())
+        plano = []
+        for linha in cursor.fetchall():
+            detalhe = linha[-1]
+            acesso = PLANO_SQLITE.match(detalhe)
+            if acesso is None:
+                continue  # USE TEMP B-TREE, CORRELATED SUBQUERY, ...
+            indice = acesso.group(3) or ('PRIMARY' if 'PRIMARY KEY' in detalhe else None)
+            plano.append({'tabela': acesso.group(2) or acesso.group(1), 'indice': indice, 'detalhe': detalhe})
+        cursor.close()
+        return plano
+
+    @staticmethod
+    def aplicar_schema(ficheiro, caminho_schema='schema_sqlite.sql'):
+        """Cria as tabelas e os dados iniciais num ficheiro SQLite"""
+        with open(caminho_schema, 'r', encoding='utf-8') as f:
+            script = f.read()
+        conexao = sqlite3.connect(ficheiro)
+        try:
+            conexao.executescript(script)
+        finally:
+            conexao.close()
+
+MOTORES = {'mysql': MotorMySQL, 'sqlite': MotorSQLite}
+
+def criar_motor(config):
+    """Motor escolhido em [Database] motor no config.ini (mysql por omissão)"""
+    nome = (config.get('Database', 'motor', fallback='mysql') or 'mysql').strip().lower()
+    if nome not in MOTORES:
+        raise ValueError(f"Motor de base de dados desconhecido: {nome} (use {' ou '.join(MOTORES)})")
+    return MOTORES[nome](config)
+
+# --- Dialeto SQLite -------------------------------------------------------------------------
+# As queries dos modelos e dos relatórios estão escritas para MySQL; as poucas construções
+# que o SQLite não conhece são reescritas aqui, uma vez por texto de query (lru_cache).
+
+HOJE_SQLITE = "DATE('now', 'localtime')"
+
+def _intervalo_dias(m):
+    sinal = '-' if m.group(1).upper() == 'SUB' else '+'
+    dias = m.group(2)
+    modificador = f"'{sinal}{dias} days'" if dias.isdigit() else f"'{sinal}' || {dias} || ' days'"
+    return f"DATE('now', 'localtime', {modificador})"
+
+def _upsert(m):
+    # VALUES(coluna) do MySQL é excluded.coluna no upsert do SQLite (3.35+ dispensa o alvo do conflito)
+    return "ON CONFLICT DO UPDATE SET" + re.sub(r"\bVALUES\((\w+)\)", r"excluded.\1", m.group(1), flags=re.I)
+
+REGRAS_SQLITE = [
+    (re.compile(r"DATE_(SUB|ADD)\(\s*CURDATE\(\)\s*,\s*INTERVAL\s+(\d+|%s)\s+DAY\s*\)", re.I), _intervalo_dias),
+    (re.compile(r"CURDATE\(\)", re.I), lambda m: HOJE_SQLITE),
+    (re.compile(r"NOW\(\)", re.I), lambda m: "DATETIME('now', 'localtime')"),
+    # MAX() com vários argumentos é o GREATEST() do SQLite
+    (re.compile(r"\bGREATEST\(", re.I), lambda m: "MAX("),
+    # Com BEGIN IMMEDIATE a transação já tem o lock de escrita da base de dados inteira
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), lambda m: ""),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), lambda m: "INSERT OR IGNORE"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b(.*)$", re.I | re.S), _upsert),
+    (re.compile(r"%s"), lambda m: "?"),
+]
+
+@lru_cache(maxsize=512)
+def traduzir_sqlite(query):
+    """Reescreve uma query MySQL no dialeto SQLite"""
+    for padrao, substituicao in REGRAS_SQLITE:
+        query = padrao.sub(substituicao, query)
+    return query
+
+# Valores Python <-> SQLite com os mesmos tipos que o mysql.connector devolve
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(' ', 'seconds'))
+sqlite3.register_adapter(date, lambda valor: valor.isoformat())
+sqlite3.register_converter('DECIMAL', lambda valor: Decimal(valor.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda valor: datetime.fromisoformat(valor.decode()))
+sqlite3.register_converter('DATETIME', lambda valor: datetime.fromisoformat(valor.decode()))
+sqlite3.register_converter('DATE', lambda valor: date.fromisoformat(valor.decode()))
+
+# "SEARCH v USING COVERING INDEX idx (...)", "SCAN p" ou, em versões antigas, "SCAN TABLE produtos AS p"
+PLANO_SQLITE = re.compile(r"(?:SCAN|SEARCH)(?: TABLE)? (\w+)(?: AS (\w+))?(?: USING (?:COVERING )?INDEX (\w+))?")
+
+DATA_ISO = re.compile(r"\d{4}-\d{2}-\d{2}( \d{2}:\d{2}:\d{2}(\.\d+)?)?$")
+
+def _valor_sqlite(valor):
+    """Expressões (SUM, DATE(), MAX(created_at)...) não têm tipo declarado: alinhar com o MySQL"""
+    if isinstance(valor, float):
+        # Somas de REAL trazem ruído (79.80000000000001); 6 casas é a escala do AVG de DECIMAL no MySQL
+        return Decimal(str(round(valor, 6)))
+    if isinstance(valor, str) and len(valor) >= 10 and valor[4] == '-' and DATA_ISO.match(valor):
+        return date.fromisoformat(valor) if len(valor) == 10 else datetime.fromisoformat(valor)
+    return valor
+
+class CursorSQLite(sqlite3.Cursor):
+    """Cursor com a interface usada do mysql.connector: placeholders %s e linhas em dicionário"""
+    dicionario = False
+
+    def execute(self, query, params=()):
+        return super().execute(traduzir_sqlite(query), tuple(params or ()))
+
+    def executemany(self, query, params_seq):
+        return super().executemany(traduzir_sqlite(query), [tuple(p) for p in params_seq])
+
+    def _linhas(self, linhas):
+        if self.dicionario:
+            colunas = [coluna[0] for coluna in self.description]
+            return [dict(zip(colunas, map(_valor_sqlite, linha))) for linha in linhas]
+        return [tuple(map(_valor_sqlite, linha)) for linha in linhas]
+
+    def fetchone(self):
+        linha = super().fetchone()
+        return None if linha is None else self._linhas([linha])[0]
+
+    def fetchall(self):
+        return self._linhas(super().fetchall())
+
+class ConexaoSQLite(sqlite3.Connection):
+    """Conexão SQLite com os métodos do mysql.connector que o Database usa"""
+
+    def cursor(self, dictionary=False):
+        cursor = super().cursor(CursorSQLite)
+        cursor.dicionario = dictionary
+        return cursor
+
+    def start_transaction(self):
+        # IMMEDIATE: o lock de escrita é tomado já, em vez de falhar a meio da venda
+        self.execute("BEGIN IMMEDIATE")
+
+    def ping(self, reconnect=False):
+        self.execute("SELECT 1")
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except sqlite3.Error:
+            return False
@@ -0,0 +1,49 @@
+import datetime
+from collections import namedtuple
+
+class Periodo(namedtuple('Periodo', ['inicio', 'fim'])):
+    """Intervalo semiaberto [inicio, fim) de timestamps para filtrar created_at.
+
+    Comparar a coluna diretamente (created_at >= inicio AND created_at < fim) deixa a base de
+    dados percorrer só a parte do índice do período; DATE(created_at) = CURDATE() obriga a
+    calcular DATE() em todas as linhas da tabela.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def dia(cls, data=None):
+        """O dia inteiro de `data` (hoje por omissão)"""
+        inicio = datetime.datetime.combine(data or datetime.date.today(), datetime.time.min)
+        return cls(inicio, inicio + datetime.timedelta(days=1))
+
+    @classmethod
+    def hoje(cls):
+        return cls.dia()
+
+    @classmethod
+    def ultimos_dias(cls, dias):
+        """Desde as 00:00 de há `dias` dias até ao fim de hoje (o antigo DATE_SUB(CURDATE(), INTERVAL n DAY))"""
+        hoje = cls.hoje()
+        return cls(hoje.inicio - datetime.timedelta(days=dias), hoje.fim)
+
+    @classmethod
+    def entre_datas(cls, data_inicio, data_fim):
+        """Do início de data_inicio ao fim de data_fim (ambos incluídos); aceita date ou 'yyyy-mm-dd'"""
+        if isinstance(data_inicio, str):
+            data_inicio = datetime.date.fromisoformat(data_inicio)
+        if isinstance(data_fim, str):
+            data_fim = datetime.date.fromisoformat(data_fim)
+        return cls(cls.dia(data_inicio).inicio, cls.dia(data_fim).fim)
+
+    def filtro(self, coluna='created_at'):
+        """Condição SQL para a coluna; os valores vêm de `params`"""
+        return f"{coluna} >= %s AND {coluna} < %s"
+
+    @property
+    def params(self):
+        return (self.inicio, self.fim)
+
+    @property
+    def datas(self):
+        """Os limites como datas, para filtrar colunas DATE (os resumos diários)"""
+        return (self.inicio.date(), self.fim.date())
@@ -0,0 +1,120 @@
+import unicodedata
+
+def normalizar(texto):
+    """Minúsculas e sem acentos ("Óptico" -> "optico")"""
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+def trigramas(texto, prefixo=True):
+    """Trigramas de cada palavra; o espaço inicial dá peso aos prefixos"""
+    resultado = set()
+    for palavra in texto.split():
+        if prefixo:
+            palavra = f" {palavra}"
+        resultado.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return resultado
+
+class IndiceProcura:
+    """Índice de trigramas sobre nome, código de barras e referência dos produtos"""
+
+    # Fração mínima de trigramas em comum para aceitar um resultado aproximado (erros de escrita)
+    SIMILARIDADE_MINIMA = 0.6
+    MAX_APROXIMADOS = 100
+
+    def __init__(self):
+        self._textos = {}
+        self._nomes = {}
+        self._codigos = {}
+        self._trigramas = {}
+
+    def adicionar(self, produto):
+        produto_id = produto['id']
+        self.remover(produto_id)
+        nome = normalizar(produto.get('nome'))
+        codigos = {normalizar(produto.get('codigo_barras')), normalizar(produto.get('referencia'))} - {""}
+        texto = " ".join([nome, *codigos])
+
+        self._textos[produto_id] = texto
+        self._nomes[produto_id] = nome
+        self._codigos[produto_id] = codigos
+        for trigrama in trigramas(texto):
+            self._trigramas.setdefault(trigrama, set()).add(produto_id)
+
+    def remover(self, produto_id):
+        texto = self._textos.pop(produto_id, None)
+        if texto is None:
+            return
+        self._nomes.pop(produto_id, None)
+        self._codigos.pop(produto_id, None)
+        for trigrama in trigramas(texto):
+            ids = self._trigramas.get(trigrama)
+            if ids:
+                ids.discard(produto_id)
+                if not ids:
+                    del self._trigramas[trigrama]
+
+    def limpar(self):
+        self._textos.clear()
+        self._nomes.clear()
+        self._codigos.clear()
+        self._trigramas.clear()
+
+    def procurar(self, filtro):
+        """Devolve ids ordenados por relevância; sem resultados exatos tenta uma procura aproximada"""
+        palavras = normalizar(filtro).split()
+        if not palavras:
+            return []
+
+        candidatos = None
+        for palavra in palavras:
+            # Sem espaço inicial: a palavra pode aparecer a meio ("tico" em "optico")
+            grupos = [self._trigramas.get(t, set()) for t in trigramas(palavra, prefixo=False)]
+            if grupos and all(grupos):
+                grupos.sort(key=len)
+                ids = set(grupos[0]).intersection(*grupos[1:])
+            elif grupos:
+                ids = set()
+            else:
+                ids = set(self._textos)  # Menos de 3 letras: verificar só por substring
+            candidatos = ids if candidatos is None else candidatos & ids
+            if not candidatos:
+                break
+
+        # Os trigramas só filtram: a confirmação é por substring, como o LIKE '%x%'
+        encontrados = [i for i in candidatos or ()
+                       if all(p in self._textos[i] for p in palavras)]
+        if not encontrados:
+            encontrados = self._aproximados(palavras)
+
+        consulta = " ".join(palavras)
+        return sorted(encontrados, key=lambda i: (self._relevancia(i, consulta, palavras), self._nomes[i]))
+
+    def _relevancia(self, produto_id, consulta, palavras):
+        """0 = código exato, 1 = nome começa pela pesquisa, 2 = palavra do nome começa por ela, 3 = resto"""
+        if consulta in self._codigos[produto_id]:
+            return 0
+        nome = self._nomes[produto_id]
+        if nome.startswith(consulta):
+            return 1
+        palavras_nome = nome.split()
+        if all(any(n.startswith(p) for n in palavras_nome) for p in palavras):
+            return 2
+        return 3
+
+    def _aproximados(self, palavras):
+        """Produtos com a maioria dos trigramas da pesquisa (tolera erros de escrita)"""
+        procurados = set().union(*(trigramas(p) for p in palavras))
+        if not procurados:
+            return []
+
+        contagem = {}
+        for trigrama in procurados:
+            for produto_id in self._trigramas.get(trigrama, ()):
+                contagem[produto_id] = contagem.get(produto_id, 0) + 1
+
+        minimo = len(procurados) * self.SIMILARIDADE_MINIMA
+        melhores = sorted((i for i, n in contagem.items() if n >= minimo),
+                          key=lambda i: -contagem[i])
+        return melhores[:self.MAX_APROXIMADOS]
@@ -0,0 +1,65 @@
+import queue
+import threading
+from concurrent.futures import Future
+from PyQt5.QtCore import QObject, pyqtSignal
+
+class FilaPosVenda(QObject):
+    """Trabalho depois do commit de uma venda (recibo, impressão, pontos, cache) numa thread própria"""
+    # numero_venda, etapa, estado ('ok', 'ignorado', 'erro' ou 'agendado'), detalhe
+    estado_alterado = pyqtSignal(str, str, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._fila = queue.Queue()
+        # Uma só thread: as vendas são tratadas por ordem e a impressora nunca é disputada
+        self._thread = threading.Thread(target=self._trabalhar, name='pos-venda', daemon=True)
+        self._thread.start()
+
+    def agendar(self, numero_venda, etapas, contexto=None):
+        """Agenda as etapas [(nome, funcao)] de uma venda; cada funcao recebe o contexto partilhado.
+
+        Uma etapa que devolve None é marcada como 'ignorado'; uma exceção marca 'erro'
+        sem impedir as etapas seguintes. Uma etapa que entrega o trabalho a outro executor
+        devolve o Future: fica 'agendado' e o 'ok' ou 'erro' chega quando o Future terminar.
+        """
+        contexto = dict(contexto or {}, numero_venda=numero_venda)
+        self._fila.put((str(numero_venda), list(etapas), contexto))
+
+    def pendentes(self):
+        return self._fila.qsize()
+
+    def _trabalhar(self):
+        while True:
+            trabalho = self._fila.get()
+            if trabalho is None:
+                break
+            numero_venda, etapas, contexto = trabalho
+            for nome, funcao in etapas:
+                try:
+                    detalhe = funcao(contexto)
+                    estado = 'ignorado' if detalhe is None else 'ok'
+                except Exception as e:
+                    print(f"⚠️ Pós-venda {numero_venda}: erro na etapa {nome}: {e}")
+                    estado, detalhe = 'erro', str(e)
+                if isinstance(detalhe, Future):
+                    # 'agendado' sai antes: um Future já concluído chama o callback de imediato
+                    self.estado_alterado.emit(numero_venda, nome, 'agendado', '')
+                    detalhe.add_done_callback(
+                        lambda future, numero=numero_venda, etapa=nome: self._concluir(numero, etapa, future))
+                    continue
+                self.estado_alterado.emit(numero_venda, nome, estado, str(detalhe or ''))
+
+    def _concluir(self, numero_venda, etapa, future):
+        """Estado final de uma etapa agendada (corre na thread de quem concluiu o Future)"""
+        if future.cancelled():
+            estado, detalhe = 'erro', 'cancelado'
+        elif future.exception() is not None:
+            estado, detalhe = 'erro', str(future.exception())
+        else:
+            estado, detalhe = 'ok', future.result()
+        self.estado_alterado.emit(numero_venda, etapa, estado, str(detalhe or ''))
+
+    def encerrar(self, espera=5):
+        """Termina a thread depois das vendas já agendadas (espera no máximo `espera` segundos)"""
+        self._fila.put(None)
+        self._thread.join(timeout=espera)
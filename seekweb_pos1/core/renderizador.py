@@ -0,0 +1,121 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from PyQt5.QtCore import QObject, pyqtSignal
+# Os processos de recibos só recebem funções deste módulo: não importam o Qt
+from utils import processo_recibos
+
+class RenderizadorRecibos(QObject):
+    """Gera os recibos PDF numa pool de processos, sem disputar o GIL com a caixa.
+
+    Recebe um instantâneo da venda (dicionários com texto, números, Decimal e datas: passa por
+    pickle) e entrega o caminho do PDF a ao_concluir, ou a exceção a ao_falhar, na thread da GUI.
+    No máximo `capacidade` recibos ficam pendentes; submeter() espera por um lugar no máximo
+    `espera` segundos e devolve None se não o conseguir.
+    """
+    _concluido = pyqtSignal(object, object)  # callback, valor
+
+    def __init__(self, local_recibos='recibos/', processos=1, capacidade=8, parent=None):
+        super().__init__(parent)
+        self.local_recibos = local_recibos
+        self.processos = processos
+        self.capacidade = capacidade
+        self._condicao = threading.Condition()
+        self._pendentes = 0
+        self._futures = set()
+        self._pool = self._criar_pool()
+        # O objeto vive na thread da GUI: os sinais emitidos pela pool chegam em fila
+        self._concluido.connect(self._entregar)
+
+    def _criar_pool(self):
+        # spawn: um fork do processo da caixa (Qt, threads, conexões) pode herdar locks presos
+        return ProcessPoolExecutor(max_workers=self.processos, mp_context=multiprocessing.get_context('spawn'))
+
+    @staticmethod
+    def instantaneo(venda, itens, pagamentos, empresa_info):
+        """Cópia independente dos dados do recibo, para enviar a outro processo"""
+        return {
+            'venda': dict(venda),
+            'itens': [dict(item) for item in itens],
+            'pagamentos': [dict(pagamento) for pagamento in pagamentos or []],
+            'empresa': dict(empresa_info or {})
+        }
+
+    def _submeter_pool(self, funcao, *argumentos):
+        try:
+            return self._pool.submit(funcao, *argumentos)
+        except BrokenProcessPool:
+            # Um processo de recibos morreu: este e os seguintes vão para uma pool nova
+            print("⚠️ Processo de recibos terminou inesperadamente; a reiniciar")
+            self._pool.shutdown(wait=False)
+            self._pool = self._criar_pool()
+            return self._pool.submit(funcao, *argumentos)
+
+    def aquecer(self):
+        """Arranca o processo e importa o reportlab antes do primeiro recibo"""
+        try:
+            self._submeter_pool(processo_recibos.aquecer)
+        except Exception as e:
+            # Sem aquecimento o primeiro recibo só demora mais
+            print(f"⚠️ Não foi possível aquecer o processo de recibos: {e}")
+
+    def submeter(self, instantaneo, ao_concluir=None, ao_falhar=None, espera=0):
+        """Agenda o recibo e devolve o Future; None se a fila continuou cheia durante `espera` segundos.
+
+        Na thread da GUI usar espera=0: a caixa nunca fica à espera de recibos.
+        """
+        with self._condicao:
+            if not self._condicao.wait_for(lambda: self._pendentes < self.capacidade, timeout=espera):
+                print(f"⚠️ Fila de recibos cheia ({self._pendentes} pendentes)")
+                return None
+            self._pendentes += 1
+
+        try:
+            future = self._submeter_pool(processo_recibos.renderizar, self.local_recibos, instantaneo)
+        except Exception:
+            self._libertar()
+            raise
+
+        with self._condicao:
+            self._futures.add(future)
+        future.add_done_callback(lambda f: self._ao_terminar(f, ao_concluir, ao_falhar))
+        return future
+
+    def pendentes(self):
+        with self._condicao:
+            return self._pendentes
+
+    def _libertar(self, future=None):
+        with self._condicao:
+            self._pendentes -= 1
+            self._futures.discard(future)
+            self._condicao.notify()
+
+    def _ao_terminar(self, future, ao_concluir, ao_falhar):
+        """Corre numa thread da pool: liberta o lugar e reencaminha o resultado para a thread da GUI"""
+        self._libertar(future)
+        if future.cancelled():
+            return
+        erro = future.exception()
+        if erro is None:
+            self._concluido.emit(ao_concluir, future.result())
+        else:
+            print(f"❌ Erro ao gerar recibo: {erro}")
+            self._concluido.emit(ao_falhar, erro)
+
+    def _entregar(self, callback, valor):
+        """Corre na thread da GUI"""
+        if callback:
+            callback(valor)
+
+    def encerrar(self, espera=5):
+        """Termina os processos: recibos por começar são cancelados e os que estão a ser gerados
+        têm no máximo `espera` segundos para acabar"""
+        with self._condicao:
+            futures = set(self._futures)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        em_curso = [future for future in futures if not future.cancelled()]
+        if len(em_curso) < len(futures):
+            print(f"⚠️ {len(futures) - len(em_curso)} recibos por gerar cancelados ao fechar")
+        wait(em_curso, timeout=espera)
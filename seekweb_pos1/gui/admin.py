@@ -7,14 +7,21 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import pyqtSignal, QDate, Qt
 from PyQt5.QtGui import QFont, QColor, QPainter
 import datetime
+import time
 from decimal import Decimal
-import matplotlib
-matplotlib.use('Qt5Agg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 from PyQt5.QtWidgets import QInputDialog, QListWidget, QListWidgetItem
 import json
+from core.executor import ExecutorConsultas
+from core.periodo import Periodo
+from core.definicoes import Definicoes
+
+def carregar_matplotlib():
+    """Importa o matplotlib só quando o primeiro gráfico é desenhado (pesa no arranque da caixa)"""
+    import matplotlib
+    matplotlib.use('Qt5Agg')
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+    from matplotlib.figure import Figure
+    return Figure, FigureCanvasQTAgg
 
 class AdminWindow(QWidget):
     logout_requested = pyqtSignal()
@@ -23,6 +30,10 @@ class AdminWindow(QWidget):
         super().__init__(parent)
         self.db = db
         self._usuario_atual = None
+        # Consultas correm fora da thread da GUI para o painel nunca congelar
+        self.executor = getattr(parent, 'executor', None) or ExecutorConsultas(parent=self)
+        # Definições partilhadas da aplicação (recarregadas depois de gravar as configurações)
+        self.config = getattr(parent, 'config', None)
         self.setup_ui()
     
     @property
@@ -53,104 +64,115 @@ class AdminWindow(QWidget):
         header_layout.addWidget(logout_btn)
         main_layout.addLayout(header_layout)
         
-        # Tabs
+        # Tabs: cada aba é construída (e consulta a base de dados) só quando é mostrada
         self.tabs = QTabWidget()
-        
-        # Tab Dashboard
-        dashboard_tab = QWidget()
-        self.setup_dashboard_tab(dashboard_tab)
-        self.tabs.addTab(dashboard_tab, "📊 Dashboard")
-        
-        # Tab Relatórios
-        relatorios_tab = QWidget()
-        self.setup_relatorios_tab(relatorios_tab)
-        self.tabs.addTab(relatorios_tab, "📈 Relatórios")
-        
-        # Tab Produtos
-        produtos_tab = QWidget()
-        self.setup_produtos_tab(produtos_tab)
-        self.tabs.addTab(produtos_tab, "📦 Produtos")
-        
-        # Tab Usuários
-        usuarios_tab = QWidget()
-        self.setup_usuarios_tab(usuarios_tab)
-        self.tabs.addTab(usuarios_tab, "👥 Usuários")
-        
-        # Tab Clientes
-        clientes_tab = QWidget()
-        self.setup_clientes_tab(clientes_tab)
-        self.tabs.addTab(clientes_tab, "👥 Clientes")
-        
-        # Tab Vendas
-        vendas_tab = QWidget()
-        self.setup_vendas_tab(vendas_tab)
-        self.tabs.addTab(vendas_tab, "💰 Vendas")
-        
-        # Tab Caixa
-        caixa_tab = QWidget()
-        self.setup_caixa_tab(caixa_tab)
-        self.tabs.addTab(caixa_tab, "💵 Caixa")
-        
-        # Tab Promoções
-        promocoes_tab = QWidget()
-        self.setup_promocoes_tab(promocoes_tab)
-        self.tabs.addTab(promocoes_tab, "🎯 Promoções")
-        
-        # Tab Configurações
-        config_tab = QWidget()
-        self.setup_config_tab(config_tab)
-        self.tabs.addTab(config_tab, "⚙️ Configurações")
+        # (título, construtor, recarga ao voltar ao painel)
+        self.definicao_abas = [
+            ("📊 Dashboard", self.setup_dashboard_tab, self.carregar_dashboard),
+            ("📈 Relatórios", self.setup_relatorios_tab, None),
+            ("📦 Produtos", self.setup_produtos_tab, self.carregar_produtos),
+            ("👥 Usuários", self.setup_usuarios_tab, self.carregar_usuarios),
+            ("👥 Clientes", self.setup_clientes_tab, self.carregar_clientes),
+            ("💰 Vendas", self.setup_vendas_tab, None),
+            ("💵 Caixa", self.setup_caixa_tab, self.carregar_caixa),
+            ("🎯 Promoções", self.setup_promocoes_tab, self.carregar_promocoes),
+            ("⚙️ Configurações", self.setup_config_tab, None),
+        ]
+        self.abas_construidas = set()
+        for titulo, _, _ in self.definicao_abas:
+            self.tabs.addTab(QWidget(), titulo)
+        self.tabs.currentChanged.connect(self.construir_aba)
         
         main_layout.addWidget(self.tabs)
         self.setLayout(main_layout)
     
+    def construir_aba(self, indice):
+        """Constrói a aba na primeira vez que é mostrada; True se foi construída agora"""
+        if indice < 0 or indice in self.abas_construidas or not self.isVisible():
+            return False
+        self.abas_construidas.add(indice)
+        _, construtor, _ = self.definicao_abas[indice]
+        inicio = time.perf_counter()
+        construtor(self.tabs.widget(indice))
+        print(f"🧩 Aba {self.tabs.tabText(indice)} construída em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+        return True
+    
     def setup_dashboard_tab(self, parent):
-        """Dashboard com métricas e gráficos"""
+        """Dashboard com métricas e gráficos (dados carregados em segundo plano)"""
         layout = QVBoxLayout()
         
         # Métricas rápidas
         metrics_layout = QHBoxLayout()
         
         # Vendas do dia
-        vendas_hoje = self.obter_vendas_hoje()
-        metric_vendas = self.criar_metric_card("💰 Vendas Hoje", f" {vendas_hoje['quantidade']}", f" {vendas_hoje['total']:.2f} Kz", "#27ae60")
-        metrics_layout.addWidget(metric_vendas)
+        self.metric_vendas = self.criar_metric_card("💰 Vendas Hoje", " ...", " ... Kz", "#27ae60")
+        metrics_layout.addWidget(self.metric_vendas)
         
         # Produtos com stock baixo
-        stock_baixo = self.obter_produtos_stock_baixo()
-        metric_stock = self.criar_metric_card("📦 Stock Baixo", f" {stock_baixo}", "Produtos", "#e74c3c")
-        metrics_layout.addWidget(metric_stock)
+        self.metric_stock = self.criar_metric_card("📦 Stock Baixo", " ...", "Produtos", "#e74c3c")
+        metrics_layout.addWidget(self.metric_stock)
         
         # Clientes cadastrados
-        total_clientes = self.obter_total_clientes()
-        metric_clientes = self.criar_metric_card("👥 Clientes", f" {total_clientes}", "Cadastrados", "#3498db")
-        metrics_layout.addWidget(metric_clientes)
+        self.metric_clientes = self.criar_metric_card("👥 Clientes", " ...", "Cadastrados", "#3498db")
+        metrics_layout.addWidget(self.metric_clientes)
         
         # Valor em stock
-        valor_stock = self.obter_valor_stock()
-        metric_valor_stock = self.criar_metric_card("🏪 Valor Stock", f" {valor_stock:.2f}", "Kz em produtos", "#f39c12")
-        metrics_layout.addWidget(metric_valor_stock)
+        self.metric_valor_stock = self.criar_metric_card("🏪 Valor Stock", " ...", "Kz em produtos", "#f39c12")
+        metrics_layout.addWidget(self.metric_valor_stock)
         
         layout.addLayout(metrics_layout)
         
-        # Gráficos e informações
-        charts_layout = QHBoxLayout()
+        # Gráficos e informações (substituídos quando os dados chegam)
+        self.dashboard_charts_layout = QHBoxLayout()
         
         # Gráfico de vendas da semana
-        chart_vendas = self.criar_grafico_vendas_semana()
-        charts_layout.addWidget(chart_vendas, 2)
+        self.chart_vendas = self.criar_placeholder_carregando()
+        self.dashboard_charts_layout.addWidget(self.chart_vendas, 2)
         
         # Produtos mais vendidos
-        produtos_populares = self.criar_lista_produtos_populares()
-        charts_layout.addWidget(produtos_populares, 1)
+        self.produtos_populares = self.criar_placeholder_carregando()
+        self.dashboard_charts_layout.addWidget(self.produtos_populares, 1)
         
-        layout.addLayout(charts_layout)
+        layout.addLayout(self.dashboard_charts_layout)
         
         # Últimas vendas
         ultimas_vendas = self.criar_tabela_ultimas_vendas()
         layout.addWidget(ultimas_vendas)
         
         parent.setLayout(layout)
+        self.carregar_dashboard()
+    
+    def carregar_dashboard(self):
+        """Dispara as consultas do dashboard em paralelo; cada bloco é preenchido quando chega"""
+        self.executor.submeter(self.obter_vendas_hoje, chave='dash_vendas_hoje',
+                               ao_concluir=lambda v: self.atualizar_metric_card(
+                                   self.metric_vendas, f" {v['quantidade']}", f" {v['total']:.2f} Kz"))
+        self.executor.submeter(self.obter_produtos_stock_baixo, chave='dash_stock_baixo',
+                               ao_concluir=lambda v: self.atualizar_metric_card(self.metric_stock, f" {v}"))
+        self.executor.submeter(self.obter_total_clientes, chave='dash_clientes',
+                               ao_concluir=lambda v: self.atualizar_metric_card(self.metric_clientes, f" {v}"))
+        self.executor.submeter(self.obter_valor_stock, chave='dash_valor_stock',
+                               ao_concluir=lambda v: self.atualizar_metric_card(self.metric_valor_stock, f" {v:.2f}"))
+        self.executor.submeter(self.obter_vendas_semana, chave='dash_vendas_semana',
+                               ao_concluir=self.mostrar_grafico_vendas_semana)
+        self.executor.submeter(self.obter_produtos_populares, chave='dash_populares',
+                               ao_concluir=self.mostrar_lista_produtos_populares)
+        self.executor.submeter(self.obter_ultimas_vendas, chave='dash_ultimas_vendas',
+                               ao_concluir=self.preencher_tabela_ultimas_vendas)
+    
+    def criar_placeholder_carregando(self):
+        """Widget temporário mostrado enquanto os dados carregam"""
+        placeholder = QLabel("⏳ A carregar...")
+        placeholder.setAlignment(Qt.AlignCenter)
+        placeholder.setStyleSheet("color: #7f8c8d; padding: 20px;")
+        placeholder.setMinimumSize(200, 150)
+        return placeholder
+    
+    def substituir_widget_dashboard(self, antigo, novo):
+        """Troca um widget do layout de gráficos pelo widget final"""
+        self.dashboard_charts_layout.replaceWidget(antigo, novo)
+        antigo.deleteLater()
+        return novo
     
     def criar_metric_card(self, titulo, valor, subtitulo, cor):
         """Cria um card de métrica"""
@@ -179,16 +201,25 @@ class AdminWindow(QWidget):
         layout.addWidget(lbl_subtitulo)
         
         card.setLayout(layout)
+        card.lbl_valor = lbl_valor
+        card.lbl_subtitulo = lbl_subtitulo
         return card
     
+    def atualizar_metric_card(self, card, valor, subtitulo=None):
+        """Atualiza os valores de um card de métrica"""
+        card.lbl_valor.setText(valor)
+        if subtitulo is not None:
+            card.lbl_subtitulo.setText(subtitulo)
+    
     def obter_vendas_hoje(self):
         """Obtém vendas do dia atual"""
         try:
-            resultado = self.db.execute_query("""
-                SELECT COUNT(*) as quantidade, COALESCE(SUM(total_com_iva), 0) as total
-                FROM vendas 
-                WHERE DATE(created_at) = CURDATE() AND estado = 'paga'
-            """)
+            hoje = Periodo.hoje()
+            resultado = self.db.execute_query(f"""
+                SELECT COALESCE(SUM(quantidade), 0) as quantidade, COALESCE(SUM(total_com_iva), 0) as total
+                FROM resumo_vendas_dia 
+                WHERE {hoje.filtro('data')}
+            """, hoje.datas)
             
             if resultado:
                 return resultado[0]
@@ -236,19 +267,29 @@ class AdminWindow(QWidget):
             print(f"Erro ao obter valor stock: {e}")
             return 0.0
     
-    def criar_grafico_vendas_semana(self):
-        """Cria gráfico de vendas da semana usando matplotlib"""
+    def obter_vendas_semana(self):
+        """Obtém totais diários dos últimos 7 dias"""
         try:
-            # Obter vendas dos últimos 7 dias
-            vendas_semana = self.db.execute_query("""
-                SELECT DATE(created_at) as data, SUM(total_com_iva) as total
-                FROM vendas 
-                WHERE created_at >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)
-                AND estado = 'paga'
-                GROUP BY DATE(created_at)
+            semana = Periodo.ultimos_dias(7)
+            return self.db.execute_query(f"""
+                SELECT data, SUM(total_com_iva) as total
+                FROM resumo_vendas_dia 
+                WHERE {semana.filtro('data')}
+                GROUP BY data
                 ORDER BY data
-            """)
-            
+            """, semana.datas)
+        except Exception as e:
+            print(f"Erro ao obter vendas da semana: {e}")
+            return None
+    
+    def mostrar_grafico_vendas_semana(self, vendas_semana):
+        """Substitui o placeholder pelo gráfico da semana"""
+        self.chart_vendas = self.substituir_widget_dashboard(
+            self.chart_vendas, self.criar_grafico_vendas_semana(vendas_semana))
+    
+    def criar_grafico_vendas_semana(self, vendas_semana):
+        """Cria gráfico de vendas da semana usando matplotlib"""
+        try:
             # Preparar dados
             datas = []
             valores = []
@@ -268,6 +309,7 @@ class AdminWindow(QWidget):
                 valores.append(valor)
             
             # Criar figura matplotlib
+            Figure, FigureCanvas = carregar_matplotlib()
             fig = Figure(figsize=(8, 4))
             ax = fig.add_subplot(111)
             
@@ -298,25 +340,37 @@ class AdminWindow(QWidget):
             fallback.setStyleSheet("background-color: #f8d7da; color: #721c24; padding: 20px;")
             return fallback
     
-    def criar_lista_produtos_populares(self):
+    def obter_produtos_populares(self):
+        """Obtém os 5 produtos mais vendidos nos últimos 30 dias"""
+        try:
+            mes = Periodo.ultimos_dias(30)
+            return self.db.execute_query(f"""
+                SELECT p.nome, SUM(r.quantidade) as total_vendido
+                FROM resumo_produtos_dia r
+                JOIN produtos p ON r.produto_id = p.id
+                WHERE {mes.filtro('r.data')}
+                GROUP BY p.id, p.nome
+                ORDER BY total_vendido DESC
+                LIMIT 5
+            """, mes.datas)
+        except Exception as e:
+            print(f"Erro ao obter produtos populares: {e}")
+            return None
+    
+    def mostrar_lista_produtos_populares(self, produtos):
+        """Substitui o placeholder pela lista de produtos populares"""
+        self.produtos_populares = self.substituir_widget_dashboard(
+            self.produtos_populares, self.criar_lista_produtos_populares(produtos))
+    
+    def criar_lista_produtos_populares(self, produtos):
         """Cria lista de produtos mais vendidos"""
         group = QGroupBox("🏆 Produtos Mais Vendidos")
         layout = QVBoxLayout()
         
         try:
-            produtos = self.db.execute_query("""
-                SELECT p.nome, SUM(vi.quantidade) as total_vendido
-                FROM venda_itens vi
-                JOIN produtos p ON vi.produto_id = p.id
-                JOIN vendas v ON vi.venda_id = v.id
-                WHERE v.estado = 'paga'
-                AND v.created_at >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
-                GROUP BY p.id, p.nome
-                ORDER BY total_vendido DESC
-                LIMIT 5
-            """)
-            
-            if produtos:
+            if produtos is None:
+                layout.addWidget(QLabel("Erro ao carregar dados"))
+            elif produtos:
                 for produto in produtos:
                     item_layout = QHBoxLayout()
                     
@@ -364,18 +418,26 @@ class AdminWindow(QWidget):
         header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(4, QHeaderView.ResizeToContents)
         
+        layout.addWidget(self.tabela_ultimas_vendas)
+        group.setLayout(layout)
+        return group
+    
+    def obter_ultimas_vendas(self):
+        """Obtém as 10 últimas vendas pagas"""
+        return self.db.execute_query("""
+            SELECT v.numero_venda, v.created_at, v.total_com_iva,
+                   c.nome as cliente_nome, u.nome as vendedor_nome
+            FROM vendas v
+            LEFT JOIN clientes c ON v.cliente_id = c.id
+            JOIN usuarios u ON v.usuario_id = u.id
+            WHERE v.estado = 'paga'
+            ORDER BY v.created_at DESC
+            LIMIT 10
+        """)
+    
+    def preencher_tabela_ultimas_vendas(self, vendas):
+        """Preenche a tabela de últimas vendas"""
         try:
-            vendas = self.db.execute_query("""
-                SELECT v.numero_venda, v.created_at, v.total_com_iva,
-                       c.nome as cliente_nome, u.nome as vendedor_nome
-                FROM vendas v
-                LEFT JOIN clientes c ON v.cliente_id = c.id
-                JOIN usuarios u ON v.usuario_id = u.id
-                WHERE v.estado = 'paga'
-                ORDER BY v.created_at DESC
-                LIMIT 10
-            """)
-            
             self.tabela_ultimas_vendas.setRowCount(len(vendas))
             
             for row, venda in enumerate(vendas):
@@ -399,10 +461,6 @@ class AdminWindow(QWidget):
             print(f"Erro ao carregar últimas vendas: {e}")
             self.tabela_ultimas_vendas.setRowCount(1)
             self.tabela_ultimas_vendas.setItem(0, 0, QTableWidgetItem("Erro ao carregar dados"))
-        
-        layout.addWidget(self.tabela_ultimas_vendas)
-        group.setLayout(layout)
-        return group
 
     def setup_relatorios_tab(self, parent):
         """Aba de relatórios avançados"""
@@ -481,39 +539,48 @@ class AdminWindow(QWidget):
     def gerar_relatorio(self):
         """Gera relatório baseado nos filtros"""
         try:
-            data_inicio = self.date_inicio.date().toString('yyyy-MM-dd')
-            data_fim = self.date_fim.date().toString('yyyy-MM-dd')
+            periodo = Periodo.entre_datas(self.date_inicio.date().toPyDate(), self.date_fim.date().toPyDate())
             tipo_relatorio = self.combo_tipo_relatorio.currentText()
             
             if tipo_relatorio == "Vendas por Período":
-                self.gerar_relatorio_vendas_periodo(data_inicio, data_fim)
+                self.gerar_relatorio_vendas_periodo(periodo)
             elif tipo_relatorio == "Produtos Mais Vendidos":
-                self.gerar_relatorio_produtos_vendidos(data_inicio, data_fim)
+                self.gerar_relatorio_produtos_vendidos(periodo)
             elif tipo_relatorio == "Vendas por Vendedor":
-                self.gerar_relatorio_vendas_vendedor(data_inicio, data_fim)
+                self.gerar_relatorio_vendas_vendedor(periodo)
             elif tipo_relatorio == "Formas de Pagamento":
-                self.gerar_relatorio_formas_pagamento(data_inicio, data_fim)
+                self.gerar_relatorio_formas_pagamento(periodo)
             elif tipo_relatorio == "Clientes Mais Frequentes":
-                self.gerar_relatorio_clientes_frequentes(data_inicio, data_fim)
+                self.gerar_relatorio_clientes_frequentes(periodo)
                 
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao gerar relatório: {str(e)}")
     
-    def gerar_relatorio_vendas_periodo(self, data_inicio, data_fim):
+    def consultar_relatorio(self, preencher, query, params):
+        """Executa a consulta do relatório em segundo plano e preenche a tabela ao concluir"""
+        self.executor.submeter(
+            self.db.execute_query, query, params,
+            ao_concluir=preencher,
+            ao_falhar=lambda erro: QMessageBox.critical(self, "Erro", f"Erro ao gerar relatório: {str(erro)}"),
+            chave='relatorio'
+        )
+    
+    def gerar_relatorio_vendas_periodo(self, periodo):
         """Gera relatório de vendas por período"""
+        self.consultar_relatorio(self.preencher_relatorio_vendas_periodo, f"""
+            SELECT r.data, 
+                   SUM(r.quantidade) as total_vendas,
+                   SUM(r.total_com_iva) as total_faturado,
+                   SUM(r.total_com_iva) / SUM(r.quantidade) as media_venda
+            FROM resumo_vendas_dia r
+            WHERE {periodo.filtro('r.data')}
+            GROUP BY r.data
+            ORDER BY r.data
+        """, periodo.datas)
+    
+    def preencher_relatorio_vendas_periodo(self, vendas):
+        """Preenche a tabela com o relatório de vendas por período"""
         try:
-            vendas = self.db.execute_query("""
-                SELECT DATE(v.created_at) as data, 
-                       COUNT(*) as total_vendas,
-                       SUM(v.total_com_iva) as total_faturado,
-                       AVG(v.total_com_iva) as media_venda
-                FROM vendas v
-                WHERE v.created_at BETWEEN %s AND %s
-                AND v.estado = 'paga'
-                GROUP BY DATE(v.created_at)
-                ORDER BY data
-            """, (data_inicio, data_fim + " 23:59:59"))
-            
             self.tabela_relatorios.setColumnCount(4)
             self.tabela_relatorios.setHorizontalHeaderLabels([
                 "Data", "Total Vendas", "Total Faturado", "Média por Venda"
@@ -539,23 +606,23 @@ class AdminWindow(QWidget):
             print(f"Erro relatório vendas período: {e}")
             QMessageBox.critical(self, "Erro", f"Erro ao gerar relatório: {str(e)}")
     
-    def gerar_relatorio_produtos_vendidos(self, data_inicio, data_fim):
+    def gerar_relatorio_produtos_vendidos(self, periodo):
         """Gera relatório de produtos mais vendidos"""
+        self.consultar_relatorio(self.preencher_relatorio_produtos_vendidos, f"""
+            SELECT p.nome, p.codigo_barras,
+                   SUM(r.quantidade) as total_vendido,
+                   SUM(r.total_faturado) as total_faturado,
+                   SUM(r.soma_precos) / SUM(r.linhas) as preco_medio
+            FROM resumo_produtos_dia r
+            JOIN produtos p ON r.produto_id = p.id
+            WHERE {periodo.filtro('r.data')}
+            GROUP BY p.id, p.nome, p.codigo_barras
+            ORDER BY total_vendido DESC
+        """, periodo.datas)
+    
+    def preencher_relatorio_produtos_vendidos(self, produtos):
+        """Preenche a tabela com o relatório de produtos mais vendidos"""
         try:
-            produtos = self.db.execute_query("""
-                SELECT p.nome, p.codigo_barras,
-                       SUM(vi.quantidade) as total_vendido,
-                       SUM(vi.subtotal) as total_faturado,
-                       AVG(vi.preco_unitario) as preco_medio
-                FROM venda_itens vi
-                JOIN produtos p ON vi.produto_id = p.id
-                JOIN vendas v ON vi.venda_id = v.id
-                WHERE v.created_at BETWEEN %s AND %s
-                AND v.estado = 'paga'
-                GROUP BY p.id, p.nome, p.codigo_barras
-                ORDER BY total_vendido DESC
-            """, (data_inicio, data_fim + " 23:59:59"))
-            
             self.tabela_relatorios.setColumnCount(5)
             self.tabela_relatorios.setHorizontalHeaderLabels([
                 "Produto", "Código", "Quantidade Vendida", "Total Faturado", "Preço Médio"
@@ -574,23 +641,24 @@ class AdminWindow(QWidget):
             print(f"Erro relatório produtos vendidos: {e}")
             QMessageBox.critical(self, "Erro", f"Erro ao gerar relatório: {str(e)}")
     
-    def gerar_relatorio_vendas_vendedor(self, data_inicio, data_fim):
+    def gerar_relatorio_vendas_vendedor(self, periodo):
         """Gera relatório de vendas por vendedor"""
+        self.consultar_relatorio(self.preencher_relatorio_vendas_vendedor, f"""
+            SELECT u.nome as vendedor,
+                   SUM(r.quantidade) as total_vendas,
+                   SUM(r.total_com_iva) as total_faturado,
+                   SUM(r.total_com_iva) / SUM(r.quantidade) as media_venda,
+                   MAX(r.maior_venda) as maior_venda
+            FROM resumo_vendas_dia r
+            JOIN usuarios u ON r.usuario_id = u.id
+            WHERE {periodo.filtro('r.data')}
+            GROUP BY u.id, u.nome
+            ORDER BY total_faturado DESC
+        """, periodo.datas)
+    
+    def preencher_relatorio_vendas_vendedor(self, vendedores):
+        """Preenche a tabela com o relatório de vendas por vendedor"""
         try:
-            vendedores = self.db.execute_query("""
-                SELECT u.nome as vendedor,
-                       COUNT(*) as total_vendas,
-                       SUM(v.total_com_iva) as total_faturado,
-                       AVG(v.total_com_iva) as media_venda,
-                       MAX(v.total_com_iva) as maior_venda
-                FROM vendas v
-                JOIN usuarios u ON v.usuario_id = u.id
-                WHERE v.created_at BETWEEN %s AND %s
-                AND v.estado = 'paga'
-                GROUP BY u.id, u.nome
-                ORDER BY total_faturado DESC
-            """, (data_inicio, data_fim + " 23:59:59"))
-            
             self.tabela_relatorios.setColumnCount(5)
             self.tabela_relatorios.setHorizontalHeaderLabels([
                 "Vendedor", "Total Vendas", "Total Faturado", "Média por Venda", "Maior Venda"
@@ -609,26 +677,24 @@ class AdminWindow(QWidget):
             print(f"Erro relatório vendas vendedor: {e}")
             QMessageBox.critical(self, "Erro", f"Erro ao gerar relatório: {str(e)}")
     
-    def gerar_relatorio_formas_pagamento(self, data_inicio, data_fim):
+    def gerar_relatorio_formas_pagamento(self, periodo):
         """Gera relatório de formas de pagamento"""
+        self.consultar_relatorio(self.preencher_relatorio_formas_pagamento, f"""
+            SELECT fp.nome as forma_pagamento,
+                   SUM(r.utilizacoes) as total_utilizacoes,
+                   SUM(r.total_valor) as total_valor,
+                   (SUM(r.utilizacoes) * 100.0 / (SELECT SUM(r2.utilizacoes) FROM resumo_pagamentos_dia r2 
+                                               WHERE {periodo.filtro('r2.data')})) as percentagem
+            FROM resumo_pagamentos_dia r
+            JOIN formas_pagamento fp ON r.forma_pagamento_id = fp.id
+            WHERE {periodo.filtro('r.data')}
+            GROUP BY fp.id, fp.nome
+            ORDER BY total_valor DESC
+        """, periodo.datas * 2)
+    
+    def preencher_relatorio_formas_pagamento(self, formas_pagamento):
+        """Preenche a tabela com o relatório de formas de pagamento"""
         try:
-            formas_pagamento = self.db.execute_query("""
-                SELECT fp.nome as forma_pagamento,
-                       COUNT(*) as total_utilizacoes,
-                       SUM(vp.valor) as total_valor,
-                       (COUNT(*) * 100.0 / (SELECT COUNT(*) FROM venda_pagamentos vp2 
-                                         JOIN vendas v2 ON vp2.venda_id = v2.id 
-                                         WHERE v2.created_at BETWEEN %s AND %s 
-                                         AND v2.estado = 'paga')) as percentagem
-                FROM venda_pagamentos vp
-                JOIN formas_pagamento fp ON vp.forma_pagamento_id = fp.id
-                JOIN vendas v ON vp.venda_id = v.id
-                WHERE v.created_at BETWEEN %s AND %s
-                AND v.estado = 'paga'
-                GROUP BY fp.id, fp.nome
-                ORDER BY total_valor DESC
-            """, (data_inicio, data_fim + " 23:59:59", data_inicio, data_fim + " 23:59:59"))
-            
             self.tabela_relatorios.setColumnCount(4)
             self.tabela_relatorios.setHorizontalHeaderLabels([
                 "Forma Pagamento", "Utilizações", "Total Valor", "Percentagem"
@@ -646,24 +712,26 @@ class AdminWindow(QWidget):
             print(f"Erro relatório formas pagamento: {e}")
             QMessageBox.critical(self, "Erro", f"Erro ao gerar relatório: {str(e)}")
     
-    def gerar_relatorio_clientes_frequentes(self, data_inicio, data_fim):
+    def gerar_relatorio_clientes_frequentes(self, periodo):
         """Gera relatório de clientes mais frequentes"""
+        self.consultar_relatorio(self.preencher_relatorio_clientes_frequentes, f"""
+            SELECT c.nome, c.telefone, c.email,
+                   COUNT(*) as total_compras,
+                   SUM(v.total_com_iva) as total_gasto,
+                   AVG(v.total_com_iva) as media_compra,
+                   MAX(v.created_at) as ultima_compra
+            FROM vendas v
+            JOIN clientes c ON v.cliente_id = c.id
+            WHERE {periodo.filtro('v.created_at')}
+            AND v.estado = 'paga'
+            GROUP BY c.id, c.nome, c.telefone, c.email
+            ORDER BY total_gasto DESC
+            LIMIT 20
+        """, periodo.params)
+    
+    def preencher_relatorio_clientes_frequentes(self, clientes):
+        """Preenche a tabela com o relatório de clientes mais frequentes"""
         try:
-            clientes = self.db.execute_query("""
-                SELECT c.nome, c.telefone, c.email,
-                       COUNT(*) as total_compras,
-                       SUM(v.total_com_iva) as total_gasto,
-                       AVG(v.total_com_iva) as media_compra,
-                       MAX(v.created_at) as ultima_compra
-                FROM vendas v
-                JOIN clientes c ON v.cliente_id = c.id
-                WHERE v.created_at BETWEEN %s AND %s
-                AND v.estado = 'paga'
-                GROUP BY c.id, c.nome, c.telefone, c.email
-                ORDER BY total_gasto DESC
-                LIMIT 20
-            """, (data_inicio, data_fim + " 23:59:59"))
-            
             self.tabela_relatorios.setColumnCount(6)
             self.tabela_relatorios.setHorizontalHeaderLabels([
                 "Cliente", "Telefone", "Email", "Total Compras", "Total Gasto", "Última Compra"
@@ -743,36 +811,49 @@ class AdminWindow(QWidget):
         parent.setLayout(layout)
         self.carregar_produtos()
     
+    def carregar_combo(self, combo, query, texto, chave, descricao):
+        """Preenche um combo com (texto(linha), id) quando a consulta em segundo plano termina"""
+        def preencher(linhas):
+            combo.clear()
+            for linha in linhas or []:
+                combo.addItem(texto(linha), linha['id'])
+        
+        self.executor.submeter(
+            self.db.execute_query, query,
+            ao_concluir=preencher,
+            ao_falhar=lambda erro: print(f"Erro ao carregar {descricao}: {erro}"),
+            chave=chave
+        )
+    
     def carregar_categorias(self):
         """Carrega categorias no combo"""
-        try:
-            categorias = self.db.execute_query("SELECT id, nome FROM categorias WHERE ativo = 1")
-            for cat in categorias:
-                self.combo_categoria.addItem(cat['nome'], cat['id'])
-        except Exception as e:
-            print(f"Erro ao carregar categorias: {e}")
+        self.carregar_combo(self.combo_categoria, "SELECT id, nome FROM categorias WHERE ativo = 1",
+                            lambda cat: cat['nome'], 'combo_categorias', "categorias")
     
     def carregar_taxas_iva(self):
         """Carrega taxas IVA no combo"""
-        try:
-            taxas = self.db.execute_query("SELECT id, taxa, descricao FROM taxas_iva WHERE ativo = 1")
-            for taxa in taxas:
-                self.combo_taxa_iva.addItem(f"{taxa['descricao']} ({taxa['taxa']}%)", taxa['id'])
-        except Exception as e:
-            print(f"Erro ao carregar taxas IVA: {e}")
+        self.carregar_combo(self.combo_taxa_iva, "SELECT id, taxa, descricao FROM taxas_iva WHERE ativo = 1",
+                            lambda taxa: f"{taxa['descricao']} ({taxa['taxa']}%)", 'combo_taxas_iva', "taxas IVA")
     
     def carregar_produtos(self):
-        """Carrega produtos na tabela"""
-        try:
-            produtos = self.db.execute_query("""
+        """Carrega produtos na tabela (consulta em segundo plano)"""
+        self.executor.submeter(
+            self.db.execute_query, """
                 SELECT p.*, c.nome as categoria_nome, t.taxa
                 FROM produtos p
                 LEFT JOIN categorias c ON p.categoria_id = c.id
                 LEFT JOIN taxas_iva t ON p.taxa_iva_id = t.id
                 WHERE p.ativo = 1
                 ORDER BY p.nome
-            """)
-            
+            """,
+            ao_concluir=self.preencher_produtos,
+            ao_falhar=lambda erro: print(f"Erro ao carregar produtos: {erro}"),
+            chave='produtos'
+        )
+    
+    def preencher_produtos(self, produtos):
+        """Preenche produtos na tabela"""
+        try:
             self.tabela_produtos.setRowCount(len(produtos))
             
             for row, produto in enumerate(produtos):
@@ -859,7 +940,12 @@ class AdminWindow(QWidget):
         parent.setLayout(layout)
     
     def carregar_dados(self):
-        """Carrega dados iniciais"""
+        """Chamado no login: constrói a aba visível ou, se já existia, atualiza os seus dados"""
+        indice = self.tabs.currentIndex()
+        if not self.construir_aba(indice):
+            _, _, recarregar = self.definicao_abas[indice]
+            if recarregar:
+                recarregar()
         print("✅ Painel administrativo carregado")
     # ... (outros métodos setup_usuarios_tab, setup_vendas_tab, setup_config_tab)
     # ... (outros métodos Usuarios)
@@ -914,24 +1000,27 @@ class AdminWindow(QWidget):
     
     def carregar_niveis_usuario(self):
         """Carrega níveis de usuário no combo"""
-        try:
-            niveis = self.db.execute_query("SELECT id, nome FROM niveis_usuario ORDER BY id")
-            for nivel in niveis:
-                self.combo_nivel.addItem(nivel['nome'], nivel['id'])
-        except Exception as e:
-            print(f"Erro ao carregar níveis: {e}")
+        self.carregar_combo(self.combo_nivel, "SELECT id, nome FROM niveis_usuario ORDER BY id",
+                            lambda nivel: nivel['nome'], 'combo_niveis', "níveis")
     
     def carregar_usuarios(self):
-        """Carrega usuários na tabela"""
-        try:
-            usuarios = self.db.execute_query("""
+        """Carrega usuários na tabela (consulta em segundo plano)"""
+        self.executor.submeter(
+            self.db.execute_query, """
                 SELECT u.*, n.nome as nivel_nome 
                 FROM usuarios u 
                 JOIN niveis_usuario n ON u.nivel_id = n.id 
                 WHERE u.ativo = 1
                 ORDER BY u.nome
-            """)
-            
+            """,
+            ao_concluir=self.preencher_usuarios,
+            ao_falhar=lambda erro: print(f"Erro ao carregar usuários: {erro}"),
+            chave='usuarios'
+        )
+    
+    def preencher_usuarios(self, usuarios):
+        """Preenche usuários na tabela"""
+        try:
             self.tabela_usuarios.setRowCount(len(usuarios))
             
             for row, usuario in enumerate(usuarios):
@@ -1099,12 +1188,19 @@ class AdminWindow(QWidget):
         self.carregar_clientes()
     
     def carregar_clientes(self):
-        """Carrega clientes na tabela"""
-        try:
-            clientes = self.db.execute_query("""
+        """Carrega clientes na tabela (consulta em segundo plano)"""
+        self.executor.submeter(
+            self.db.execute_query, """
                 SELECT * FROM clientes WHERE ativo = 1 ORDER BY nome
-            """)
-            
+            """,
+            ao_concluir=self.preencher_clientes,
+            ao_falhar=lambda erro: print(f"Erro ao carregar clientes: {erro}"),
+            chave='clientes'
+        )
+    
+    def preencher_clientes(self, clientes):
+        """Preenche clientes na tabela"""
+        try:
             self.tabela_clientes.setRowCount(len(clientes))
             
             for row, cliente in enumerate(clientes):
@@ -1292,56 +1388,72 @@ class AdminWindow(QWidget):
         layout.addWidget(self.tabela_movimentos)
         
         parent.setLayout(layout)
-        self.carregar_status_caixa()
-        self.carregar_movimentos_caixa()
+        self.carregar_caixa()
     
     def carregar_caixas(self):
         """Carrega caixas no combo"""
-        try:
-            caixas = self.db.execute_query("SELECT id, nome FROM caixas WHERE ativo = 1")
-            for caixa in caixas:
-                self.combo_caixa.addItem(caixa['nome'], caixa['id'])
-        except Exception as e:
-            print(f"Erro ao carregar caixas: {e}")
+        self.carregar_combo(self.combo_caixa, "SELECT id, nome FROM caixas WHERE ativo = 1",
+                            lambda caixa: caixa['nome'], 'combo_caixas', "caixas")
+    
+    def carregar_caixa(self):
+        """Status e movimentos do caixa do dia"""
+        self.carregar_status_caixa()
+        self.carregar_movimentos_caixa()
     
     def carregar_status_caixa(self):
-        """Carrega status do caixa"""
+        """Carrega status do caixa (consulta em segundo plano)"""
+        self.executor.submeter(
+            self.consultar_status_caixa,
+            ao_concluir=self.preencher_status_caixa,
+            ao_falhar=lambda erro: print(f"Erro ao carregar status caixa: {erro}"),
+            chave='status_caixa'
+        )
+    
+    def consultar_status_caixa(self):
+        """Obtém abertura, saldo e vendas do dia (corre fora da thread da GUI)"""
+        hoje = Periodo.hoje()
+        # Verificar se há caixa aberto
+        caixa_aberto = self.db.execute_query(f"""
+            SELECT mc.*, u.nome as usuario_nome 
+            FROM movimentos_caixa mc
+            JOIN usuarios u ON mc.usuario_id = u.id
+            WHERE mc.tipo = 'abertura' 
+            AND {hoje.filtro('mc.created_at')}
+            ORDER BY mc.created_at DESC 
+            LIMIT 1
+        """, hoje.params)
+        
+        saldo = None
+        if caixa_aberto:
+            # Calcular saldo atual
+            saldo = self.db.execute_query(f"""
+                SELECT 
+                    SUM(CASE WHEN tipo IN ('abertura', 'suprimento') THEN valor ELSE 0 END) -
+                    SUM(CASE WHEN tipo IN ('sangria') THEN valor ELSE 0 END) as saldo
+                FROM movimentos_caixa 
+                WHERE {hoje.filtro('created_at')}
+            """, hoje.params)
+        
+        return {
+            'aberto': bool(caixa_aberto),
+            'saldo': saldo[0]['saldo'] if saldo and saldo[0]['saldo'] else 0,
+            'vendas_hoje': self.obter_vendas_hoje()
+        }
+    
+    def preencher_status_caixa(self, status):
+        """Atualiza os labels de status do caixa"""
         try:
-            # Verificar se há caixa aberto
-            caixa_aberto = self.db.execute_query("""
-                SELECT mc.*, u.nome as usuario_nome 
-                FROM movimentos_caixa mc
-                JOIN usuarios u ON mc.usuario_id = u.id
-                WHERE mc.tipo = 'abertura' 
-                AND DATE(mc.created_at) = CURDATE()
-                ORDER BY mc.created_at DESC 
-                LIMIT 1
-            """)
-            
-            if caixa_aberto:
+            if status['aberto']:
                 self.lbl_status_caixa.setText("Status: 🟢 ABERTO")
                 self.lbl_status_caixa.setStyleSheet("color: #27ae60; font-weight: bold;")
-                
-                # Calcular saldo atual
-                saldo = self.db.execute_query("""
-                    SELECT 
-                        SUM(CASE WHEN tipo IN ('abertura', 'suprimento') THEN valor ELSE 0 END) -
-                        SUM(CASE WHEN tipo IN ('sangria') THEN valor ELSE 0 END) as saldo
-                    FROM movimentos_caixa 
-                    WHERE DATE(created_at) = CURDATE()
-                """)
-                
-                if saldo and saldo[0]['saldo']:
-                    self.lbl_saldo_caixa.setText(f"Saldo: {saldo[0]['saldo']:.2f} Kz")
-                else:
-                    self.lbl_saldo_caixa.setText("Saldo: 0.00 Kz")
+                self.lbl_saldo_caixa.setText(f"Saldo: {status['saldo']:.2f} Kz")
             else:
                 self.lbl_status_caixa.setText("Status: 🔴 FECHADO")
                 self.lbl_status_caixa.setStyleSheet("color: #e74c3c; font-weight: bold;")
                 self.lbl_saldo_caixa.setText("Saldo: 0.00 Kz")
             
             # Vendas do dia
-            vendas_hoje = self.obter_vendas_hoje()
+            vendas_hoje = status['vendas_hoje']
             self.lbl_vendas_hoje.setText(f"Vendas Hoje: {vendas_hoje['quantidade']}")
             self.lbl_total_hoje.setText(f"Total Hoje: {vendas_hoje['total']:.2f} Kz")
             
@@ -1349,16 +1461,24 @@ class AdminWindow(QWidget):
             print(f"Erro ao carregar status caixa: {e}")
     
     def carregar_movimentos_caixa(self):
-        """Carrega movimentos do caixa"""
-        try:
-            movimentos = self.db.execute_query("""
+        """Carrega movimentos do caixa (consulta em segundo plano)"""
+        hoje = Periodo.hoje()
+        self.executor.submeter(
+            self.db.execute_query, f"""
                 SELECT mc.*, u.nome as usuario_nome
                 FROM movimentos_caixa mc
                 JOIN usuarios u ON mc.usuario_id = u.id
-                WHERE DATE(mc.created_at) = CURDATE()
+                WHERE {hoje.filtro('mc.created_at')}
                 ORDER BY mc.created_at DESC
-            """)
-            
+            """, hoje.params,
+            ao_concluir=self.preencher_movimentos_caixa,
+            ao_falhar=lambda erro: print(f"Erro ao carregar movimentos: {erro}"),
+            chave='movimentos_caixa'
+        )
+    
+    def preencher_movimentos_caixa(self, movimentos):
+        """Preenche movimentos do caixa"""
+        try:
             self.tabela_movimentos.setRowCount(len(movimentos))
             
             for row, movimento in enumerate(movimentos):
@@ -1398,11 +1518,12 @@ class AdminWindow(QWidget):
                 return
             
             # Verificar se já está aberto
-            caixa_aberto = self.db.execute_query("""
+            hoje = Periodo.hoje()
+            caixa_aberto = self.db.execute_query(f"""
                 SELECT * FROM movimentos_caixa 
-                WHERE tipo = 'abertura' AND DATE(created_at) = CURDATE()
+                WHERE tipo = 'abertura' AND {hoje.filtro('created_at')}
                 LIMIT 1
-            """)
+            """, hoje.params)
             
             if caixa_aberto:
                 QMessageBox.warning(self, "Aviso", "Já existe um caixa aberto hoje!")
@@ -1443,13 +1564,14 @@ class AdminWindow(QWidget):
             vendas_hoje = self.obter_vendas_hoje()
             
             # Calcular saldo teórico
-            saldo_teorico = self.db.execute_query("""
+            hoje = Periodo.hoje()
+            saldo_teorico = self.db.execute_query(f"""
                 SELECT 
                     SUM(CASE WHEN tipo IN ('abertura', 'suprimento') THEN valor ELSE 0 END) -
                     SUM(CASE WHEN tipo IN ('sangria') THEN valor ELSE 0 END) as saldo
                 FROM movimentos_caixa 
-                WHERE DATE(created_at) = CURDATE()
-            """)
+                WHERE {hoje.filtro('created_at')}
+            """, hoje.params)
             
             saldo = saldo_teorico[0]['saldo'] if saldo_teorico and saldo_teorico[0]['saldo'] else 0
             
@@ -1616,12 +1738,19 @@ class AdminWindow(QWidget):
         self.carregar_promocoes()
     
     def carregar_produtos_promocao(self):
-        """Carrega produtos para a lista de promoções"""
-        try:
-            produtos = self.db.execute_query("""
+        """Carrega produtos para a lista de promoções (consulta em segundo plano)"""
+        self.executor.submeter(
+            self.db.execute_query, """
                 SELECT id, nome, preco_venda FROM produtos WHERE ativo = 1 ORDER BY nome
-            """)
-            
+            """,
+            ao_concluir=self.preencher_produtos_promocao,
+            ao_falhar=lambda erro: print(f"Erro ao carregar produtos: {erro}"),
+            chave='produtos_promocao'
+        )
+    
+    def preencher_produtos_promocao(self, produtos):
+        """Preenche a lista de produtos das promoções"""
+        try:
             self.lista_produtos.clear()
             for produto in produtos:
                 item_text = f"{produto['nome']} - {produto['preco_venda']:.2f} Kz"
@@ -1633,14 +1762,21 @@ class AdminWindow(QWidget):
             print(f"Erro ao carregar produtos: {e}")
     
     def carregar_promocoes(self):
-        """Carrega promoções na tabela"""
-        try:
-            promocoes = self.db.execute_query("""
+        """Carrega promoções na tabela (consulta em segundo plano)"""
+        self.executor.submeter(
+            self.db.execute_query, """
                 SELECT * FROM promocoes 
                 WHERE ativo = 1 
                 ORDER BY data_inicio DESC
-            """)
-            
+            """,
+            ao_concluir=self.preencher_promocoes,
+            ao_falhar=lambda erro: print(f"Erro ao carregar promoções: {erro}"),
+            chave='promocoes'
+        )
+    
+    def preencher_promocoes(self, promocoes):
+        """Preenche promoções na tabela"""
+        try:
             self.tabela_promocoes.setRowCount(len(promocoes))
             
             for row, promocao in enumerate(promocoes):
@@ -1855,7 +1991,7 @@ class AdminWindow(QWidget):
         # Botões de ação
         btn_layout = QHBoxLayout()
         btn_carregar = QPushButton("📥 Carregar Configurações")
-        btn_carregar.clicked.connect(self.carregar_configuracoes)
+        btn_carregar.clicked.connect(lambda: self.carregar_configuracoes(avisar=True))
         
         btn_salvar = QPushButton("💾 Salvar Configurações")
         btn_salvar.setStyleSheet("background-color: #27ae60; color: white; padding: 10px;")
@@ -1874,11 +2010,28 @@ class AdminWindow(QWidget):
         parent.setLayout(layout)
         self.carregar_configuracoes()
     
-    def carregar_configuracoes(self):
-        """Carrega configurações atuais"""
+    def carregar_configuracoes(self, avisar=False):
+        """Carrega configurações atuais (consulta em segundo plano)"""
+        self.executor.submeter(
+            self.consultar_configuracoes,
+            ao_concluir=lambda dados: self.preencher_configuracoes(dados, avisar),
+            ao_falhar=lambda erro: QMessageBox.critical(self, "Erro", f"Erro ao carregar configurações: {str(erro)}"),
+            chave='configuracoes'
+        )
+    
+    def consultar_configuracoes(self):
+        """Empresa e configurações do sistema (corre fora da thread da GUI)"""
+        empresa = self.db.execute_query("SELECT * FROM empresas WHERE id = 1")
+        configuracoes = self.db.execute_query("SELECT chave, valor FROM configuracoes WHERE empresa_id = 1")
+        if empresa is None or configuracoes is None:
+            raise RuntimeError("consulta à base de dados falhou")
+        return empresa, configuracoes
+    
+    def preencher_configuracoes(self, dados, avisar=False):
+        """Preenche o formulário de configurações"""
         try:
-            # Carregar configurações da empresa
-            empresa = self.db.execute_query("SELECT * FROM empresas WHERE id = 1")
+            empresa, configuracoes = dados
+            # Configurações da empresa
             if empresa:
                 emp = empresa[0]
                 self.config_empresa_nome.setText(emp['nome'])
@@ -1887,8 +2040,7 @@ class AdminWindow(QWidget):
                 self.config_empresa_email.setText(emp['email'] or '')
                 self.config_empresa_endereco.setPlainText(emp['endereco'] or '')
             
-            # Carregar configurações do sistema
-            configuracoes = self.db.execute_query("SELECT chave, valor FROM configuracoes WHERE empresa_id = 1")
+            # Configurações do sistema
             config_dict = {cfg['chave']: cfg['valor'] for cfg in configuracoes}
             
             self.config_iva_activo.setChecked(config_dict.get('iva_activo', 'true').lower() == 'true')
@@ -1905,7 +2057,8 @@ class AdminWindow(QWidget):
             self.config_impressora_nome.setText(config_dict.get('impressora_nome', ''))
             self.config_impressora_porta.setText(config_dict.get('impressora_porta', ''))
             
-            QMessageBox.information(self, "Sucesso", "Configurações carregadas com sucesso!")
+            if avisar:
+                QMessageBox.information(self, "Sucesso", "Configurações carregadas com sucesso!")
             
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao carregar configurações: {str(e)}")
@@ -1955,6 +2108,12 @@ class AdminWindow(QWidget):
                 """
                 self.db.execute_insert(query, (chave, valor, valor))
             
+            # As outras caixas veem a versão nova na próxima verificação; esta recarrega já
+            if isinstance(self.config, Definicoes):
+                self.config.incrementar_versao()
+                self.executor.submeter(self.config.verificar, chave='definicoes',
+                                       ao_concluir=self.config.notificar)
+            
             QMessageBox.information(self, "Sucesso", "Configurações salvas com sucesso!")
             
         except Exception as e:
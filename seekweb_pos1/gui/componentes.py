@@ -0,0 +1,258 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QLabel
+from PyQt5.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QModelIndex, QSize, QRect, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from decimal import Decimal
+from utils.calculos import Calculos
+
+# Cores por estado de stock: (fundo, fundo hover, texto, borda)
+CORES_STOCK = {
+    'esgotado': ('#ffebee', '#ffebee', '#c62828', '#c62828'),
+    'baixo': ('#fff3e0', '#ffe0b2', '#ef6c00', '#ff9800'),
+    'normal': ('#e8f5e8', '#c8e6c9', '#2e7d32', '#4caf50')
+}
+
+def estado_stock(stock):
+    if stock <= 0:
+        return 'esgotado'
+    if stock <= 5:
+        return 'baixo'
+    return 'normal'
+
+class ModeloProdutos(QAbstractListModel):
+    """Modelo da grelha de produtos; só as linhas alteradas são redesenhadas"""
+    ProdutoRole = Qt.UserRole + 1
+    PrecoRole = Qt.UserRole + 2
+    EstadoRole = Qt.UserRole + 3
+
+    # Campos que aparecem no mosaico: mudanças noutros campos não obrigam a redesenhar
+    CAMPOS_VISIVEIS = ('nome', 'preco_venda', 'taxa_iva', 'stock')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._produtos = []
+        self._ids = []
+        self._linhas = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._produtos)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        produto = self._produtos[index.row()]
+        if role == Qt.DisplayRole:
+            return produto['nome']
+        if role == Qt.ToolTipRole:
+            return f"{produto.get('descricao') or 'Sem descrição'}\nRef: {produto.get('referencia')}"
+        if role == self.ProdutoRole:
+            return produto
+        if role == self.PrecoRole:
+            return Calculos.calcular_total_com_iva(Decimal(str(produto['preco_venda'])), produto['taxa_iva'])
+        if role == self.EstadoRole:
+            return estado_stock(produto['stock'])
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if self._produtos[index.row()]['stock'] <= 0:
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled
+
+    def definir_produtos(self, produtos):
+        """Mostra a lista de produtos; se for a mesma lista, atualiza só os mosaicos que mudaram"""
+        produtos = list(produtos or [])
+        ids = [p['id'] for p in produtos]
+
+        if ids != self._ids:
+            self.beginResetModel()
+            self._produtos, self._ids = produtos, ids
+            self._linhas = {produto_id: linha for linha, produto_id in enumerate(ids)}
+            self.endResetModel()
+            return
+
+        for linha, produto in enumerate(produtos):
+            antigo = self._produtos[linha]
+            self._produtos[linha] = produto
+            if any(antigo.get(c) != produto.get(c) for c in self.CAMPOS_VISIVEIS):
+                indice = self.index(linha)
+                self.dataChanged.emit(indice, indice)
+
+    def atualizar_stock(self, produto_id, stock):
+        """Atualiza o stock de um produto e redesenha apenas o seu mosaico"""
+        linha = self._linhas.get(produto_id)
+        if linha is None or self._produtos[linha]['stock'] == stock:
+            return
+        self._produtos[linha] = dict(self._produtos[linha], stock=stock)
+        indice = self.index(linha)
+        self.dataChanged.emit(indice, indice)
+
+class DelegadoProduto(QStyledItemDelegate):
+    """Desenha um mosaico de produto (substitui um QPushButton com stylesheet por produto)"""
+    TAMANHO = QSize(150, 100)
+
+    def sizeHint(self, option, index):
+        return self.TAMANHO
+
+    def paint(self, painter, option, index):
+        produto = index.data(ModeloProdutos.ProdutoRole)
+        preco = index.data(ModeloProdutos.PrecoRole)
+        fundo, fundo_hover, texto, borda = CORES_STOCK[index.data(ModeloProdutos.EstadoRole)]
+        hover = bool(option.state & QStyle.State_MouseOver) and bool(index.flags() & Qt.ItemIsEnabled)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        retangulo = option.rect.adjusted(2, 2, -2, -2)
+        painter.setPen(QPen(QColor(texto if hover else borda), 2))
+        painter.setBrush(QColor(fundo_hover if hover else fundo))
+        painter.drawRoundedRect(retangulo, 8, 8)
+
+        fonte = QFont(option.font)
+        fonte.setPixelSize(10)
+        fonte.setBold(True)
+        painter.setFont(fonte)
+        painter.setPen(QColor(texto))
+        area_texto = QRect(retangulo.adjusted(5, 5, -5, -5))
+        linhas = f"{produto['nome']}\n{preco:.2f} Kz\nStock: {produto['stock']}\nIVA: {produto['taxa_iva']}%"
+        painter.drawText(area_texto, Qt.AlignCenter | Qt.TextWordWrap, linhas)
+        painter.restore()
+
+class GradeProdutos(QListView):
+    """Grelha virtualizada: só os mosaicos visíveis são desenhados"""
+    produto_escolhido = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.modelo = ModeloProdutos(self)
+        self.setModel(self.modelo)
+        self.setItemDelegate(DelegadoProduto(self))
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setSpacing(4)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setMouseTracking(True)
+        self.clicked.connect(self._ao_clicar)
+
+    def _ao_clicar(self, index):
+        if index.flags() & Qt.ItemIsEnabled:
+            self.produto_escolhido.emit(index.data(ModeloProdutos.ProdutoRole))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.modelo.rowCount() == 0:
+            painter = QPainter(self.viewport())
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter, "Nenhum produto encontrado")
+
+class ModeloCarrinho(QAbstractTableModel):
+    """Modelo da tabela do carrinho: cada alteração só toca na linha afetada"""
+    totais_alterados = pyqtSignal()
+
+    COLUNAS = ["Produto", "Qtd", "Preço", "IVA", "Total", "Ações"]
+    COLUNA_REMOVER = 5
+
+    def __init__(self, carrinho, parent=None):
+        super().__init__(parent)
+        self.carrinho = carrinho
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.carrinho)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUNAS)
+
+    def headerData(self, secao, orientacao, role=Qt.DisplayRole):
+        if orientacao == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUNAS[secao]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        item = self.carrinho.item_na_linha(index.row())
+        coluna = index.column()
+        if coluna == 0:
+            return item['nome']
+        if coluna == 1:
+            return str(item['quantidade'])
+        if coluna == 2:
+            return f"{item['preco_venda']:.2f} Kz"
+        if coluna == 3:
+            return f"{item['taxa_iva']}%"
+        if coluna == 4:
+            return f"{item['total']:.2f} Kz"
+        return "🗑️"
+
+    def adicionar(self, produto, quantidade=1):
+        """Adiciona ao carrinho e devolve o item atualizado"""
+        linha = self.carrinho.linha_de(produto['id'])
+        if linha is None:
+            linha = len(self.carrinho)
+            self.beginInsertRows(QModelIndex(), linha, linha)
+            self.carrinho.adicionar(produto, quantidade)
+            self.endInsertRows()
+        else:
+            self.carrinho.adicionar(produto, quantidade)
+            self.dataChanged.emit(self.index(linha, 1), self.index(linha, 4))
+        self.totais_alterados.emit()
+        return self.carrinho.obter(produto['id'])
+
+    def remover_linha(self, linha):
+        if not 0 <= linha < len(self.carrinho):
+            return
+        self.beginRemoveRows(QModelIndex(), linha, linha)
+        self.carrinho.remover(self.carrinho.item_na_linha(linha)['id'])
+        self.endRemoveRows()
+        self.totais_alterados.emit()
+
+    def limpar(self):
+        self.beginResetModel()
+        self.carrinho.limpar()
+        self.endResetModel()
+        self.totais_alterados.emit()
+
+class DelegadoRemover(QStyledItemDelegate):
+    """Desenha o botão de remover sem criar um QPushButton por linha"""
+
+    def paint(self, painter, option, index):
+        hover = bool(option.state & QStyle.State_MouseOver)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor('#c0392b' if hover else '#e74c3c'))
+        painter.drawRoundedRect(option.rect.adjusted(3, 3, -3, -3), 3, 3)
+        painter.setPen(QColor('white'))
+        painter.drawText(option.rect, Qt.AlignCenter, index.data())
+        painter.restore()
+
+class BarraAvisos(QLabel):
+    """Faixa de avisos não modal: mostra a mensagem e limpa-se sozinha"""
+    ESTILOS = {
+        'sucesso': "background-color: #e8f5e8; color: #2e7d32; border: 1px solid #4caf50;",
+        'aviso': "background-color: #fff3e0; color: #ef6c00; border: 1px solid #ff9800;",
+        'erro': "background-color: #ffebee; color: #c62828; border: 1px solid #c62828;",
+        'info': "background-color: #ecf0f1; color: #2c3e50; border: 1px solid #bdc3c7;"
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWordWrap(True)
+        self.setMinimumHeight(32)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.limpar)
+        self.limpar()
+
+    def mostrar(self, texto, tipo='info', duracao=3000):
+        self.setText(texto)
+        self.setStyleSheet(f"QLabel {{ {self.ESTILOS.get(tipo, self.ESTILOS['info'])} "
+                           "font-weight: bold; padding: 5px; border-radius: 4px; }")
+        self._timer.start(duracao)
+
+    def limpar(self):
+        self.setText("")
+        self.setStyleSheet("QLabel { padding: 5px; border: 1px solid transparent; }")
@@ -0,0 +1,172 @@
+import sys
+import time
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox, QStackedWidget
+from PyQt5.QtCore import QSettings, QTimer
+from core.database import Database
+from core.config import Config
+from core.definicoes import Definicoes
+from core.executor import ExecutorConsultas
+from core.catalogo import CatalogoProdutos
+from core.pos_venda import FilaPosVenda
+from core.renderizador import RenderizadorRecibos
+from core.diario import DiarioOffline
+from core.migracoes import atualizar_base_dados
+from models.venda import Venda
+from gui.login import LoginWindow
+from gui.vendas import VendasWindow
+from gui.admin import AdminWindow
+
+class SeekWebPOS(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        
+        try:
+            # config.ini e tabela configuracoes em memória (a mesma interface do Config)
+            self.config = Definicoes(Config())
+            self.db = Database(self.config)
+            # As vendas escrevem nas tabelas das migrações (resumos diários): aplicá-las antes de vender
+            if not atualizar_base_dados(self.db):
+                raise RuntimeError("Não foi possível aplicar as migrações da base de dados")
+            self.config.ligar_base_dados(self.db)
+            # Deixar uma conexão do pool livre para a thread da GUI
+            self.executor = ExecutorConsultas(max_threads=max(1, self.db.pool_size - 1), parent=self)
+            self.pos_venda = FilaPosVenda(parent=self)
+            self.recibos = RenderizadorRecibos(
+                self.config.get('Caixa', 'local_recibos', fallback='recibos/'),
+                processos=self.config.getint('Caixa', 'processos_recibos', fallback=1),
+                capacidade=self.config.getint('Caixa', 'fila_recibos', fallback=8), parent=self)
+            self.iniciar_catalogo()
+            self.iniciar_diario_offline()
+            self.iniciar_definicoes()
+            self.usuario_atual = None
+            self.setup_ui()
+        except Exception as e:
+            QMessageBox.critical(None, "Erro de Inicialização", 
+                               f"Erro ao iniciar sistema: {str(e)}\n\n"
+                               "Verifique se:\n"
+                               "1. MySQL está instalado e rodando\n"
+                               "2. A base de dados 'bd_seekweb' existe\n"
+                               "3. As credenciais no config.ini estão corretas")
+            raise
+        
+    def iniciar_catalogo(self):
+        """Carrega o catálogo de produtos em memória e agenda a atualização incremental"""
+        self.catalogo = CatalogoProdutos(
+            self.db, recarga_completa=self.config.getint('Catalogo', 'recarga_completa', fallback=300))
+        self.executor.submeter(self.catalogo.carregar, chave='catalogo')
+        
+        self.timer_catalogo = QTimer(self)
+        self.timer_catalogo.timeout.connect(
+            lambda: self.executor.submeter(self.catalogo.atualizar, chave='catalogo'))
+        self.timer_catalogo.start(self.config.getint('Catalogo', 'intervalo_atualizacao', fallback=5) * 1000)
+        
+    def iniciar_definicoes(self):
+        """Verifica periodicamente se o config.ini ou as configurações da base de dados mudaram"""
+        self.timer_definicoes = QTimer(self)
+        self.timer_definicoes.timeout.connect(
+            lambda: self.executor.submeter(self.config.verificar, chave='definicoes',
+                                           ao_concluir=self.config.notificar))
+        self.timer_definicoes.start(self.config.getint('Definicoes', 'intervalo_verificacao', fallback=10) * 1000)
+        self.config.subscrever(self.aplicar_intervalos, seccao='Catalogo')
+        self.config.subscrever(self.aplicar_intervalos, seccao='Offline')
+        
+    def aplicar_intervalos(self, alteradas):
+        """Aplica intervalos do catálogo e do diário alterados sem reiniciar a caixa"""
+        self.catalogo.recarga_completa = self.config.getint('Catalogo', 'recarga_completa', fallback=300)
+        self.timer_catalogo.setInterval(self.config.getint('Catalogo', 'intervalo_atualizacao', fallback=5) * 1000)
+        if self.diario:
+            self.timer_diario.setInterval(self.config.getint('Offline', 'intervalo_reenvio', fallback=30) * 1000)
+        
+    def iniciar_diario_offline(self):
+        """Abre o diário de vendas offline e agenda o reenvio periódico para o MySQL"""
+        self.diario = None
+        # Com o motor SQLite a base de dados é local: não há servidor que possa falhar
+        if not self.config.getboolean('Offline', 'ativo', fallback=True) or self.db.motor.local:
+            return
+        self.diario = DiarioOffline(self.config.get('Offline', 'ficheiro', fallback='dados/diario_vendas.db'))
+        venda_reenvio = Venda(self.db, diario=self.diario)
+        
+        self.timer_diario = QTimer(self)
+        self.timer_diario.timeout.connect(
+            lambda: self.executor.submeter(venda_reenvio.reenviar_diario, chave='diario'))
+        self.timer_diario.start(self.config.getint('Offline', 'intervalo_reenvio', fallback=30) * 1000)
+        # Vendas que ficaram no diário de um turno anterior
+        self.executor.submeter(venda_reenvio.reenviar_diario, chave='diario')
+        
+    def setup_ui(self):
+        self.setWindowTitle("SeekWeb POS - Sistema de Vendas")
+        self.setGeometry(100, 100, 1200, 700)  # Tamanho menor para melhor visualização
+        
+        # Widget central empilhado
+        self.stacked_widget = QStackedWidget()
+        self.setCentralWidget(self.stacked_widget)
+        
+        # Janelas
+        self.login_window = LoginWindow(self.db, self)
+        self.vendas_window = VendasWindow(self.db, self)
+        self.admin_window = AdminWindow(self.db, self)
+        
+        # Adicionar às stacks
+        self.stacked_widget.addWidget(self.login_window)
+        self.stacked_widget.addWidget(self.vendas_window)
+        self.stacked_widget.addWidget(self.admin_window)
+        
+        # Mostrar login inicialmente
+        self.stacked_widget.setCurrentWidget(self.login_window)
+        
+        # Conectar sinais
+        self.login_window.login_successful.connect(self.on_login_successful)
+        self.vendas_window.logout_requested.connect(self.on_logout)
+        self.admin_window.logout_requested.connect(self.on_logout)
+    
+    def on_login_successful(self, usuario):
+        self.usuario_atual = usuario
+        nivel = usuario['nivel_id']
+        
+        print(f"🔍 Login successful - Usuário: {usuario['nome']}, Nível: {nivel}")
+        
+        if nivel == 1:  # Administrador
+            self.stacked_widget.setCurrentWidget(self.admin_window)
+            # CORREÇÃO: Passar usuario_atual para a janela admin
+            self.admin_window.usuario_atual = usuario
+            self.admin_window.carregar_dados()
+        elif nivel == 2:  # Supervisor
+            self.stacked_widget.setCurrentWidget(self.vendas_window)
+            # CORREÇÃO: Passar usuario_atual para a janela de vendas
+            self.vendas_window.usuario_atual = usuario
+            self.vendas_window.carregar_dados()
+        else:  # Vendedor
+            self.stacked_widget.setCurrentWidget(self.vendas_window)
+            # CORREÇÃO: Passar usuario_atual para a janela de vendas
+            self.vendas_window.usuario_atual = usuario
+            self.vendas_window.carregar_dados()
+    
+    def on_logout(self):
+        self.usuario_atual = None
+        self.stacked_widget.setCurrentWidget(self.login_window)
+        self.login_window.limpar_campos()
+
+def relatorio_arranque(inicio_arranque, tempos_importacao):
+    """Chamado quando o ecrã de login já está no ecrã"""
+    print(f"🚀 Ecrã de login pronto em {(time.perf_counter() - inicio_arranque) * 1000:.0f} ms")
+    if tempos_importacao:
+        tempos_importacao.parar()
+        print(tempos_importacao.relatorio())
+
+def executar(inicio_arranque, tempos_importacao=None):
+    """Cria a aplicação e a janela principal e corre o ciclo de eventos"""
+    app = QApplication(sys.argv)
+    
+    # Verificar conexão com base de dados
+    try:
+        window = SeekWebPOS()
+        app.aboutToQuit.connect(window.executor.encerrar)
+        app.aboutToQuit.connect(window.pos_venda.encerrar)
+        app.aboutToQuit.connect(window.recibos.encerrar)
+        window.show()
+        QTimer.singleShot(0, lambda: relatorio_arranque(inicio_arranque, tempos_importacao))
+    except Exception as e:
+        print(f"Erro fatal: {e}")
+        return 1
+    
+    return app.exec_()
@@ -1,39 +1,28 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton, QTableView,
                              QLineEdit, QComboBox, QMessageBox, QFrame,
-                             QTabWidget, QGroupBox, QGridLayout, QHeaderView,
+                             QTabWidget, QGroupBox, QHeaderView,
                              QShortcut, QDialog)
 from PyQt5.QtCore import pyqtSignal, Qt, QTimer
 from PyQt5.QtGui import QFont, QColor, QKeySequence
 from decimal import Decimal
+import time
 import json
+import datetime
 from models.produto import Produto
 from models.venda import Venda
 from models.cliente import Cliente
 from utils.calculos import Calculos
 from utils.scanner import Scanner
-
-# Importações opcionais para novas funcionalidades
-try:
-    from gui.pagamentos import DialogMultiplosPagamentos
-    from utils.recibo import GeradorRecibos
-    RECIBOS_DISPONIVEIS = True
-except ImportError as e:
-    print(f"⚠️ Aviso: Funcionalidades de recibos não disponíveis: {e}")
-    RECIBOS_DISPONIVEIS = False
-    
-    # Classes dummy para não quebrar o código
-    class DialogMultiplosPagamentos:
-        def __init__(self, *args, **kwargs):
-            pass
-        def exec_(self):
-            return 0
-        def get_pagamentos(self):
-            return []
-    
-    class GeradorRecibos:
-        def __init__(self, *args, **kwargs):
-            pass
+from utils.audio import Audio
+from core.executor import ExecutorConsultas
+from core.pos_venda import FilaPosVenda
+from core.fila_scans import FilaScans
+from core.renderizador import RenderizadorRecibos
+from core.definicoes import Definicoes
+from gui.componentes import GradeProdutos, ModeloCarrinho, DelegadoRemover, BarraAvisos
+from models.carrinho import Carrinho
+from gui.pagamentos import DialogMultiplosPagamentos
 
 class VendasWindow(QWidget):
     logout_requested = pyqtSignal()
@@ -43,15 +32,31 @@ class VendasWindow(QWidget):
         self.db = db
         # CORREÇÃO: Inicializar usuario_atual como None
         self._usuario_atual = None
-        self.carrinho = []
-        self.produto_model = Produto(db)
-        self.venda_model = Venda(db)
+        self.carrinho = Carrinho()
+        self.produto_model = Produto(db, getattr(parent, 'catalogo', None))
+        self.venda_model = Venda(db, diario=getattr(parent, 'diario', None))
         self.cliente_model = Cliente(db)
+        # Consultas correm fora da thread da GUI para o ecrã nunca congelar
+        self.executor = getattr(parent, 'executor', None) or ExecutorConsultas(parent=self)
+        # Recibo, impressão, pontos e cache correm depois do commit, fora da thread da GUI
+        self.pos_venda = getattr(parent, 'pos_venda', None) or FilaPosVenda(parent=self)
+        self.pos_venda.estado_alterado.connect(self.on_estado_pos_venda)
+        # Guardar já: depois de entrar no QStackedWidget, parent() deixa de ser a janela principal
+        self.config = getattr(parent, 'config', None)
+        # Recibos PDF gerados noutro processo
+        self.recibos = getattr(parent, 'recibos', None) or RenderizadorRecibos(parent=self)
+        self._empresa_caixa = None
+        self._empresa_info = None
         self.scanner = Scanner(parent.config) if parent and hasattr(parent, 'config') else None
-        self.codigo_scanner_buffer = ""
+        self.audio = self.criar_audio(parent)
+        # Códigos lidos ficam em fila: o scanner nunca espera pelo processamento anterior
+        self.fila_scans = self.criar_fila_scans()
         self.setup_ui()
         self.setup_scanner()
         self.carregar_produtos_reais()
+        # Guardar empresa e caixa enquanto há ligação: sem elas não se vende offline
+        self.executor.submeter(self.obter_empresa_caixa, chave='empresa_caixa',
+                               ao_falhar=lambda erro: None)
         
         print(f"🔍 VendasWindow init completo - usuario_atual: {self.usuario_atual}")
 
@@ -106,6 +111,9 @@ class VendasWindow(QWidget):
         
         scanner_layout.addWidget(self.scanner_status)
         scanner_layout.addWidget(self.scanner_input)
+        # Feedback das leituras sem janelas modais
+        self.barra_avisos = BarraAvisos()
+        scanner_layout.addWidget(self.barra_avisos)
         scanner_layout.addLayout(scanner_btn_layout)
         scanner_group.setLayout(scanner_layout)
         
@@ -114,7 +122,12 @@ class VendasWindow(QWidget):
         busca_layout = QVBoxLayout()
         self.busca_input = QLineEdit()
         self.busca_input.setPlaceholderText("Digite nome, código ou referência do produto...")
-        self.busca_input.textChanged.connect(self.filtrar_produtos)
+        # Debounce: só pesquisa quando o utilizador para de escrever
+        self.timer_busca = QTimer(self)
+        self.timer_busca.setSingleShot(True)
+        self.timer_busca.setInterval(200)
+        self.timer_busca.timeout.connect(lambda: self.filtrar_produtos(self.busca_input.text()))
+        self.busca_input.textChanged.connect(lambda _: self.timer_busca.start())
         busca_layout.addWidget(self.busca_input)
         busca_group.setLayout(busca_layout)
         
@@ -126,10 +139,10 @@ class VendasWindow(QWidget):
         produtos_group = QGroupBox("📦 Produtos Disponíveis")
         produtos_layout = QVBoxLayout()
         
-        # Container para a grid
-        self.produtos_container = QWidget()
-        self.produtos_grid = QGridLayout(self.produtos_container)
-        produtos_layout.addWidget(self.produtos_container)
+        # Grelha virtualizada: só desenha os produtos visíveis
+        self.grade_produtos = GradeProdutos()
+        self.grade_produtos.produto_escolhido.connect(self.adicionar_ao_carrinho)
+        produtos_layout.addWidget(self.grade_produtos)
         
         produtos_group.setLayout(produtos_layout)
         left_layout.addWidget(produtos_group)
@@ -225,9 +238,14 @@ class VendasWindow(QWidget):
         carrinho_group = QGroupBox("🛒 Carrinho de Compras")
         carrinho_layout = QVBoxLayout()
         
-        self.carrinho_table = QTableWidget()
-        self.carrinho_table.setColumnCount(6)
-        self.carrinho_table.setHorizontalHeaderLabels(["Produto", "Qtd", "Preço", "IVA", "Total", "Ações"])
+        # Tabela ligada a um modelo: adicionar ou remover só atualiza a linha afetada
+        self.modelo_carrinho = ModeloCarrinho(self.carrinho, self)
+        self.modelo_carrinho.totais_alterados.connect(self.atualizar_totais)
+        self.carrinho_table = QTableView()
+        self.carrinho_table.setModel(self.modelo_carrinho)
+        self.carrinho_table.setItemDelegateForColumn(ModeloCarrinho.COLUNA_REMOVER, DelegadoRemover(self.carrinho_table))
+        self.carrinho_table.setMouseTracking(True)
+        self.carrinho_table.clicked.connect(self.on_carrinho_clicado)
         header = self.carrinho_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch)
         header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
@@ -298,6 +316,10 @@ class VendasWindow(QWidget):
         if self.scanner:
             # Conectar sinal do scanner
             self.scanner.codigo_lido.connect(self.on_codigo_scanner_lido)
+            self.scanner.ligacao_alterada.connect(self.on_ligacao_scanner)
+            # Porta ou tipo alterados no config.ini: religar sem reiniciar a caixa
+            if isinstance(self.config, Definicoes):
+                self.config.subscrever(lambda alteradas: self.scanner.reconfigurar(), seccao='Scanner')
             print("✅ Scanner configurado e pronto")
         else:
             print("⚠️ Scanner não disponível")
@@ -344,72 +366,109 @@ class VendasWindow(QWidget):
             self.btn_ativar_scanner.setEnabled(True)
             self.btn_desativar_scanner.setEnabled(False)
     
-    def on_codigo_scanner_lido(self, codigo):
+    def criar_audio(self, parent):
+        """Cria o leitor de sons (opcional: sem áudio o feedback é só visual)"""
+        if not parent or not hasattr(parent, 'config'):
+            return None
+        try:
+            return Audio(parent.config)
+        except Exception as e:
+            print(f"⚠️ Áudio não disponível: {e}")
+            return None
+    
+    def mostrar_aviso(self, texto, tipo='info', som=None):
+        """Mostra um aviso não modal e toca o som correspondente"""
+        self.barra_avisos.mostrar(texto, tipo)
+        if som and self.audio:
+            self.audio.play_som(som)
+    
+    def on_codigo_scanner_lido(self, codigo, capturado):
         """Processa código lido pelo scanner"""
         print(f"📦 Código recebido do scanner: {codigo}")
-        
-        # Atualizar interface na thread principal
-        self.scanner_input.setText(codigo)
-        self.processar_codigo_scanner()
+        self.enfileirar_scan(codigo, capturado)
+    
+    def on_ligacao_scanner(self, ligado):
+        """Scanner COM desligado (cabo, porta) ou religado automaticamente"""
+        if not self.scanner.leitura_ativa:
+            return
+        if ligado:
+            self.scanner_status.setText("🟢 Scanner: Ativo e aguardando...")
+            self.scanner_status.setStyleSheet("font-weight: bold; color: #27ae60; padding: 5px;")
+        else:
+            self.scanner_status.setText("🔴 Scanner: Desligado, a tentar religar...")
+            self.scanner_status.setStyleSheet("font-weight: bold; color: #e74c3c; padding: 5px;")
     
     def processar_codigo_scanner(self):
         """Processa código digitado ou lido pelo scanner"""
         codigo = self.scanner_input.text().strip()
-        
-        if not codigo:
-            return
-        
-        print(f"🔍 Procurando produto com código: {codigo}")
-        
-        # Buscar produto pelo código de barras
-        produto = self.produto_model.obter_por_codigo_barras(codigo)
-        
+        self.scanner_input.clear()
+        self.enfileirar_scan(codigo)
+    
+    def enfileirar_scan(self, codigo, capturado=None):
+        """Aceita a leitura de imediato; a procura do produto corre na thread da fila"""
+        self.fila_scans.receber(codigo, capturado)
+    
+    def criar_fila_scans(self):
+        """Fila de leituras com a procura do produto numa thread própria"""
+        capacidade, janela_ms = 50, 300
+        if self.config:
+            capacidade = self.config.getint('Scanner', 'fila_maxima', fallback=50)
+            janela_ms = self.config.getint('Scanner', 'janela_duplicados_ms', fallback=300)
+        fila = FilaScans(self.produto_model.obter_por_codigo_barras, capacidade=capacidade,
+                         janela_duplicados=janela_ms / 1000, parent=self)
+        fila.produto_lido.connect(self.on_produto_lido)
+        fila.fila_cheia.connect(self.on_fila_scans_cheia)
+        return fila
+    
+    def on_produto_lido(self, codigo, quantidade, produto, capturado):
+        """Resultado de uma leitura, pela ordem em que foram lidas"""
+        print(f"🔍 Código {codigo} x{quantidade} processado "
+              f"{(time.monotonic() - capturado) * 1000:.1f} ms depois da leitura")
         if produto:
             print(f"✅ Produto encontrado: {produto['nome']}")
-            self.adicionar_ao_carrinho(produto)
-            self.scanner_input.clear()
-            self.focar_scanner()  # Volta o foco para o scanner
+            self.adicionar_ao_carrinho(produto, quantidade)
         else:
             print(f"❌ Produto não encontrado para código: {codigo}")
-            QMessageBox.warning(self, "Produto Não Encontrado", 
-                              f"Nenhum produto encontrado com o código:\n{codigo}")
-            self.scanner_input.selectAll()
-            self.scanner_input.setFocus()
-    
-    def keyPressEvent(self, event):
-        """Captura eventos de teclado para o scanner"""
-        # Se o scanner estiver ativo e for um scanner USB/teclado
-        if (self.scanner and 
-            self.scanner.leitura_ativa and 
-            event.text() and 
-            event.text().isprintable()):
-            
-            # Acumular caracteres para scanners que emulam teclado
-            self.codigo_scanner_buffer += event.text()
-            
-            # Se pressionou Enter, processa o código
-            if event.key() in [Qt.Key_Return, Qt.Key_Enter]:
-                if self.codigo_scanner_buffer.strip():
-                    self.scanner.simular_leitura_teclado(self.codigo_scanner_buffer.strip())
-                    self.codigo_scanner_buffer = ""
+            self.mostrar_aviso(f"❌ Produto não encontrado: {codigo}", 'erro', som='erro')
         
-        super().keyPressEvent(event)
+        if self.fila_scans.profundidade() == 0:
+            self.focar_scanner()  # Volta o foco para o scanner
+    
+    def on_fila_scans_cheia(self, codigo):
+        """Leituras a chegar mais depressa do que são processadas: a leitura foi recusada"""
+        print(f"⚠️ Fila de leituras cheia, código recusado: {codigo}; {self.fila_scans.metricas()}")
+        self.mostrar_aviso(f"⚠️ Leitura não registada ({codigo}): aguarde e volte a ler", 'erro', som='erro')
+    
+    def showEvent(self, event):
+        """Leituras de scanners USB (teclado) são apanhadas em toda a aplicação enquanto este ecrã está visível"""
+        super().showEvent(event)
+        if self.scanner:
+            self.scanner.captar_teclado(True)
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self.scanner:
+            self.scanner.captar_teclado(False)
     
     def carregar_formas_pagamento(self):
-        """Carrega formas de pagamento no ComboBox - Versão Corrigida"""
+        """Carrega formas de pagamento no ComboBox (consulta em segundo plano)"""
+        print("🔍 Carregando formas de pagamento...")
+        self.executor.submeter(
+            self.db.execute_query,
+            "SELECT id, nome, codigo, aceita_troco FROM formas_pagamento WHERE ativo = 1 ORDER BY id",
+            ao_concluir=self.preencher_formas_pagamento,
+            ao_falhar=lambda erro: self.preencher_formas_pagamento(None),
+            chave='formas_pagamento'
+        )
+    
+    def preencher_formas_pagamento(self, formas_pagamento):
+        """Preenche o ComboBox com as formas de pagamento - Versão Corrigida"""
         try:
-            print("🔍 Carregando formas de pagamento...")
-            
             # Limpar combo box primeiro
             self.combo_pagamento.clear()
             
-            formas_pagamento = self.db.execute_query(
-                "SELECT id, nome, codigo, aceita_troco FROM formas_pagamento WHERE ativo = 1 ORDER BY id"
-            )
-            
-            print(f"📊 Formas de pagamento encontradas: {len(formas_pagamento)}")
-            
             if formas_pagamento:
+                print(f"📊 Formas de pagamento encontradas: {len(formas_pagamento)}")
                 for fp in formas_pagamento:
                     # CORREÇÃO: Garantir que todos os campos existem
                     fp_data = {
@@ -461,196 +520,59 @@ class VendasWindow(QWidget):
             for fp in formas_padrao:
                 self.combo_pagamento.addItem(fp['nome'], fp)
     
-    # ... (os outros métodos permanecem os mesmos: carregar_produtos_reais, criar_botoes_produtos, 
-    # adicionar_ao_carrinho, atualizar_carrinho, calcular_troco, limpar_carrinho, finalizar_venda, 
+    # ... (os outros métodos permanecem os mesmos: carregar_produtos_reais, mostrar_produtos, 
+    # adicionar_ao_carrinho, atualizar_totais, calcular_troco, limpar_carrinho, finalizar_venda, 
     # salvar_venda, filtrar_produtos, carregar_dados)
     
     def carregar_produtos_reais(self):
-        """Carrega produtos reais da base de dados"""
-        try:
-            produtos = self.produto_model.obter_todos()
-            self.criar_botoes_produtos(produtos)
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Erro ao carregar produtos: {str(e)}")
-    
-    def criar_botoes_produtos(self, produtos):
-        """Cria botões dos produtos baseado na base de dados"""
-        # Limpar grid existente
-        for i in reversed(range(self.produtos_grid.count())): 
-            widget = self.produtos_grid.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        
-        if not produtos:
-            no_products_label = QLabel("Nenhum produto encontrado")
-            no_products_label.setAlignment(Qt.AlignCenter)
-            self.produtos_grid.addWidget(no_products_label, 0, 0)
-            return
-        
-        row, col = 0, 0
-        max_cols = 4  # 4 colunas para melhor visualização
-        
-        for produto in produtos:
-            # Calcular preço com IVA
-            preco_com_iva = Calculos.calcular_total_com_iva(
-                Decimal(str(produto['preco_venda'])), 
-                produto['taxa_iva']
-            )
-            
-            # Criar botão com informações do produto
-            btn_text = f"{produto['nome']}\n{preco_com_iva:.2f} Kz\nStock: {produto['stock']}\nIVA: {produto['taxa_iva']}%"
-            btn = QPushButton(btn_text)
-            btn.setFixedSize(150, 100)
-            btn.setToolTip(f"{produto['descricao'] or 'Sem descrição'}\nRef: {produto['referencia']}")
-            
-            # Cor baseada no stock
-            if produto['stock'] <= 0:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ffebee;
-                        color: #c62828;
-                        border: 2px solid #c62828;
-                        border-radius: 8px;
-                        padding: 5px;
-                        font-size: 10px;
-                        font-weight: bold;
-                    }
-                """)
-                btn.setEnabled(False)
-            elif produto['stock'] <= 5:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #fff3e0;
-                        color: #ef6c00;
-                        border: 2px solid #ff9800;
-                        border-radius: 8px;
-                        padding: 5px;
-                        font-size: 10px;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #ffe0b2;
-                    }
-                """)
-            else:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #e8f5e8;
-                        color: #2e7d32;
-                        border: 2px solid #4caf50;
-                        border-radius: 8px;
-                        padding: 5px;
-                        font-size: 10px;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #c8e6c9;
-                        border: 2px solid #2e7d32;
-                    }
-                """)
-            
-            # Conectar clique
-            btn.clicked.connect(lambda checked, p=produto: self.adicionar_ao_carrinho(p))
-            self.produtos_grid.addWidget(btn, row, col)
-            
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
+        """Carrega produtos reais da base de dados (em segundo plano)"""
+        self.executor.submeter(
+            self.produto_model.obter_todos,
+            ao_concluir=self.mostrar_produtos,
+            ao_falhar=lambda erro: QMessageBox.critical(self, "Erro", f"Erro ao carregar produtos: {str(erro)}"),
+            chave='produtos'
+        )
+    
+    def mostrar_produtos(self, produtos):
+        """Mostra os produtos na grelha (só os mosaicos alterados são redesenhados)"""
+        self.grade_produtos.modelo.definir_produtos(produtos)
     
-    def adicionar_ao_carrinho(self, produto):
+    def adicionar_ao_carrinho(self, produto, quantidade=1):
         """Adiciona produto ao carrinho com verificação de stock"""
         try:
-            # Verificar stock
-            if not self.produto_model.verificar_stock(produto['id'], 1):
-                QMessageBox.warning(self, "Stock Insuficiente", 
-                                  f"❌ Produto {produto['nome']} sem stock disponível!\n\nStock atual: {produto['stock']}")
-                return
+            quantidade_atual = self.carrinho.quantidade(produto['id'])
             
-            # Verificar se produto já está no carrinho
-            for item in self.carrinho:
-                if item['id'] == produto['id']:
-                    # Verificar stock para quantidade adicional
-                    if not self.produto_model.verificar_stock(produto['id'], item['quantidade'] + 1):
-                        QMessageBox.warning(self, "Stock Insuficiente", 
-                                          f"❌ Stock insuficiente para {produto['nome']}!\n\nStock atual: {produto['stock']}\nQuantidade no carrinho: {item['quantidade']}")
-                        return
-                    item['quantidade'] += 1
-                    self.atualizar_carrinho()
-                    
-                    # Feedback visual
-                    QMessageBox.information(self, "Produto Adicionado", 
-                                          f"✅ {produto['nome']}\nQuantidade: {item['quantidade']}\nPreço: {item['preco_venda']:.2f} Kz")
-                    return
-            
-            # Adicionar novo item
-            novo_item = {
-                'id': produto['id'],
-                'nome': produto['nome'],
-                'preco_venda': Decimal(str(produto['preco_venda'])),
-                'taxa_iva': produto['taxa_iva'],
-                'taxa_iva_id': produto['taxa_iva_id'],
-                'quantidade': 1,
-                'stock_atual': produto['stock']
-            }
+            # Verificar stock para a quantidade que ficará no carrinho
+            if not self.produto_model.verificar_stock(produto['id'], quantidade_atual + quantidade):
+                if quantidade_atual:
+                    self.mostrar_aviso(f"❌ Stock insuficiente para {produto['nome']} "
+                                       f"(stock {produto['stock']}, no carrinho {quantidade_atual})", 'erro', som='erro')
+                else:
+                    self.mostrar_aviso(f"❌ {produto['nome']} sem stock disponível (stock {produto['stock']})",
+                                       'erro', som='erro')
+                return
             
-            self.carrinho.append(novo_item)
-            self.atualizar_carrinho()
+            item = self.modelo_carrinho.adicionar(produto, quantidade)
             
-            # Feedback visual
-            QMessageBox.information(self, "Produto Adicionado", 
-                                  f"✅ {produto['nome']}\nQuantidade: 1\nPreço: {produto['preco_venda']:.2f} Kz\nIVA: {produto['taxa_iva']}%")
+            # Feedback visual e sonoro, sem interromper as leituras seguintes
+            self.mostrar_aviso(f"✅ {produto['nome']} — Qtd: {item['quantidade']} — "
+                               f"{item['preco_venda']:.2f} Kz (IVA {produto['taxa_iva']}%)", 'sucesso', som='scan')
             
         except Exception as e:
             QMessageBox.critical(self, "Erro", f"Erro ao adicionar produto: {str(e)}")
     
-    def atualizar_carrinho(self):
-        """Atualiza tabela do carrinho e totais"""
+    def atualizar_totais(self):
+        """Atualiza os totais a partir dos valores mantidos pelo carrinho"""
         try:
-            self.carrinho_table.setRowCount(len(self.carrinho))
-            
-            subtotal_sem_iva = Decimal('0')
-            total_iva = Decimal('0')
-            
-            for row, item in enumerate(self.carrinho):
-                # Calcular valores
-                subtotal_item_sem_iva = item['preco_venda'] * item['quantidade']
-                iva_item = Calculos.calcular_iva(subtotal_item_sem_iva, item['taxa_iva'])
-                total_item = subtotal_item_sem_iva + iva_item
-                
-                subtotal_sem_iva += subtotal_item_sem_iva
-                total_iva += iva_item
-                
-                # Adicionar à tabela
-                self.carrinho_table.setItem(row, 0, QTableWidgetItem(item['nome']))
-                self.carrinho_table.setItem(row, 1, QTableWidgetItem(str(item['quantidade'])))
-                self.carrinho_table.setItem(row, 2, QTableWidgetItem(f"{item['preco_venda']:.2f} Kz"))
-                self.carrinho_table.setItem(row, 3, QTableWidgetItem(f"{item['taxa_iva']}%"))
-                self.carrinho_table.setItem(row, 4, QTableWidgetItem(f"{total_item:.2f} Kz"))
-                
-                # Botão para remover item
-                btn_remover = QPushButton("🗑️")
-                btn_remover.setStyleSheet("""
-                    QPushButton {
-                        background-color: #e74c3c;
-                        color: white;
-                        border: none;
-                        padding: 5px;
-                        border-radius: 3px;
-                        font-size: 10px;
-                    }
-                    QPushButton:hover {
-                        background-color: #c0392b;
-                    }
-                """)
-                btn_remover.clicked.connect(lambda checked, r=row: self.remover_item_carrinho(r))
-                self.carrinho_table.setCellWidget(row, 5, btn_remover)
+            self.lbl_subtotal.setText(f"Subtotal: {self.carrinho.subtotal_sem_iva:.2f} Kz")
+            self.lbl_iva.setText(f"IVA: {self.carrinho.total_iva:.2f} Kz")
+            self.lbl_total.setText(f"TOTAL: {self.carrinho.total:.2f} Kz")
             
-            total_geral = subtotal_sem_iva + total_iva
-            
-            self.lbl_subtotal.setText(f"Subtotal: {subtotal_sem_iva:.2f} Kz")
-            self.lbl_iva.setText(f"IVA: {total_iva:.2f} Kz")
-            self.lbl_total.setText(f"TOTAL: {total_geral:.2f} Kz")
+            # IVA discriminado por taxa
+            self.lbl_iva.setToolTip("\n".join(
+                f"IVA {taxa}%: {resumo['iva']:.2f} Kz (base {resumo['base']:.2f} Kz)"
+                for taxa, resumo in sorted(self.carrinho.iva_por_taxa.items())
+            ))
             
             # Calcular troco
             self.calcular_troco()
@@ -658,6 +580,11 @@ class VendasWindow(QWidget):
         except Exception as e:
             print(f"Erro ao atualizar carrinho: {e}")
     
+    def on_carrinho_clicado(self, index):
+        """Clique na coluna de ações remove o item"""
+        if index.column() == ModeloCarrinho.COLUNA_REMOVER:
+            self.remover_item_carrinho(index.row())
+    
     def calcular_troco(self):
         """Calcula troco baseado no valor pago"""
         try:
@@ -667,10 +594,7 @@ class VendasWindow(QWidget):
                 return
                 
             valor_pago = Decimal(valor_pago_text)
-            total_text = self.lbl_total.text().split(": ")[1].replace(" Kz", "").replace(',', '.').strip()
-            total_geral = Decimal(total_text)
-            
-            troco = max(Decimal('0'), valor_pago - total_geral)
+            troco = Calculos.calcular_troco(valor_pago, self.carrinho.total)
             self.lbl_troco.setText(f"Troco: {troco:.2f} Kz")
             
         except Exception as e:
@@ -680,14 +604,13 @@ class VendasWindow(QWidget):
         """Remove item do carrinho"""
         try:
             if 0 <= index < len(self.carrinho):
-                item = self.carrinho[index]
+                item = self.carrinho.item_na_linha(index)
                 reply = QMessageBox.question(self, "Remover Item", 
                                            f"Remover {item['nome']} do carrinho?",
                                            QMessageBox.Yes | QMessageBox.No)
                 
                 if reply == QMessageBox.Yes:
-                    self.carrinho.pop(index)
-                    self.atualizar_carrinho()
+                    self.modelo_carrinho.remover_linha(index)
                     QMessageBox.information(self, "Sucesso", "Item removido do carrinho!")
                     
         except Exception as e:
@@ -702,8 +625,7 @@ class VendasWindow(QWidget):
                                            QMessageBox.Yes | QMessageBox.No)
                 
                 if reply == QMessageBox.Yes:
-                    self.carrinho.clear()
-                    self.atualizar_carrinho()
+                    self.modelo_carrinho.limpar()
                     self.valor_pago_input.clear()
                     self.cliente_input.clear()
                     QMessageBox.information(self, "Sucesso", "Carrinho limpo com sucesso!")
@@ -727,8 +649,7 @@ class VendasWindow(QWidget):
                 self.logout_requested.emit()
                 return
             
-            total_text = self.lbl_total.text().split(": ")[1].replace(" Kz", "").replace(',', '.').strip()
-            total_geral = Decimal(total_text)
+            total_geral = self.carrinho.total
             
             # Processar cliente se fornecido
             cliente_id = None
@@ -789,16 +710,15 @@ class VendasWindow(QWidget):
             print("=" * 50)
             
             # 1. Preparar dados da venda
-            subtotal_sem_iva = Decimal(self.lbl_subtotal.text().split(": ")[1].replace(" Kz", "").replace(',', '.'))
-            total_iva = Decimal(self.lbl_iva.text().split(": ")[1].replace(" Kz", "").replace(',', '.'))
+            subtotal_sem_iva = self.carrinho.subtotal_sem_iva
+            total_iva = self.carrinho.total_iva
             
             # Obter empresa e caixa
-            empresa = self.db.execute_query("SELECT id FROM empresas LIMIT 1")[0]
-            caixa = self.db.execute_query("SELECT id FROM caixas WHERE ativo = 1 LIMIT 1")[0]
+            empresa_id, caixa_id = self.obter_empresa_caixa()
             
             dados_venda = {
-                'empresa_id': empresa['id'],
-                'caixa_id': caixa['id'],
+                'empresa_id': empresa_id,
+                'caixa_id': caixa_id,
                 'usuario_id': self.usuario_atual['id'],
                 'cliente_id': cliente_id,
                 'total_sem_iva': float(subtotal_sem_iva),
@@ -807,44 +727,52 @@ class VendasWindow(QWidget):
             }
             
             # 2. Preparar itens
-            itens_venda = []
-            for item in self.carrinho:
-                subtotal_item_sem_iva = item['preco_venda'] * item['quantidade']
-                iva_item = Calculos.calcular_iva(subtotal_item_sem_iva, item['taxa_iva'])
-                
-                item_data = {
-                    'produto_id': int(item['id']),
-                    'quantidade': int(item['quantidade']),
-                    'preco_unitario': float(item['preco_venda']),
-                    'taxa_iva_id': int(item['taxa_iva_id']),
-                    'valor_iva': float(iva_item),
-                    'subtotal': float(subtotal_item_sem_iva + iva_item),
-                    'desconto': 0.0
-                }
-                itens_venda.append(item_data)
+            itens_venda = self.carrinho.itens_venda()
             
             # 3. Processar venda completa
             sucesso, resultado = self.venda_model.processar_venda_completa(
                 dados_venda, itens_venda, pagamentos
             )
             
-            if sucesso:
-                # 4. Gerar recibo
-                self.gerar_recibo_automatico(resultado)
+            if sucesso and self.venda_model.venda_offline:
+                # Sem servidor: a venda fica no diário e é enviada quando a ligação voltar.
+                # O recibo sai na mesma, a partir dos dados da caixa
+                self.pos_venda.agendar(resultado, [
+                    ('recibo', self.etapa_recibo),
+                    ('impressao', self.etapa_impressao)
+                ], {'detalhes': self.detalhes_venda_offline(resultado, dados_venda, pagamentos)})
+                self.mostrar_aviso(f"📴 Venda {resultado} registada offline — Total: {total_geral:.2f} Kz "
+                                   "(será enviada quando a ligação voltar)", 'aviso', som='venda')
+                self.modelo_carrinho.limpar()
+                self.valor_pago_input.clear()
+                self.cliente_input.clear()
+                self.focar_scanner()
                 
-                QMessageBox.information(self, "✅ Venda Concluída", 
-                                      f"Venda finalizada com sucesso!\n\n"
-                                      f"📋 Número: {resultado}\n"
-                                      f"💳 Total: {total_geral:.2f} Kz\n"
-                                      f"📦 Itens: {len(self.carrinho)}\n"
-                                      f"💵 Pagamentos: {len(pagamentos)} forma(s)")
+            elif sucesso:
+                # 4. Recibo, impressão, pontos e cache em segundo plano
+                self.pos_venda.agendar(resultado, [
+                    ('recibo', self.etapa_recibo),
+                    ('impressao', self.etapa_impressao),
+                    ('fidelidade', self.etapa_fidelidade),
+                    ('catalogo', self.etapa_catalogo)
+                ], {'cliente_id': cliente_id, 'total': total_geral})
                 
-                # 5. Limpar interface
-                self.carrinho.clear()
-                self.atualizar_carrinho()
+                mensagem = f"✅ Venda {resultado} concluída — Total: {total_geral:.2f} Kz"
+                tipo = 'sucesso'
+                if self.venda_model.faltas_stock:
+                    nomes = {item['id']: item['nome'] for item in self.carrinho}
+                    faltas = ", ".join(f"{nomes.get(falta['produto_id'], falta['produto_id'])} "
+                                       f"(pedido {falta['quantidade']}, disponível {falta['stock']})"
+                                       for falta in self.venda_model.faltas_stock)
+                    mensagem += f" — ⚠️ Stock não atualizado: {faltas}"
+                    tipo = 'aviso'
+                self.mostrar_aviso(mensagem, tipo, som='venda')
+                
+                # 5. Limpar interface: a caixa fica pronta para o próximo cliente
+                self.modelo_carrinho.limpar()
                 self.valor_pago_input.clear()
                 self.cliente_input.clear()
-                self.carregar_produtos_reais()
+                self.focar_scanner()
                 
             else:
                 QMessageBox.critical(self, "❌ Erro na Venda", 
@@ -857,83 +785,148 @@ class VendasWindow(QWidget):
             traceback.print_exc()
             QMessageBox.critical(self, "❌ Erro Crítico", error_msg)
     
-    def gerar_recibo_automatico(self, numero_venda):
-        """Gera recibo automaticamente após venda"""
-        try:
-            # CORREÇÃO: Obter config do parent
-            if hasattr(self, 'parent') and self.parent() and hasattr(self.parent(), 'config'):
-                config = self.parent().config
-            else:
-                print("⚠️ Config não disponível para gerar recibo")
-                return
-            
-            # Obter dados completos da venda
+    def obter_empresa_caixa(self):
+        """Ids da empresa e do caixa (guardados, com os dados da empresa para o recibo, para
+        continuar a vender sem ligação)"""
+        if self._empresa_caixa is None:
+            empresa = self.db.execute_query("SELECT id, nome, nif, telefone, endereco FROM empresas LIMIT 1")
+            caixa = self.db.execute_query("SELECT id FROM caixas WHERE ativo = 1 LIMIT 1")
+            if not empresa or not caixa:
+                raise RuntimeError("Não foi possível obter a empresa e o caixa")
+            self._empresa_info = {chave: empresa[0][chave] for chave in ('nome', 'nif', 'telefone', 'endereco')}
+            self._empresa_caixa = (empresa[0]['id'], caixa[0]['id'])
+        return self._empresa_caixa
+    
+    def detalhes_venda_offline(self, numero_venda, dados_venda, pagamentos):
+        """Detalhes da venda no formato de obter_detalhes_venda_por_numero, a partir do carrinho"""
+        venda = dict(dados_venda, numero_venda=numero_venda, created_at=datetime.datetime.now(),
+                     vendedor=(self.usuario_atual or {}).get('nome', 'Sistema'))
+        itens = [{
+            'produto_nome': item['nome'],
+            'quantidade': item['quantidade'],
+            'preco_unitario': float(item['preco_venda']),
+            'taxa_iva': item['taxa_iva'],
+            'subtotal': float(item['total'])
+        } for item in self.carrinho]
+        pagamentos = [{
+            'forma_pagamento': pagamento.get('forma_pagamento_nome', ''),
+            'valor': float(pagamento['valor']),
+            'troco': float(pagamento.get('troco', 0))
+        } for pagamento in pagamentos]
+        return {'venda': venda, 'itens': itens, 'pagamentos': pagamentos}
+    
+    def etapa_recibo(self, contexto):
+        """Pós-venda: agenda o recibo PDF (o ficheiro chega depois em on_estado_pos_venda)"""
+        return self.gerar_recibo_automatico(contexto['numero_venda'], contexto)
+    
+    def etapa_impressao(self, contexto):
+        """Pós-venda: envia o recibo para a impressora"""
+        return self.imprimir_recibo_automatico(contexto)
+    
+    def etapa_fidelidade(self, contexto):
+        """Pós-venda: acumula pontos de fidelidade do cliente"""
+        if not contexto.get('cliente_id'):
+            return None
+        pontos = Calculos.calcular_pontos_fidelidade(contexto['total'])
+        if pontos:
+            self.cliente_model.adicionar_pontos(contexto['cliente_id'], pontos)
+        return f"{pontos} pontos"
+    
+    def etapa_catalogo(self, contexto):
+        """Pós-venda: atualiza o catálogo em memória com o novo stock"""
+        catalogo = self.produto_model.catalogo
+        if catalogo:
+            catalogo.atualizar()
+        return "atualizado"
+    
+    def on_estado_pos_venda(self, numero_venda, etapa, estado, detalhe):
+        """Recebe o estado de cada etapa pós-venda (na thread da GUI)"""
+        print(f"📋 Pós-venda {numero_venda}: {etapa} -> {estado} {detalhe}")
+        if estado == 'erro':
+            self.mostrar_aviso(f"⚠️ Venda {numero_venda}: falha em {etapa} ({detalhe})", 'aviso', som='erro')
+        elif etapa == 'catalogo':
+            # Stock novo: só os mosaicos alterados são redesenhados
+            self.filtrar_produtos(self.busca_input.text())
+    
+    def gerar_recibo_automatico(self, numero_venda, contexto=None):
+        """Agenda o recibo da venda no renderizador de recibos e devolve o Future do ficheiro"""
+        if not self.config:
+            print("⚠️ Config não disponível para gerar recibo")
+            return None
+        
+        # Vendas offline já trazem os detalhes; as outras vão buscá-los ao servidor
+        detalhes_venda = contexto.get('detalhes') if contexto is not None else None
+        if detalhes_venda is None:
             detalhes_venda = self.venda_model.obter_detalhes_venda_por_numero(numero_venda)
             
             if not detalhes_venda:
-                print("⚠️ Não foi possível obter detalhes da venda para gerar recibo")
-                return
-            
-            venda = detalhes_venda['venda']
-            itens = detalhes_venda['itens']
-            pagamentos = detalhes_venda['pagamentos']
-            
-            # Obter informações da empresa
-            empresa_info = self.db.execute_query(
-                "SELECT nome, nif, telefone, endereco FROM empresas WHERE id = %s", 
-                (venda['empresa_id'],)
-            )[0]
-            
-            # Gerador de recibos
-            gerador = GeradorRecibos(config)
-            
-            # Gerar recibo PDF
-            recibo_pdf = gerador.gerar_recibo_venda(venda, itens, pagamentos, empresa_info)
-            
-            if recibo_pdf:
-                print(f"✅ Recibo gerado: {recibo_pdf}")
-            else:
-                print("⚠️ Não foi possível gerar recibo PDF")
-                
-        except Exception as e:
-            print(f"⚠️ Erro ao gerar recibo automático: {e}")
+                raise RuntimeError("Não foi possível obter detalhes da venda para gerar recibo")
+            if contexto is not None:
+                contexto['detalhes'] = detalhes_venda
+        
+        venda = detalhes_venda['venda']
+        itens = detalhes_venda['itens']
+        pagamentos = detalhes_venda['pagamentos']
+        
+        # Informações da empresa guardadas com a empresa e o caixa (também servem offline)
+        self.obter_empresa_caixa()
+        empresa_info = self._empresa_info
+        
+        # O PDF é gerado noutro processo: a fila do pós-venda marca a etapa como 'agendado' e
+        # só o fim do Future dá o 'ok' (com o ficheiro) ou o 'erro'
+        future = self.recibos.submeter(
+            RenderizadorRecibos.instantaneo(venda, itens, pagamentos, empresa_info),
+            # Esta thread é a do pós-venda: esperar por lugar na fila não atrasa a caixa
+            espera=30
+        )
+        if future is None:
+            raise RuntimeError("Fila de recibos cheia")
+        return future
     
-    def imprimir_recibo_automatico(self, arquivo_recibo):
+    def imprimir_recibo_automatico(self, contexto):
         """Imprime recibo automaticamente"""
-        try:
-            if self.config.getboolean('Impressora', 'impressao_automatica', fallback=True):
-                from utils.impressora import Impressora
-                impressora = Impressora(self.config)
-                
-                # Ler conteúdo do arquivo e imprimir
-                with open(arquivo_recibo, 'r', encoding='utf-8') as f:
-                    conteudo = f.read()
-                
-                dados_impressao = {
-                    'conteudo': conteudo,
-                    'numero_venda': arquivo_recibo.split('_')[-1].replace('.txt', '')
-                }
-                
-                impressora.imprimir_recibo(dados_impressao)
-                print("✅ Recibo enviado para impressão automática")
-                
-        except Exception as e:
-            print(f"⚠️ Erro na impressão automática: {e}")
-                
+        if not self.config or not self.config.getboolean('Impressora', 'impressao_automatica', fallback=True):
+            return None
+        detalhes = contexto.get('detalhes')
+        if not detalhes:
+            return None
+        
+        from utils.impressora import Impressora
+        impressora = Impressora(self.config)
+        
+        dados_impressao = {
+            'numero_venda': contexto['numero_venda'],
+            'itens': [{'nome': item['produto_nome'], 'quantidade': item['quantidade'],
+                       'preco': item['preco_unitario']} for item in detalhes['itens']],
+            'total': detalhes['venda']['total_com_iva']
+        }
+        
+        impressora.imprimir_recibo(dados_impressao)
+        print("✅ Recibo enviado para impressão automática")
+        return "enviado"
+    
     def filtrar_produtos(self, texto):
-        """Filtra produtos baseado no texto"""
-        try:
-            produtos_filtrados = self.produto_model.obter_todos(texto)
-            self.criar_botoes_produtos(produtos_filtrados)
-        except Exception as e:
-            print(f"Erro ao filtrar produtos: {e}")
+        """Filtra produtos pelo índice de pesquisa (pesquisas antigas são canceladas)"""
+        self.executor.submeter(
+            self.produto_model.obter_todos, texto,
+            ao_concluir=self.mostrar_produtos,
+            ao_falhar=lambda erro: print(f"Erro ao filtrar produtos: {erro}"),
+            chave='produtos'
+        )
     
     def carregar_dados(self):
         """Carrega dados iniciais"""
         self.carregar_produtos_reais()
+        # O primeiro som da sessão não deve esperar pela importação do pygame
+        if self.audio:
+            self.executor.submeter(self.audio.preparar, chave='audio',
+                                   ao_falhar=lambda erro: print(f"⚠️ Áudio não disponível: {erro}"))
+        # Nem o primeiro recibo deve esperar pelo arranque do processo e pelo reportlab
+        self.recibos.aquecer()
         
     def closeEvent(self, event):
         """Evento chamado quando a janela é fechada"""
         if self.scanner:
             self.scanner.fechar()
+        self.fila_scans.encerrar()
         event.accept()
\ No newline at end of file
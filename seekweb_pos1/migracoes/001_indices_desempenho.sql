@@ -0,0 +1,14 @@
+-- Índices para os caminhos de acesso dos relatórios, do dashboard e do caixa.
+-- Os relatórios filtram vendas por estado e intervalo de created_at; total_com_iva no
+-- índice deixa SUM/AVG/MAX sem ler a tabela (o id vai implícito para o JOIN dos itens).
+CREATE INDEX idx_vendas_estado_data ON vendas (estado, created_at, total_com_iva);
+
+-- Itens e pagamentos por venda, com as colunas somadas nos relatórios (índices de cobertura)
+CREATE INDEX idx_venda_itens_venda ON venda_itens (venda_id, produto_id, quantidade, subtotal, preco_unitario);
+CREATE INDEX idx_venda_pagamentos_venda ON venda_pagamentos (venda_id, forma_pagamento_id, valor);
+
+-- Movimentos do dia no separador do caixa (saldo = soma de valor por tipo)
+CREATE INDEX idx_movimentos_caixa_data ON movimentos_caixa (created_at, tipo, valor);
+
+-- Atualização incremental do catálogo (produtos alterados desde a última consulta)
+CREATE INDEX idx_produtos_updated_at ON produtos (updated_at);
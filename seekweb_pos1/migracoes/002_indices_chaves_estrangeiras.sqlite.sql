@@ -0,0 +1,7 @@
+-- Só SQLite: o InnoDB cria um índice para cada chave estrangeira, o SQLite não.
+CREATE INDEX idx_venda_itens_produto ON venda_itens (produto_id);
+CREATE INDEX idx_venda_pagamentos_forma ON venda_pagamentos (forma_pagamento_id);
+CREATE INDEX idx_vendas_usuario ON vendas (usuario_id);
+CREATE INDEX idx_vendas_cliente ON vendas (cliente_id);
+CREATE INDEX idx_vendas_caixa ON vendas (caixa_id);
+CREATE INDEX idx_movimentos_caixa_usuario ON movimentos_caixa (usuario_id);
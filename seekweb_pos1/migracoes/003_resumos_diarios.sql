@@ -0,0 +1,36 @@
+-- Totais diários mantidos na transação de cada venda (models/resumos.py).
+-- O dashboard e os relatórios leem uma linha por dia em vez de agregar todas as vendas.
+-- Depois de aplicada, a migração preenche os resumos com o histórico (ResumosDiarios.reconstruir).
+
+-- Por dia, caixa e vendedor (agrupar por caixa_id ou usuario_id dá os totais de cada um)
+CREATE TABLE IF NOT EXISTS resumo_vendas_dia (
+    data DATE NOT NULL,
+    caixa_id INT NOT NULL,
+    usuario_id INT NOT NULL,
+    quantidade INT NOT NULL DEFAULT 0,
+    total_sem_iva DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_iva DECIMAL(14,2) NOT NULL DEFAULT 0,
+    total_com_iva DECIMAL(14,2) NOT NULL DEFAULT 0,
+    maior_venda DECIMAL(10,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (data, caixa_id, usuario_id)
+);
+
+-- Por dia e produto (soma_precos / linhas dá o preço médio das linhas vendidas)
+CREATE TABLE IF NOT EXISTS resumo_produtos_dia (
+    data DATE NOT NULL,
+    produto_id INT NOT NULL,
+    quantidade INT NOT NULL DEFAULT 0,
+    total_faturado DECIMAL(14,2) NOT NULL DEFAULT 0,
+    soma_precos DECIMAL(14,2) NOT NULL DEFAULT 0,
+    linhas INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (data, produto_id)
+);
+
+-- Por dia e forma de pagamento
+CREATE TABLE IF NOT EXISTS resumo_pagamentos_dia (
+    data DATE NOT NULL,
+    forma_pagamento_id INT NOT NULL,
+    utilizacoes INT NOT NULL DEFAULT 0,
+    total_valor DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (data, forma_pagamento_id)
+);
@@ -0,0 +1,8 @@
+-- Sequência de numeração de vendas por caixa (models/numeracao.py).
+-- Cada caixa reserva blocos de números numa só ida à base de dados; a linha é criada na
+-- primeira reserva, por isso instalações existentes só precisam da tabela.
+CREATE TABLE IF NOT EXISTS sequencias_venda (
+    caixa_id INT PRIMARY KEY,
+    proximo BIGINT NOT NULL DEFAULT 1,
+    FOREIGN KEY (caixa_id) REFERENCES caixas(id)
+);
@@ -0,0 +1,111 @@
+from decimal import Decimal
+from utils.calculos import Calculos
+
+class Carrinho:
+    """Carrinho de compras indexado por produto, com totais mantidos a cada alteração"""
+
+    def __init__(self):
+        self._itens = {}   # produto_id -> item (a ordem de inserção é a ordem das linhas)
+        self._ids = []     # linha -> produto_id
+        self._linhas = {}  # produto_id -> linha
+        self.limpar()
+
+    def limpar(self):
+        self._itens.clear()
+        self._ids.clear()
+        self._linhas.clear()
+        self.subtotal_sem_iva = Decimal('0')
+        self.total_iva = Decimal('0')
+        self.iva_por_taxa = {}  # taxa -> {'base': Decimal, 'iva': Decimal}
+
+    @property
+    def total(self):
+        return self.subtotal_sem_iva + self.total_iva
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __iter__(self):
+        return iter(list(self._itens.values()))
+
+    def obter(self, produto_id):
+        return self._itens.get(produto_id)
+
+    def item_na_linha(self, linha):
+        return self._itens[self._ids[linha]]
+
+    def linha_de(self, produto_id):
+        return self._linhas.get(produto_id)
+
+    def quantidade(self, produto_id):
+        item = self._itens.get(produto_id)
+        return item['quantidade'] if item else 0
+
+    def adicionar(self, produto, quantidade=1):
+        """Soma a quantidade ao produto (criando a linha se preciso); devolve (linha, nova)"""
+        item = self._itens.get(produto['id'])
+        if item is not None:
+            self._definir_quantidade(item, item['quantidade'] + quantidade)
+            return self._linhas[produto['id']], False
+
+        item = {
+            'id': produto['id'],
+            'nome': produto['nome'],
+            'preco_venda': Decimal(str(produto['preco_venda'])),
+            'taxa_iva': produto['taxa_iva'],
+            'taxa_iva_id': produto['taxa_iva_id'],
+            'quantidade': 0,
+            'stock_atual': produto['stock'],
+            'subtotal_sem_iva': Decimal('0'),
+            'valor_iva': Decimal('0'),
+            'total': Decimal('0')
+        }
+        self._itens[item['id']] = item
+        self._linhas[item['id']] = len(self._ids)
+        self._ids.append(item['id'])
+        self._definir_quantidade(item, quantidade)
+        return self._linhas[item['id']], True
+
+    def remover(self, produto_id):
+        """Remove a linha do produto e devolve o índice que ela ocupava"""
+        item = self._itens.pop(produto_id, None)
+        if item is None:
+            return None
+        self._aplicar_linha(item, -1)
+        linha = self._linhas.pop(produto_id)
+        del self._ids[linha]
+        for i in range(linha, len(self._ids)):
+            self._linhas[self._ids[i]] = i
+        return linha
+
+    def _definir_quantidade(self, item, quantidade):
+        """Troca a contribuição antiga da linha pela nova nos totais"""
+        self._aplicar_linha(item, -1)
+        item['quantidade'] = quantidade
+        item['subtotal_sem_iva'] = item['preco_venda'] * quantidade
+        item['valor_iva'] = Calculos.calcular_iva(item['subtotal_sem_iva'], item['taxa_iva'])
+        item['total'] = item['subtotal_sem_iva'] + item['valor_iva']
+        self._aplicar_linha(item, 1)
+
+    def _aplicar_linha(self, item, sinal):
+        self.subtotal_sem_iva += sinal * item['subtotal_sem_iva']
+        self.total_iva += sinal * item['valor_iva']
+
+        taxa = item['taxa_iva']
+        resumo = self.iva_por_taxa.setdefault(taxa, {'base': Decimal('0'), 'iva': Decimal('0')})
+        resumo['base'] += sinal * item['subtotal_sem_iva']
+        resumo['iva'] += sinal * item['valor_iva']
+        if not resumo['base'] and not resumo['iva']:
+            del self.iva_por_taxa[taxa]
+
+    def itens_venda(self):
+        """Linhas no formato esperado por Venda.processar_venda_completa"""
+        return [{
+            'produto_id': int(item['id']),
+            'quantidade': int(item['quantidade']),
+            'preco_unitario': float(item['preco_venda']),
+            'taxa_iva_id': int(item['taxa_iva_id']),
+            'valor_iva': float(item['valor_iva']),
+            'subtotal': float(item['total']),
+            'desconto': 0.0
+        } for item in self._itens.values()]
@@ -0,0 +1,51 @@
+import threading
+from core.database import Database
+
+class NumeracaoVenda:
+    """Numeração de vendas por caixa: reserva blocos de números numa só ida à base de dados"""
+
+    def __init__(self, db: Database, tamanho_bloco=None):
+        self.db = db
+        self.tamanho_bloco = max(1, tamanho_bloco or db.config.getint('Caixa', 'bloco_numeracao', fallback=50))
+        self._lock = threading.Lock()
+        self._blocos = {}  # caixa_id -> [próximo número, fim exclusivo]
+
+    def proximo(self, caixa_id):
+        """Devolve o próximo número de venda do caixa, por exemplo V01-00000042"""
+        with self._lock:
+            bloco = self._blocos.get(caixa_id)
+            if bloco is None or bloco[0] >= bloco[1]:
+                bloco = self._blocos[caixa_id] = self._reservar_bloco(caixa_id)
+            numero = bloco[0]
+            bloco[0] += 1
+        return f"V{int(caixa_id):02d}-{numero:08d}"
+
+    def _reservar_bloco(self, caixa_id):
+        """Avança a sequência do caixa em tamanho_bloco e devolve o intervalo reservado"""
+        if self.db.in_transaction():
+            # Um rollback da venda devolveria o bloco à sequência e os números seriam repetidos
+            raise RuntimeError("A numeração tem de ser reservada fora da transação da venda")
+
+        if self.db.motor.nome == 'sqlite':
+            # O SQLite não tem LAST_INSERT_ID(expr): o upsert devolve o novo valor com RETURNING
+            query = """
+            INSERT INTO sequencias_venda (caixa_id, proximo) VALUES (%s, %s)
+            ON CONFLICT (caixa_id) DO UPDATE SET proximo = proximo + %s
+            RETURNING proximo
+            """
+            linhas = self.db.execute_query(query, (caixa_id, self.tamanho_bloco + 1, self.tamanho_bloco))
+            fim = linhas[0]['proximo'] if linhas else None
+        else:
+            # LAST_INSERT_ID(expr) devolve o novo valor no próprio INSERT: sem SELECT nem lock longo
+            query = """
+            INSERT INTO sequencias_venda (caixa_id, proximo) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE proximo = LAST_INSERT_ID(proximo + %s)
+            """
+            fim = self.db.execute_insert(query, (caixa_id, self.tamanho_bloco + 1, self.tamanho_bloco))
+        if fim is None:
+            raise RuntimeError(f"Não foi possível reservar numeração para o caixa {caixa_id}")
+
+        # Primeira reserva do caixa no MySQL: a linha foi inserida e não há LAST_INSERT_ID
+        fim = fim or self.tamanho_bloco + 1
+        print(f"🔢 Caixa {caixa_id}: reservados números {fim - self.tamanho_bloco} a {fim - 1}")
+        return [fim - self.tamanho_bloco, fim]
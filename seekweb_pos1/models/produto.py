@@ -2,11 +2,17 @@ from core.database import Database
 from decimal import Decimal
 
 class Produto:
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, catalogo=None):
         self.db = db
+        self.catalogo = catalogo
     
     def obter_por_codigo_barras(self, codigo_barras):
-        """Obtém produto por código de barras"""
+        """Obtém produto por código de barras (primeiro no catálogo em memória)"""
+        if self.catalogo and self.catalogo.carregado:
+            produto = self.catalogo.por_codigo_barras(codigo_barras)
+            if produto:
+                return produto
+        
         query = """
         SELECT p.*, t.taxa as taxa_iva, c.nome as categoria_nome
         FROM produtos p 
@@ -15,10 +21,18 @@ class Produto:
         WHERE p.codigo_barras = %s AND p.ativo = 1
         """
         result = self.db.execute_query(query, (codigo_barras,))
+        if result and self.catalogo:
+            # Produto criado depois da última atualização do catálogo
+            self.catalogo.guardar(result[0])
         return result[0] if result else None
     
     def obter_por_id(self, produto_id):
-        """Obtém produto por ID"""
+        """Obtém produto por ID (primeiro no catálogo em memória)"""
+        if self.catalogo and self.catalogo.carregado:
+            produto = self.catalogo.por_id(produto_id)
+            if produto:
+                return produto
+        
         query = """
         SELECT p.*, t.taxa as taxa_iva, c.nome as categoria_nome
         FROM produtos p 
@@ -27,10 +41,15 @@ class Produto:
         WHERE p.id = %s AND p.ativo = 1
         """
         result = self.db.execute_query(query, (produto_id,))
+        if result and self.catalogo:
+            self.catalogo.guardar(result[0])
         return result[0] if result else None
     
     def obter_todos(self, filtro=None):
         """Obtém todos os produtos com filtro opcional"""
+        if self.catalogo and self.catalogo.carregado:
+            return self.catalogo.procurar(filtro)
+        
         query = """
         SELECT p.*, t.taxa as taxa_iva, c.nome as categoria_nome
         FROM produtos p 
@@ -57,8 +76,51 @@ class Produto:
     def atualizar_stock(self, produto_id, quantidade):
         """Atualiza stock do produto"""
         query = "UPDATE produtos SET stock = stock - %s WHERE id = %s AND stock >= %s"
-        result = self.db.execute_insert(query, (quantidade, produto_id, quantidade))
-        return result is not None
+        linhas = self.db.execute_update(query, (quantidade, produto_id, quantidade))
+        return bool(linhas)
+    
+    def atualizar_stock_lote(self, itens):
+        """Baixa o stock de todas as linhas de uma venda num só UPDATE e devolve as que não tinham stock"""
+        # Agregar por produto (o mesmo produto pode aparecer em várias linhas)
+        quantidades = {}
+        for item in itens:
+            produto_id = int(item['produto_id'])
+            quantidades[produto_id] = quantidades.get(produto_id, 0) + int(item['quantidade'])
+        
+        if not quantidades:
+            return []
+        
+        ids = sorted(quantidades)
+        marcadores = ", ".join(["%s"] * len(ids))
+        faltas = []
+        
+        with self.db.transaction():
+            # Bloquear as linhas sempre por ordem de id evita deadlocks entre caixas
+            query = f"SELECT id, stock FROM produtos WHERE id IN ({marcadores}) ORDER BY id FOR UPDATE"
+            stock_atual = {linha['id']: linha['stock'] for linha in self.db.execute_query(query, ids)}
+            
+            baixas = []
+            for produto_id in ids:
+                disponivel = stock_atual.get(produto_id, 0)
+                if disponivel >= quantidades[produto_id]:
+                    baixas.append(produto_id)
+                else:
+                    faltas.append({
+                        'produto_id': produto_id,
+                        'quantidade': quantidades[produto_id],
+                        'stock': disponivel
+                    })
+            
+            if baixas:
+                casos = " ".join(["WHEN %s THEN %s"] * len(baixas))
+                params = [valor for produto_id in baixas for valor in (produto_id, quantidades[produto_id])]
+                query = f"""
+                UPDATE produtos SET stock = stock - CASE id {casos} END
+                WHERE id IN ({", ".join(["%s"] * len(baixas))})
+                """
+                self.db.execute_update(query, params + baixas)
+        
+        return faltas
     
     def obter_stock_atual(self, produto_id):
         """Obtém stock atual do produto"""
@@ -0,0 +1,133 @@
+from decimal import Decimal
+from core.database import Database
+
+QUERY_RESUMO_VENDAS = """
+INSERT INTO resumo_vendas_dia (data, caixa_id, usuario_id, quantidade,
+                               total_sem_iva, total_iva, total_com_iva, maior_venda)
+VALUES (COALESCE(%s, CURDATE()), %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    quantidade = quantidade + VALUES(quantidade),
+    total_sem_iva = total_sem_iva + VALUES(total_sem_iva),
+    total_iva = total_iva + VALUES(total_iva),
+    total_com_iva = total_com_iva + VALUES(total_com_iva),
+    maior_venda = GREATEST(maior_venda, VALUES(maior_venda))
+"""
+
+QUERY_RESUMO_PRODUTOS = """
+INSERT INTO resumo_produtos_dia (data, produto_id, quantidade, total_faturado, soma_precos, linhas)
+VALUES (COALESCE(%s, CURDATE()), %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    quantidade = quantidade + VALUES(quantidade),
+    total_faturado = total_faturado + VALUES(total_faturado),
+    soma_precos = soma_precos + VALUES(soma_precos),
+    linhas = linhas + VALUES(linhas)
+"""
+
+QUERY_RESUMO_PAGAMENTOS = """
+INSERT INTO resumo_pagamentos_dia (data, forma_pagamento_id, utilizacoes, total_valor)
+VALUES (COALESCE(%s, CURDATE()), %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    utilizacoes = utilizacoes + VALUES(utilizacoes),
+    total_valor = total_valor + VALUES(total_valor)
+"""
+
+def _somar(acumulado, chave, valores):
+    linha = acumulado.setdefault(chave, [0] * len(valores))
+    for i, valor in enumerate(valores):
+        linha[i] += valor
+
+def _chave_ordenavel(chave):
+    # Data None (hoje, decidida pela base de dados) primeiro; sem comparar None com str
+    return tuple((valor is not None, valor) for valor in chave)
+
+class ResumosDiarios:
+    """Totais diários por caixa e vendedor, por produto e por forma de pagamento.
+
+    São atualizados dentro da transação de cada venda, por isso o dashboard e os
+    relatórios custam uma linha por dia, qualquer que seja o número de vendas.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def registar_venda(self, dados_venda, itens, pagamentos, data=None):
+        """Soma uma venda paga aos resumos (chamar dentro da transação da venda)"""
+        self.registar_vendas([(dados_venda, itens, pagamentos, data)])
+
+    def registar_vendas(self, vendas):
+        """Soma várias vendas [(dados_venda, itens, pagamentos, data)]; data None é o dia de hoje.
+
+        As linhas são escritas por ordem de chave: duas caixas a vender ao mesmo tempo
+        bloqueiam os mesmos resumos pela mesma ordem e não entram em deadlock.
+        """
+        por_venda, por_produto, por_pagamento = {}, {}, {}
+        maior_venda = {}
+        for dados_venda, itens, pagamentos, data in vendas:
+            chave = (data, int(dados_venda['caixa_id']), int(dados_venda['usuario_id']))
+            total_com_iva = Decimal(str(dados_venda['total_com_iva']))
+            _somar(por_venda, chave, [1, Decimal(str(dados_venda['total_sem_iva'])),
+                                      Decimal(str(dados_venda['total_iva'])), total_com_iva])
+            maior_venda[chave] = max(maior_venda.get(chave, total_com_iva), total_com_iva)
+
+            for item in itens:
+                _somar(por_produto, (data, int(item['produto_id'])), [
+                    int(item['quantidade']), Decimal(str(item['subtotal'])),
+                    Decimal(str(item['preco_unitario'])), 1])
+
+            for pagamento in pagamentos:
+                _somar(por_pagamento, (data, int(pagamento['forma_pagamento_id'])),
+                       [1, Decimal(str(pagamento['valor']))])
+
+        self.db.execute_many(QUERY_RESUMO_VENDAS, [
+            chave + tuple(valores) + (maior_venda[chave],)
+            for chave, valores in sorted(por_venda.items(), key=lambda par: _chave_ordenavel(par[0]))])
+        self.db.execute_many(QUERY_RESUMO_PRODUTOS, [
+            chave + tuple(valores)
+            for chave, valores in sorted(por_produto.items(), key=lambda par: _chave_ordenavel(par[0]))])
+        self.db.execute_many(QUERY_RESUMO_PAGAMENTOS, [
+            chave + tuple(valores)
+            for chave, valores in sorted(por_pagamento.items(), key=lambda par: _chave_ordenavel(par[0]))])
+
+    def reconstruir(self, periodo=None):
+        """Recalcula os resumos a partir das vendas pagas (todo o histórico ou só o Periodo dado)"""
+        if periodo is None:
+            filtro_vendas, filtro_resumo, params, params_resumo = "1 = 1", "1 = 1", (), ()
+        else:
+            filtro_vendas, params = periodo.filtro('v.created_at'), periodo.params
+            filtro_resumo, params_resumo = periodo.filtro('data'), periodo.datas
+
+        with self.db.transaction():
+            for tabela in ('resumo_vendas_dia', 'resumo_produtos_dia', 'resumo_pagamentos_dia'):
+                self.db.execute_update(f"DELETE FROM {tabela} WHERE {filtro_resumo}", params_resumo)
+
+            self.db.execute_update(f"""
+                INSERT INTO resumo_vendas_dia (data, caixa_id, usuario_id, quantidade,
+                                               total_sem_iva, total_iva, total_com_iva, maior_venda)
+                SELECT DATE(v.created_at), v.caixa_id, v.usuario_id, COUNT(*),
+                       ROUND(SUM(v.total_sem_iva), 2), ROUND(SUM(v.total_iva), 2),
+                       ROUND(SUM(v.total_com_iva), 2), MAX(v.total_com_iva)
+                FROM vendas v
+                WHERE v.estado = 'paga' AND {filtro_vendas}
+                GROUP BY DATE(v.created_at), v.caixa_id, v.usuario_id
+            """, params)
+            self.db.execute_update(f"""
+                INSERT INTO resumo_produtos_dia (data, produto_id, quantidade, total_faturado, soma_precos, linhas)
+                SELECT DATE(v.created_at), vi.produto_id, SUM(vi.quantidade),
+                       ROUND(SUM(vi.subtotal), 2), ROUND(SUM(vi.preco_unitario), 2), COUNT(*)
+                FROM venda_itens vi
+                JOIN vendas v ON vi.venda_id = v.id
+                WHERE v.estado = 'paga' AND {filtro_vendas}
+                GROUP BY DATE(v.created_at), vi.produto_id
+            """, params)
+            self.db.execute_update(f"""
+                INSERT INTO resumo_pagamentos_dia (data, forma_pagamento_id, utilizacoes, total_valor)
+                SELECT DATE(v.created_at), vp.forma_pagamento_id, COUNT(*), ROUND(SUM(vp.valor), 2)
+                FROM venda_pagamentos vp
+                JOIN vendas v ON vp.venda_id = v.id
+                WHERE v.estado = 'paga' AND {filtro_vendas}
+                GROUP BY DATE(v.created_at), vp.forma_pagamento_id
+            """, params)
+
+        dias = self.db.execute_query("SELECT COUNT(DISTINCT data) as dias FROM resumo_vendas_dia")
+        print(f"📊 Resumos diários reconstruídos ({dias[0]['dias'] if dias else 0} dias com vendas)")
+        return True
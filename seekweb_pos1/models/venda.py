@@ -4,10 +4,57 @@ import datetime
 import traceback
 from utils.calculos import Calculos
 from models.produto import Produto
+from models.numeracao import NumeracaoVenda
+from models.resumos import ResumosDiarios
+
+class _FalhaVenda(Exception):
+    """Falha numa fase da venda; provoca o rollback da transação"""
+
+
+def _linha_item(venda_id, item):
+    """Tuplo de venda_itens no formato dos INSERT em lote"""
+    return (
+        venda_id, 
+        item['produto_id'], 
+        item['quantidade'], 
+        float(item['preco_unitario']), 
+        item['taxa_iva_id'], 
+        float(item['valor_iva']), 
+        float(item['subtotal']), 
+        float(item.get('desconto', 0))
+    )
+
+def _linha_pagamento(venda_id, pagamento):
+    """Tuplo de venda_pagamentos no formato dos INSERT em lote"""
+    return (
+        venda_id, 
+        pagamento['forma_pagamento_id'], 
+        float(pagamento['valor']),
+        float(pagamento.get('troco', 0)), 
+        str(pagamento.get('referencia', ''))
+    )
+
+QUERY_INSERIR_ITENS = """
+INSERT INTO venda_itens (venda_id, produto_id, quantidade, preco_unitario, 
+                         taxa_iva_id, valor_iva, subtotal, desconto)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+QUERY_INSERIR_PAGAMENTOS = """
+INSERT INTO venda_pagamentos (venda_id, forma_pagamento_id, valor, troco, referencia)
+VALUES (%s, %s, %s, %s, %s)
+"""
+
 
 class Venda:
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, numeracao=None, diario=None):
         self.db = db
+        self.numeracao = numeracao or NumeracaoVenda(db)
+        self.resumos = ResumosDiarios(db)
+        # Diário local para continuar a vender quando o MySQL não responde
+        self.diario = diario
+        self.faltas_stock = []
+        self.venda_offline = False
     
     def criar_venda(self, dados_venda):
         """Cria uma nova venda com todos os dados - Versão Robusta"""
@@ -21,9 +68,9 @@ class Venda:
                     print(f"❌ Campo obrigatório faltando: {campo}")
                     return None, None
             
-            # Gerar número da venda
-            numero_venda = f"V{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
-            print(f"📋 Número da venda gerado: {numero_venda}")
+            # Número reservado por processar_venda_completa (fora da transação) ou pelo alocador
+            numero_venda = dados_venda.get('numero_venda') or self.numeracao.proximo(dados_venda['caixa_id'])
+            print(f"📋 Número da venda: {numero_venda}")
             
             # Tratar cliente_id - garantir que seja None se não fornecido
             cliente_id = dados_venda.get('cliente_id')
@@ -60,23 +107,8 @@ class Venda:
             venda_id = self.db.execute_insert(query, params)
             
             if venda_id is None:
-                print("❌ ERRO: venda_id retornou None após inserção")
-                # Tentar ver qual foi o erro
-                try:
-                    # Verificar se a venda foi inserida mesmo com None
-                    venda_check = self.db.execute_query(
-                        "SELECT id FROM vendas WHERE numero_venda = %s", 
-                        (numero_venda,)
-                    )
-                    if venda_check:
-                        venda_id = venda_check[0]['id']
-                        print(f"⚠️  Venda foi inserida com ID: {venda_id}, mas execute_insert retornou None")
-                    else:
-                        print("❌ Venda não foi inserida na base de dados")
-                        return None, None
-                except Exception as check_error:
-                    print(f"❌ Erro ao verificar inserção: {check_error}")
-                    return None, None
+                print("❌ Venda não foi inserida na base de dados")
+                return None, None
             
             print(f"✅ Venda criada com sucesso: ID {venda_id}, Número {numero_venda}")
             return venda_id, numero_venda
@@ -99,40 +131,25 @@ class Venda:
                 print("❌ venda_id é None")
                 return False
             
+            campos_item = ['produto_id', 'quantidade', 'preco_unitario', 'taxa_iva_id', 'valor_iva', 'subtotal']
+            linhas = []
+            
             for index, item in enumerate(itens):
-                print(f"📦 Processando item {index + 1}: {item}")
-                
                 # Validar campos do item
-                campos_item = ['produto_id', 'quantidade', 'preco_unitario', 'taxa_iva_id', 'valor_iva', 'subtotal']
                 for campo in campos_item:
                     if campo not in item or item[campo] is None:
                         print(f"❌ Campo {campo} faltando no item {index}")
                         return False
                 
-                query = """
-                INSERT INTO venda_itens (venda_id, produto_id, quantidade, preco_unitario, 
-                                        taxa_iva_id, valor_iva, subtotal, desconto)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                
-                params = (
-                    venda_id, 
-                    item['produto_id'], 
-                    item['quantidade'], 
-                    float(item['preco_unitario']), 
-                    item['taxa_iva_id'], 
-                    float(item['valor_iva']), 
-                    float(item['subtotal']), 
-                    float(item.get('desconto', 0))
-                )
-                
-                print(f"💾 Inserindo item {index + 1}...")
-                result = self.db.execute_insert(query, params)
-                
-                if result is None:
-                    print(f"❌ Falha ao inserir item {index + 1}")
-                    # Tentar continuar com os outros itens?
-                    continue
+                linhas.append(_linha_item(venda_id, item))
+            
+            # Um único INSERT multi-linha para todos os itens
+            print(f"💾 Inserindo {len(linhas)} itens em lote...")
+            result = self.db.execute_many(QUERY_INSERIR_ITENS, linhas)
+            
+            if result is None:
+                print("❌ Falha ao inserir itens")
+                return False
             
             print(f"✅ {len(itens)} itens processados")
             return True
@@ -155,9 +172,9 @@ class Venda:
                 print("❌ venda_id é None")
                 return False
             
+            linhas = []
+            
             for index, pagamento in enumerate(pagamentos):
-                print(f"💳 Processando pagamento {index + 1}: {pagamento}")
-                
                 # Validar campos do pagamento
                 if 'forma_pagamento_id' not in pagamento or pagamento['forma_pagamento_id'] is None:
                     print(f"❌ forma_pagamento_id faltando no pagamento {index}")
@@ -167,25 +184,14 @@ class Venda:
                     print(f"❌ valor faltando no pagamento {index}")
                     return False
                 
-                query = """
-                INSERT INTO venda_pagamentos (venda_id, forma_pagamento_id, valor, troco, referencia)
-                VALUES (%s, %s, %s, %s, %s)
-                """
-                
-                params = (
-                    venda_id, 
-                    pagamento['forma_pagamento_id'], 
-                    float(pagamento['valor']),
-                    float(pagamento.get('troco', 0)), 
-                    str(pagamento.get('referencia', ''))
-                )
-                
-                print(f"💾 Inserindo pagamento {index + 1}...")
-                result = self.db.execute_insert(query, params)
-                
-                if result is None:
-                    print(f"❌ Falha ao inserir pagamento {index + 1}")
-                    continue
+                linhas.append(_linha_pagamento(venda_id, pagamento))
+            
+            print(f"💾 Inserindo {len(linhas)} pagamentos em lote...")
+            result = self.db.execute_many(QUERY_INSERIR_PAGAMENTOS, linhas)
+            
+            if result is None:
+                print("❌ Falha ao inserir pagamentos")
+                return False
             
             print(f"✅ {len(pagamentos)} pagamentos processados")
             return True
@@ -199,6 +205,8 @@ class Venda:
         """Processa uma venda completa (transação) - Versão Super Robusta"""
         try:
             print("🎯 INICIANDO PROCESSAMENTO COMPLETO DA VENDA")
+            self.faltas_stock = []
+            self.venda_offline = False
             print("=" * 50)
             
             # Validação rigorosa
@@ -212,58 +220,142 @@ class Venda:
             print(f"💳 Pagamentos: {len(pagamentos)}")
             print(f"📊 Dados venda: {dados_venda}")
             
-            # 1. Criar venda
-            venda_id, numero_venda = self.criar_venda(dados_venda)
-            
-            if venda_id is None:
-                return False, "Falha crítica: não foi possível criar o registro da venda"
-            
-            print(f"✅ Fase 1 concluída: Venda {numero_venda} criada com ID {venda_id}")
-            
-            # 2. Adicionar itens
-            if not self.adicionar_itens(venda_id, itens):
-                # Tentar limpar a venda criada
-                self._limpar_venda_falha(venda_id)
-                return False, "Falha ao adicionar itens à venda"
-            
-            print("✅ Fase 2 concluída: Itens adicionados")
+            if self.diario is not None and self.diario.servidor_em_baixo:
+                # Servidor em baixo na venda anterior: não esperar outra vez pelo timeout
+                if not dados_venda.get('numero_venda') and dados_venda.get('caixa_id'):
+                    dados_venda = dict(dados_venda, numero_venda=self.diario.numero_local(dados_venda['caixa_id']))
+                return self.registar_offline(dados_venda, itens, pagamentos)
             
-            # 3. Adicionar pagamentos
-            if not self.adicionar_pagamentos(venda_id, pagamentos):
-                # Tentar limpar a venda criada
-                self._limpar_venda_falha(venda_id)
-                return False, "Falha ao adicionar pagamentos"
+            # O número é reservado antes da transação: a sequência nunca fica bloqueada pela venda
+            if not dados_venda.get('numero_venda') and dados_venda.get('caixa_id'):
+                dados_venda = dict(dados_venda, numero_venda=self.reservar_numero(dados_venda['caixa_id']))
             
-            print("✅ Fase 3 concluída: Pagamentos processados")
-            
-            # 4. Atualizar stock (opcional - pode continuar mesmo com falha)
-            produto_model = Produto(self.db)
-            stock_errors = []
-            
-            for item in itens:
-                try:
-                    sucesso = produto_model.atualizar_stock(item['produto_id'], item['quantidade'])
-                    if not sucesso:
-                        stock_errors.append(f"Produto ID {item['produto_id']}")
-                        print(f"⚠️  Aviso: Não foi possível atualizar stock do produto {item['produto_id']}")
-                except Exception as e:
-                    stock_errors.append(f"Produto ID {item['produto_id']}: {e}")
-                    print(f"⚠️  Erro ao atualizar stock: {e}")
-            
-            if stock_errors:
-                print(f"⚠️  Avisos de stock: {stock_errors}")
-                # Não falhar a venda por erro de stock, apenas registrar
+            # Tudo numa única transação: um commit no fim ou rollback completo
+            with self.db.transaction():
+                # 1. Criar venda
+                venda_id, numero_venda = self.criar_venda(dados_venda)
+                
+                if venda_id is None:
+                    raise _FalhaVenda("Falha crítica: não foi possível criar o registro da venda")
+                
+                print(f"✅ Fase 1 concluída: Venda {numero_venda} criada com ID {venda_id}")
+                
+                # 2. Adicionar itens
+                if not self.adicionar_itens(venda_id, itens):
+                    raise _FalhaVenda("Falha ao adicionar itens à venda")
+                
+                print("✅ Fase 2 concluída: Itens adicionados")
+                
+                # 3. Adicionar pagamentos
+                if not self.adicionar_pagamentos(venda_id, pagamentos):
+                    raise _FalhaVenda("Falha ao adicionar pagamentos")
+                
+                print("✅ Fase 3 concluída: Pagamentos processados")
+                
+                # 4. Atualizar stock de todas as linhas num só UPDATE (faltas não falham a venda)
+                self.faltas_stock = Produto(self.db).atualizar_stock_lote(itens)
+                
+                for falta in self.faltas_stock:
+                    print(f"⚠️  Stock insuficiente: produto {falta['produto_id']} "
+                          f"(pedido {falta['quantidade']}, disponível {falta['stock']})")
+                
+                print("✅ Fase 4 concluída: Stock atualizado")
+                
+                # 5. Totais diários do dashboard e dos relatórios (mesmo commit que a venda)
+                self.resumos.registar_venda(dados_venda, itens, pagamentos)
             
-            print("✅ Fase 4 concluída: Stock atualizado")
             print("🎉 VENDA PROCESSADA COM SUCESSO!")
             
             return True, numero_venda
             
+        except _FalhaVenda as e:
+            print(f"❌ Venda revertida: {e}")
+            if self._servidor_inacessivel():
+                return self.registar_offline(dados_venda, itens, pagamentos)
+            return False, str(e)
         except Exception as e:
             print(f"❌ ERRO CRÍTICO NO PROCESSAMENTO: {e}")
             traceback.print_exc()
+            if self._servidor_inacessivel():
+                return self.registar_offline(dados_venda, itens, pagamentos)
             return False, f"Erro crítico: {str(e)}"
     
+    def reservar_numero(self, caixa_id):
+        """Número da sequência do servidor; sem ligação, um número local para o diário"""
+        try:
+            return self.numeracao.proximo(caixa_id)
+        except RuntimeError:
+            if self._servidor_inacessivel():
+                return self.diario.numero_local(caixa_id)
+            raise
+    
+    def _servidor_inacessivel(self):
+        return self.diario is not None and not self.db.disponivel()
+    
+    def registar_offline(self, dados_venda, itens, pagamentos):
+        """Guarda a venda no diário local para ser enviada quando a ligação voltar"""
+        if not dados_venda.get('numero_venda'):
+            return False, "Venda sem número: não é possível registar offline"
+        
+        dados_venda = dict(dados_venda, created_at=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        self.diario.registar(dados_venda, itens, pagamentos)
+        self.diario.servidor_em_baixo = True
+        self.venda_offline = True
+        print(f"📴 Servidor inacessível: venda {dados_venda['numero_venda']} registada no diário offline")
+        return True, dados_venda['numero_venda']
+    
+    def reenviar_diario(self, limite=200):
+        """Envia as vendas do diário offline em lote; vendas já existentes no servidor são ignoradas"""
+        if not self.diario or not self.diario.quantidade() or not self.db.disponivel():
+            return 0
+        
+        pendentes = self.diario.pendentes(limite)
+        numeros = [p['numero_venda'] for p in pendentes]
+        marcadores = ", ".join(["%s"] * len(numeros))
+        
+        with self.db.transaction():
+            # Idempotente: um reenvio anterior pode ter feito commit sem limpar o diário
+            existentes = {linha['numero_venda'] for linha in self.db.execute_query(
+                f"SELECT numero_venda FROM vendas WHERE numero_venda IN ({marcadores})", numeros)}
+            novas = [p for p in pendentes if p['numero_venda'] not in existentes]
+            
+            if novas:
+                self.db.execute_many("""
+                INSERT INTO vendas (empresa_id, caixa_id, usuario_id, cliente_id, numero_venda, 
+                                   total_sem_iva, total_iva, total_com_iva, estado, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'paga', %s)
+                """, [(
+                    p['venda']['empresa_id'], p['venda']['caixa_id'], p['venda']['usuario_id'],
+                    p['venda'].get('cliente_id') or None, p['numero_venda'],
+                    float(p['venda']['total_sem_iva']), float(p['venda']['total_iva']),
+                    float(p['venda']['total_com_iva']), p['venda']['created_at']
+                ) for p in novas])
+                
+                ids = {linha['numero_venda']: linha['id'] for linha in self.db.execute_query(
+                    f"SELECT id, numero_venda FROM vendas WHERE numero_venda IN ({marcadores})", numeros)}
+                
+                self.db.execute_many(QUERY_INSERIR_ITENS, [
+                    _linha_item(ids[p['numero_venda']], item) for p in novas for item in p['itens']])
+                self.db.execute_many(QUERY_INSERIR_PAGAMENTOS, [
+                    _linha_pagamento(ids[p['numero_venda']], pagamento)
+                    for p in novas for pagamento in p['pagamentos']])
+                
+                faltas = Produto(self.db).atualizar_stock_lote(
+                    [item for p in novas for item in p['itens']])
+                # Resumos no dia em que a venda foi feita, não no dia do reenvio
+                self.resumos.registar_vendas([
+                    (p['venda'], p['itens'], p['pagamentos'], p['venda']['created_at'][:10]) for p in novas])
+                
+                for falta in faltas:
+                    print(f"⚠️  Diário offline: stock insuficiente para o produto {falta['produto_id']} "
+                          f"(pedido {falta['quantidade']}, disponível {falta['stock']})")
+        
+        self.diario.remover(numeros)
+        # O servidor respondeu: as próximas vendas voltam a ir diretamente para ele
+        self.diario.servidor_em_baixo = False
+        print(f"📤 Diário offline: {len(novas)} vendas enviadas ({len(existentes)} já existiam)")
+        return len(novas)
+    
     def obter_detalhes_venda_por_numero(self, numero_venda):
         """Obtém detalhes completos de uma venda pelo número"""
         # Venda principal
@@ -305,16 +397,3 @@ class Venda:
             'itens': itens,
             'pagamentos': pagamentos
         }
-    
-    def _limpar_venda_falha(self, venda_id):
-        """Limpa uma venda que falhou no processamento"""
-        try:
-            if venda_id:
-                print(f"🧹 Limpando venda falha ID {venda_id}...")
-                self.db.execute_insert("DELETE FROM venda_pagamentos WHERE venda_id = %s", (venda_id,))
-                self.db.execute_insert("DELETE FROM venda_itens WHERE venda_id = %s", (venda_id,))
-                self.db.execute_insert("DELETE FROM vendas WHERE id = %s", (venda_id,))
-                print("✅ Venda falha limpa")
-        except Exception as e:
-            print(f"❌ Erro ao limpar venda falha: {e}")
-            
\ No newline at end of file
@@ -0,0 +1,340 @@
+-- Arquivo schema_sqlite.sql
+-- Port do schema.sql para o motor SQLite ([Database] motor = sqlite no config.ini).
+-- Diferenças: AUTOINCREMENT, ENUM como CHECK, datas em hora local e updated_at por trigger.
+
+-- Tabela de empresas
+CREATE TABLE IF NOT EXISTS empresas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(255) NOT NULL,
+    nif VARCHAR(50),
+    telefone VARCHAR(20),
+    email VARCHAR(255),
+    endereco TEXT,
+    logo_path VARCHAR(500),
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime'))
+);
+
+-- Tabela de níveis de usuário
+CREATE TABLE IF NOT EXISTS niveis_usuario (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(50) NOT NULL,
+    descricao TEXT,
+    permissoes TEXT
+);
+
+-- Tabela de usuários
+CREATE TABLE IF NOT EXISTS usuarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    nivel_id INT NOT NULL,
+    nome VARCHAR(255) NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    senha VARCHAR(255) NOT NULL,
+    codigo_barras VARCHAR(100) UNIQUE,
+    ativo BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id),
+    FOREIGN KEY (nivel_id) REFERENCES niveis_usuario(id)
+);
+
+-- Tabela de taxas IVA
+CREATE TABLE IF NOT EXISTS taxas_iva (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    taxa DECIMAL(5,2) NOT NULL,
+    descricao VARCHAR(100) NOT NULL,
+    codigo VARCHAR(20),
+    ativo BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id)
+);
+
+-- Tabela de categorias
+CREATE TABLE IF NOT EXISTS categorias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    nome VARCHAR(255) NOT NULL,
+    descricao TEXT,
+    ativo BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id)
+);
+
+-- Tabela de produtos
+CREATE TABLE IF NOT EXISTS produtos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    categoria_id INT,
+    taxa_iva_id INT NOT NULL,
+    codigo_barras VARCHAR(100) UNIQUE,
+    referencia VARCHAR(100),
+    nome VARCHAR(255) NOT NULL,
+    descricao TEXT,
+    preco_compra DECIMAL(10,2) NOT NULL,
+    preco_venda DECIMAL(10,2) NOT NULL,
+    stock INT DEFAULT 0,
+    stock_minimo INT DEFAULT 0,
+    ativo BOOLEAN DEFAULT 1,
+    imagem_path VARCHAR(500),
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id),
+    FOREIGN KEY (categoria_id) REFERENCES categorias(id),
+    FOREIGN KEY (taxa_iva_id) REFERENCES taxas_iva(id)
+);
+
+-- Tabela de clientes
+CREATE TABLE IF NOT EXISTS clientes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    nome VARCHAR(255) NOT NULL,
+    telefone VARCHAR(20),
+    email VARCHAR(255),
+    nif VARCHAR(50),
+    endereco TEXT,
+    codigo_cartao VARCHAR(100) UNIQUE,
+    senha_cartao VARCHAR(255),
+    pontos_fidelidade INT DEFAULT 0,
+    ativo BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id)
+);
+
+-- Tabela de formas de pagamento
+CREATE TABLE IF NOT EXISTS formas_pagamento (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    nome VARCHAR(100) NOT NULL,
+    codigo VARCHAR(50) NOT NULL,
+    aceita_troco BOOLEAN DEFAULT 0,
+    ativo BOOLEAN DEFAULT 1,
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id)
+);
+
+-- Tabela de caixas
+CREATE TABLE IF NOT EXISTS caixas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    nome VARCHAR(100) NOT NULL,
+    localizacao VARCHAR(255),
+    impressora_tipo TEXT CHECK (impressora_tipo IN ('windows', 'usb', 'com', 'ethernet')) DEFAULT 'windows',
+    impressora_porta VARCHAR(255),
+    gaveta_dinheiro BOOLEAN DEFAULT 1,
+    ativo BOOLEAN DEFAULT 1,
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id)
+);
+
+-- Tabela de vendas
+CREATE TABLE IF NOT EXISTS vendas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    caixa_id INT NOT NULL,
+    usuario_id INT NOT NULL,
+    cliente_id INT,
+    numero_venda VARCHAR(50) UNIQUE NOT NULL,
+    total_sem_iva DECIMAL(10,2) NOT NULL,
+    total_iva DECIMAL(10,2) NOT NULL,
+    total_com_iva DECIMAL(10,2) NOT NULL,
+    troco DECIMAL(10,2) DEFAULT 0,
+    estado TEXT CHECK (estado IN ('pendente', 'paga', 'cancelada', 'devolvida')) DEFAULT 'pendente',
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id),
+    FOREIGN KEY (caixa_id) REFERENCES caixas(id),
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id),
+    FOREIGN KEY (cliente_id) REFERENCES clientes(id)
+);
+
+-- Tabela de itens de venda
+CREATE TABLE IF NOT EXISTS venda_itens (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    venda_id INT NOT NULL,
+    produto_id INT NOT NULL,
+    quantidade INT NOT NULL,
+    preco_unitario DECIMAL(10,2) NOT NULL,
+    taxa_iva_id INT NOT NULL,
+    valor_iva DECIMAL(10,2) NOT NULL,
+    subtotal DECIMAL(10,2) NOT NULL,
+    desconto DECIMAL(10,2) DEFAULT 0,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (venda_id) REFERENCES vendas(id) ON DELETE CASCADE,
+    FOREIGN KEY (produto_id) REFERENCES produtos(id),
+    FOREIGN KEY (taxa_iva_id) REFERENCES taxas_iva(id)
+);
+
+-- Tabela de pagamentos da venda
+CREATE TABLE IF NOT EXISTS venda_pagamentos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    venda_id INT NOT NULL,
+    forma_pagamento_id INT NOT NULL,
+    valor DECIMAL(10,2) NOT NULL,
+    troco DECIMAL(10,2) DEFAULT 0,
+    referencia VARCHAR(255),
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (venda_id) REFERENCES vendas(id) ON DELETE CASCADE,
+    FOREIGN KEY (forma_pagamento_id) REFERENCES formas_pagamento(id)
+);
+
+-- Sequência de números de venda por caixa (reservada em blocos)
+CREATE TABLE IF NOT EXISTS sequencias_venda (
+    caixa_id INT PRIMARY KEY,
+    proximo BIGINT NOT NULL DEFAULT 1,
+    FOREIGN KEY (caixa_id) REFERENCES caixas(id)
+);
+
+-- Tabela de promoções
+CREATE TABLE IF NOT EXISTS promocoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    nome VARCHAR(255) NOT NULL,
+    tipo TEXT CHECK (tipo IN ('percentagem', 'valor_fixo', 'produto_gratis')) NOT NULL,
+    valor DECIMAL(10,2),
+    data_inicio DATE NOT NULL,
+    data_fim DATE NOT NULL,
+    produtos_aplicaveis TEXT,
+    ativo BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id)
+);
+
+-- Tabela de movimentos de caixa
+CREATE TABLE IF NOT EXISTS movimentos_caixa (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    caixa_id INT NOT NULL,
+    usuario_id INT NOT NULL,
+    tipo TEXT CHECK (tipo IN ('abertura', 'fecho', 'sangria', 'suprimento')) NOT NULL,
+    valor DECIMAL(10,2) NOT NULL,
+    observacao TEXT,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (caixa_id) REFERENCES caixas(id),
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+);
+
+-- Tabela de devoluções
+CREATE TABLE IF NOT EXISTS devolucoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    venda_original_id INT NOT NULL,
+    usuario_id INT NOT NULL,
+    supervisor_id INT,
+    motivo TEXT,
+    valor_devolvido DECIMAL(10,2) NOT NULL,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (venda_original_id) REFERENCES vendas(id),
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id),
+    FOREIGN KEY (supervisor_id) REFERENCES usuarios(id)
+);
+
+-- Tabela de logs do sistema
+CREATE TABLE IF NOT EXISTS logs_sistema (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    usuario_id INT,
+    acao VARCHAR(255) NOT NULL,
+    descricao TEXT,
+    ip_address VARCHAR(45),
+    user_agent TEXT,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+);
+
+-- Tabela de configurações
+CREATE TABLE IF NOT EXISTS configuracoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa_id INT NOT NULL,
+    chave VARCHAR(255) NOT NULL,
+    valor TEXT,
+    created_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (DATETIME('now', 'localtime')),
+    FOREIGN KEY (empresa_id) REFERENCES empresas(id),
+    UNIQUE (empresa_id, chave)
+);
+
+-- updated_at automático (equivalente ao ON UPDATE CURRENT_TIMESTAMP do MySQL)
+CREATE TRIGGER IF NOT EXISTS empresas_updated_at AFTER UPDATE ON empresas
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE empresas SET updated_at = DATETIME('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS usuarios_updated_at AFTER UPDATE ON usuarios
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE usuarios SET updated_at = DATETIME('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS produtos_updated_at AFTER UPDATE ON produtos
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE produtos SET updated_at = DATETIME('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS vendas_updated_at AFTER UPDATE ON vendas
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE vendas SET updated_at = DATETIME('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS configuracoes_updated_at AFTER UPDATE ON configuracoes
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE configuracoes SET updated_at = DATETIME('now', 'localtime') WHERE id = NEW.id;
+END;
+
+-- Inserir dados iniciais
+INSERT OR IGNORE INTO empresas (id, nome, nif, telefone, email, endereco) VALUES 
+(1, 'SeekWeb Comércio', '5000000000', '+244 123 456 789', 'info@seekweb.com', 'Luanda, Angola');
+
+INSERT OR IGNORE INTO niveis_usuario (id, nome, descricao, permissoes) VALUES 
+(1, 'Administrador', 'Acesso total ao sistema', '{"vendas": true, "relatorios": true, "configuracoes": true, "usuarios": true, "produtos": true, "clientes": true, "caixa": true}'),
+(2, 'Supervisor', 'Supervisão e autorizações', '{"vendas": true, "relatorios": true, "configuracoes": false, "usuarios": false, "produtos": true, "clientes": true, "caixa": true, "autorizar_devolucoes": true, "sangria": true}'),
+(3, 'Vendedor', 'Apenas vendas', '{"vendas": true, "relatorios": false, "configuracoes": false, "usuarios": false, "produtos": true, "clientes": true, "caixa": false}');
+
+INSERT OR IGNORE INTO usuarios (id, empresa_id, nivel_id, nome, email, senha, codigo_barras) VALUES 
+(1, 1, 1, 'Administrador', 'admin@seekweb.com', 'admin123', 'SUP001'),
+(2, 1, 2, 'Supervisor', 'supervisor@seekweb.com', 'super123', 'SUP002'),
+(3, 1, 3, 'Vendedor', 'vendedor@seekweb.com', 'vend123', 'VEN001');
+
+INSERT OR IGNORE INTO taxas_iva (id, empresa_id, taxa, descricao, codigo) VALUES 
+(1, 1, 14.00, 'IVA Normal 14%', 'IVA14'),
+(2, 1, 7.00, 'IVA Reduzido 7%', 'IVA7'),
+(3, 1, 5.00, 'IVA Super Reduzido 5%', 'IVA5'),
+(4, 1, 0.00, 'Isento de IVA', 'ISENTO');
+
+INSERT OR IGNORE INTO categorias (id, empresa_id, nome, descricao) VALUES 
+(1, 1, 'Electrónica', 'Produtos electrónicos'),
+(2, 1, 'Informática', 'Computadores e acessórios'),
+(3, 1, 'Telefonia', 'Telemóveis e tablets'),
+(4, 1, 'Escritório', 'Material de escritório');
+
+INSERT OR IGNORE INTO formas_pagamento (id, empresa_id, nome, codigo, aceita_troco) VALUES 
+(1, 1, 'Dinheiro', 'DINHEIRO', 1),
+(2, 1, 'Cartão Débito', 'CARTAO_DEBITO', 0),
+(3, 1, 'Cartão Crédito', 'CARTAO_CREDITO', 0),
+(4, 1, 'Transferência', 'TRANSFERENCIA', 0),
+(5, 1, 'Cartão Cliente', 'CARTAO_CLIENTE', 0);
+
+INSERT OR IGNORE INTO caixas (id, empresa_id, nome, localizacao, impressora_tipo) VALUES 
+(1, 1, 'Caixa 1', 'Loja Principal - Balcão 1', 'windows'),
+(2, 1, 'Caixa 2', 'Loja Principal - Balcão 2', 'usb');
+
+INSERT OR IGNORE INTO produtos (id, empresa_id, categoria_id, taxa_iva_id, codigo_barras, referencia, nome, descricao, preco_compra, preco_venda, stock) VALUES 
+(1, 1, 1, 1, '7891234567890', 'SMX001', 'Smartphone X', 'Smartphone Android 128GB', 15000.00, 25000.00, 50),
+(2, 1, 1, 1, '7891234567891', 'TAB001', 'Tablet Pro', 'Tablet 10 polegadas 64GB', 8000.00, 15000.00, 30),
+(3, 1, 2, 1, '7891234567892', 'LAP001', 'Laptop Business', 'Laptop Intel i5 8GB RAM', 35000.00, 50000.00, 20),
+(4, 1, 2, 1, '7891234567893', 'MOUSE001', 'Mouse Óptico', 'Mouse USB óptico', 500.00, 1500.00, 100),
+(5, 1, 4, 2, '7891234567894', 'CAD001', 'Caderno A4', 'Caderno 200 folhas', 300.00, 800.00, 200),
+(6, 1, 4, 2, '7891234567895', 'CAN001', 'Caneta Esferográfica', 'Caneta azul ponta fina', 50.00, 200.00, 500);
+
+INSERT OR IGNORE INTO clientes (id, empresa_id, nome, telefone, email, nif, codigo_cartao, senha_cartao, pontos_fidelidade) VALUES 
+(1, 1, 'Cliente Frequente', '+244 923 456 789', 'cliente@email.com', '123456789LA', 'CLI001', '1234', 150),
+(2, 1, 'Maria Silva', '+244 924 567 890', 'maria@email.com', '987654321LA', 'CLI002', '5678', 75);
+
+INSERT OR IGNORE INTO configuracoes (empresa_id, chave, valor) VALUES 
+(1, 'moeda', 'Kz'),
+(1, 'iva_activo', 'true'),
+(1, 'som_activo', 'true'),
+(1, 'local_recibos', '/recibos/'),
+(1, 'logs_activo', 'true'),
+(1, 'troco_activo', 'true'),
+(1, 'codigo_barras_supervisor', 'SUP001');
@@ -24,6 +24,11 @@ def create_database_schema():
     """Cria a base de dados e tabelas"""
     print("🗄️ Criando base de dados...")
     
+    config = configparser.ConfigParser()
+    config.read('config.ini')
+    if config.get('Database', 'motor', fallback='mysql') == 'sqlite':
+        return create_sqlite_schema(config.get('Database', 'ficheiro', fallback='dados/seekweb.db'))
+    
     try:
         # Conectar ao MySQL (sem especificar base de dados)
         conn = mysql.connector.connect(
@@ -60,6 +65,66 @@ def create_database_schema():
         print(f"❌ Erro ao criar base de dados: {e}")
         return False
 
+def create_sqlite_schema(ficheiro):
+    """Cria as tabelas no ficheiro SQLite (motor = sqlite no config.ini)"""
+    from core.motores import MotorSQLite
+    
+    try:
+        MotorSQLite.aplicar_schema(ficheiro, 'schema_sqlite.sql')
+        print(f"✅ Tabelas criadas em {ficheiro}!")
+        return True
+    except Exception as e:
+        print(f"❌ Erro ao criar base de dados SQLite: {e}")
+        return False
+
+def run_migrations():
+    """Aplica as migrações de migracoes/ ainda não registadas (índices, alterações ao schema)"""
+    from core.config import Config
+    from core.database import Database
+    from core.migracoes import atualizar_base_dados
+    
+    print("🔧 Aplicando migrações...")
+    try:
+        db = Database(Config('config.ini'))
+        sucesso = atualizar_base_dados(db)
+        db.close()
+        return sucesso
+    except Exception as e:
+        print(f"❌ Erro ao aplicar migrações: {e}")
+        return False
+
+def rebuild_summaries():
+    """Recalcula os resumos diários do dashboard e dos relatórios a partir das vendas"""
+    from core.config import Config
+    from core.database import Database
+    from models.resumos import ResumosDiarios
+    
+    print("📊 Reconstruindo resumos diários...")
+    try:
+        db = Database(Config('config.ini'))
+        ResumosDiarios(db).reconstruir()
+        db.close()
+        return True
+    except Exception as e:
+        print(f"❌ Erro ao reconstruir resumos: {e}")
+        return False
+
+def check_indexes():
+    """Verifica com EXPLAIN se as consultas críticas usam os índices das migrações"""
+    from core.config import Config
+    from core.database import Database
+    from core.migracoes import Migracoes
+    
+    print("🔍 Verificando índices das consultas críticas...")
+    db = Database(Config('config.ini'))
+    falhas = Migracoes(db).verificar_indices()
+    db.close()
+    if falhas:
+        print(f"\n⚠️ {len(falhas)} acesso(s) sem o índice esperado")
+    else:
+        print("\n✅ Todas as consultas críticas usam os índices")
+    return not falhas
+
 def create_config_file():
     """Cria ficheiro de configuração"""
     print("⚙️ Criando ficheiro de configuração...")
@@ -67,12 +132,38 @@ def create_config_file():
     config = configparser.ConfigParser()
     
     # Secção Database
+    # motor: mysql (várias caixas) ou sqlite (uma só caixa, ficheiro local em 'ficheiro')
     config['Database'] = {
+        'motor': 'mysql',
+        'ficheiro': 'dados/seekweb.db',
         'host': 'localhost',
         'user': 'root', 
         'password': '',
         'database': 'bd_seekweb',
-        'port': '3306'
+        'port': '3306',
+        'pool_size': '5',
+        'pool_timeout': '10',
+        'pool_ping_intervalo': '30',
+        'timeout_ligacao': '3',
+        'timeout_leitura': '10'
+    }
+    
+    # Secção Offline (diário local de vendas sem ligação ao MySQL)
+    config['Offline'] = {
+        'ativo': 'true',
+        'ficheiro': 'dados/diario_vendas.db',
+        'intervalo_reenvio': '30'
+    }
+    
+    # Secção Catalogo (índice de produtos em memória)
+    config['Catalogo'] = {
+        'intervalo_atualizacao': '5',
+        'recarga_completa': '300'
+    }
+    
+    # Secção Definicoes (verificação de alterações ao config.ini e às configurações da base de dados)
+    config['Definicoes'] = {
+        'intervalo_verificacao': '10'
     }
     
     # Secção Impressora
@@ -103,7 +194,8 @@ def create_config_file():
         'activo': 'true',
         'volume': '80',
         'som_venda': 'venda.wav',
-        'som_erro': 'erro.wav'
+        'som_erro': 'erro.wav',
+        'som_scan': 'scan.wav'
     }
     
     # Secção Scanner
@@ -111,7 +203,14 @@ def create_config_file():
         'tipo': 'usb',
         'porta_usb': '',
         'porta_com': 'COM1',
-        'velocidade': '9600'
+        'velocidade': '9600',
+        'timeout': '1',
+        'terminadores': 'CR,LF',
+        'reconexao_maxima': '30',
+        'intervalo_teclas_ms': '30',
+        'comprimento_minimo': '4',
+        'fila_maxima': '50',
+        'janela_duplicados_ms': '300'
     }
     
     # Secção Caixa
@@ -120,7 +219,10 @@ def create_config_file():
         'iva_activo': 'true',
         'troco_activo': 'true',
         'local_recibos': 'recibos/',
-        'logs_activo': 'true'
+        'logs_activo': 'true',
+        'bloco_numeracao': '50',
+        'processos_recibos': '1',
+        'fila_recibos': '8'
     }
     
     # Secção Seguranca
@@ -153,7 +255,7 @@ def create_directories():
     """Cria diretórios necessários"""
     print("📁 Criando diretórios...")
     
-    directories = ['recibos', 'logs', 'sons']
+    directories = ['recibos', 'logs', 'sons', 'dados']
     
     for directory in directories:
         if not os.path.exists(directory):
@@ -176,7 +278,7 @@ def main():
     # Instalar dependências
     if install_dependencies():
         # Criar base de dados
-        if create_database_schema():
+        if create_database_schema() and run_migrations():
             print("\n🎉 CONFIGURAÇÃO CONCLUÍDA COM SUCESSO!")
             print("\n📝 PARA INICIAR O SISTEMA:")
             print("   python main.py")
@@ -190,4 +292,14 @@ def main():
         print("\n❌ Erro na instalação de dependências")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python setup.py --migrar: só migrações (instalações existentes)
+    # python setup.py --verificar-indices: EXPLAIN das consultas críticas
+    # python setup.py --reconstruir-resumos: recalcula os resumos diários a partir das vendas
+    if '--migrar' in sys.argv:
+        sys.exit(0 if run_migrations() else 1)
+    elif '--reconstruir-resumos' in sys.argv:
+        sys.exit(0 if rebuild_summaries() else 1)
+    elif '--verificar-indices' in sys.argv:
+        sys.exit(0 if check_indexes() else 1)
+    else:
+        main()
\ No newline at end of file
@@ -177,6 +177,13 @@ CREATE TABLE venda_pagamentos (
     FOREIGN KEY (forma_pagamento_id) REFERENCES formas_pagamento(id)
 );
 
+-- Sequência de números de venda por caixa (reservada em blocos)
+CREATE TABLE sequencias_venda (
+    caixa_id INT PRIMARY KEY,
+    proximo BIGINT NOT NULL DEFAULT 1,
+    FOREIGN KEY (caixa_id) REFERENCES caixas(id)
+);
+
 -- Tabela de promoções
 CREATE TABLE promocoes (
     id INT PRIMARY KEY AUTO_INCREMENT,
@@ -1,13 +1,24 @@
-import pygame
 import os
 
 class Audio:
     def __init__(self, config):
         self.config = config
-        self.ativo = config.getboolean('Audio', 'activo')
-        
-        if self.ativo:
+        self._sons = {}
+        # pygame só é importado quando o primeiro som toca (ou em preparar(), depois do login)
+        self._pygame = None
+    
+    @property
+    def ativo(self):
+        # Lido a cada som: com Definicoes é uma consulta a um dicionário e segue as alterações
+        return self.config.getboolean('Audio', 'activo')
+    
+    def preparar(self):
+        """Importa o pygame e inicia o mixer; pode correr fora da thread da GUI"""
+        if self.ativo and self._pygame is None:
+            import pygame
             pygame.mixer.init()
+            self._pygame = pygame
+        return self._pygame
     
     def play_som(self, tipo):
         """Reproduz som conforme tipo"""
@@ -19,12 +30,17 @@ class Audio:
                 arquivo = self.config.get('Audio', 'som_venda')
             elif tipo == 'erro':
                 arquivo = self.config.get('Audio', 'som_erro')
+            elif tipo == 'scan':
+                arquivo = self.config.get('Audio', 'som_scan', fallback='scan.wav')
             else:
                 return
             
-            if os.path.exists(arquivo):
-                pygame.mixer.music.load(arquivo)
-                pygame.mixer.music.play()
+            # Sons em cache: cada leitura toca de imediato, sem voltar a ler o ficheiro
+            som = self._sons.get(arquivo)
+            if som is None and os.path.exists(arquivo):
+                som = self._sons[arquivo] = self.preparar().mixer.Sound(arquivo)
+            if som:
+                som.play()
                 
         except Exception as e:
             print(f"Erro ao reproduzir áudio: {e}")
\ No newline at end of file
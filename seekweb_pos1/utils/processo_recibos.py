@@ -0,0 +1,16 @@
+"""Funções corridas nos processos do RenderizadorRecibos.
+
+Sem Qt e sem reportlab no topo: o processo de recibos importa só este módulo e o utils.recibo,
+e a caixa pode importá-lo sem carregar o reportlab.
+"""
+
+def renderizar(local_recibos, instantaneo):
+    """Gera o PDF do instantâneo da venda e devolve o caminho do ficheiro"""
+    from utils.recibo import renderizar_recibo
+    return renderizar_recibo(local_recibos, instantaneo)
+
+def aquecer():
+    """Importa o reportlab e cria os estilos antes do primeiro recibo"""
+    from utils.recibo import estilos_recibo
+    estilos_recibo()
+    return True
@@ -10,16 +10,61 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from decimal import Decimal
 
+_estilos = None
+_geradores = {}
+
+def estilos_recibo():
+    """Estilos dos recibos, criados uma vez por processo"""
+    global _estilos
+    if _estilos is None:
+        styles = getSampleStyleSheet()
+        _estilos = {
+            'titulo': ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=16,
+                spaceAfter=30,
+                alignment=1,  # Centro
+                textColor=colors.HexColor('#2c3e50')
+            ),
+            'normal': ParagraphStyle(
+                'CustomNormal',
+                parent=styles['Normal'],
+                fontSize=10,
+                spaceAfter=12
+            ),
+            'negrito': ParagraphStyle(
+                'CustomBold',
+                parent=styles['Normal'],
+                fontSize=10,
+                spaceAfter=12,
+                textColor=colors.HexColor('#2c3e50')
+            )
+        }
+    return _estilos
+
+def renderizar_recibo(local_recibos, instantaneo):
+    """Gera o PDF a partir do instantâneo da venda (chamado nos processos do RenderizadorRecibos)"""
+    gerador = _geradores.get(local_recibos)
+    if gerador is None:
+        gerador = _geradores[local_recibos] = GeradorRecibos(None, local_recibos)
+    ficheiro = gerador.gerar_recibo_venda(instantaneo['venda'], instantaneo['itens'],
+                                          instantaneo['pagamentos'], instantaneo['empresa'])
+    if not ficheiro:
+        raise RuntimeError(f"Não foi possível gerar o recibo {instantaneo['venda'].get('numero_venda')}")
+    return ficheiro
+
 class GeradorRecibos:
-    def __init__(self, config):
+    def __init__(self, config, local_recibos=None):
         self.config = config
-        self.local_recibos = config.get('Caixa', 'local_recibos', fallback='recibos/')
+        self.local_recibos = local_recibos or config.get('Caixa', 'local_recibos', fallback='recibos/')
         self.setup_diretorio()
     
     def setup_diretorio(self):
         """Cria o diretório de recibos se não existir"""
         if not os.path.exists(self.local_recibos):
-            os.makedirs(self.local_recibos)
+            # Vários processos de recibos podem criá-lo ao mesmo tempo
+            os.makedirs(self.local_recibos, exist_ok=True)
             print(f"✅ Diretório de recibos criado: {self.local_recibos}")
     
     def gerar_recibo_venda(self, dados_venda, itens, pagamentos, empresa_info):
@@ -38,32 +83,10 @@ class GeradorRecibos:
             )
             
             story = []
-            styles = getSampleStyleSheet()
-            
-            # Estilo personalizado para o recibo
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=30,
-                alignment=1,  # Centro
-                textColor=colors.HexColor('#2c3e50')
-            )
-            
-            estilo_normal = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=12
-            )
-            
-            estilo_negrito = ParagraphStyle(
-                'CustomBold',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=12,
-                textColor=colors.HexColor('#2c3e50')
-            )
+            estilos = estilos_recibo()
+            estilo_titulo = estilos['titulo']
+            estilo_normal = estilos['normal']
+            estilo_negrito = estilos['negrito']
             
             # Cabeçalho
             story.append(Paragraph("<b>SEEKWEB COMÉRCIO</b>", estilo_titulo))
@@ -1,113 +1,308 @@
-import serial
+import re
 import time
 import threading
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QEvent, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QKeyEvent
+from PyQt5.QtWidgets import QApplication
+
+# Nomes aceites em [Scanner] terminadores (além de hexadecimal, ex.: 0x0D)
+TERMINADORES = {'CR': b'\r', 'LF': b'\n', 'TAB': b'\t', 'ETX': b'\x03', 'EOT': b'\x04'}
+
+def ler_terminadores(texto):
+    """'CR,LF' ou '0x0D,0x03' -> bytes com os terminadores"""
+    terminadores = bytearray()
+    for nome in (texto or '').replace(' ', '').split(','):
+        if not nome:
+            continue
+        if nome.upper() in TERMINADORES:
+            terminadores += TERMINADORES[nome.upper()]
+        else:
+            terminadores.append(int(nome, 16))
+    return bytes(terminadores) or b'\r\n'
+
+class DetetorTeclado(QObject):
+    """Filtro de eventos da aplicação que separa leituras de scanners USB (teclado) da escrita humana.
+
+    Um scanner "escreve" o código inteiro com poucos ms entre teclas; uma pessoa demora dezenas.
+    As teclas que chegam depressa ficam retidas: se formam um código (pelo menos
+    comprimento_minimo caracteres, terminados por Enter ou por uma pausa) são emitidas em
+    codigo_lido e nunca chegam ao widget com foco; senão são reenviadas a esse widget.
+    """
+    codigo_lido = pyqtSignal(str, float)
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        # Intervalo máximo entre teclas de uma leitura e pausa que fecha uma leitura sem Enter
+        self.intervalo_maximo = config.getint('Scanner', 'intervalo_teclas_ms', fallback=30)
+        self.comprimento_minimo = config.getint('Scanner', 'comprimento_minimo', fallback=4)
+        self.instalado = False
+        self._retidas = []  # (widget, cópia do QKeyEvent)
+        self._inicio = 0.0
+        self._ultima_tecla = 0
+        self._reenviando = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fim_de_rajada)
+
+    def instalar(self):
+        if not self.instalado:
+            QApplication.instance().installEventFilter(self)
+            self.instalado = True
+
+    def remover(self):
+        if self.instalado:
+            QApplication.instance().removeEventFilter(self)
+            self.instalado = False
+            self._reenviar()
+
+    def eventFilter(self, obj, event):
+        if (self._reenviando or event.type() != QEvent.KeyPress or not obj.isWidgetType()
+                or QApplication.activeModalWidget() is not None):
+            return False
+
+        # Hora do evento no sistema (ms): não depende de a thread da GUI estar ocupada
+        instante = event.timestamp() or int(time.monotonic() * 1000)
+        rapida = bool(self._retidas) and instante - self._ultima_tecla <= self.intervalo_maximo
+
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter):
+            if rapida and len(self._retidas) >= self.comprimento_minimo:
+                self._emitir()
+                return True
+            self._reenviar()  # O Enter segue depois das teclas que estavam retidas
+            return False
+
+        texto = event.text()
+        if (not texto or not texto.isprintable() or event.isAutoRepeat()
+                or event.modifiers() & (Qt.ControlModifier | Qt.AltModifier)):
+            self._reenviar()
+            return False
+
+        if self._retidas and not rapida:
+            self._fim_de_rajada()
+        if not self._retidas:
+            self._inicio = time.monotonic()
+        self._retidas.append((obj, QKeyEvent(event.type(), event.key(), event.modifiers(), texto,
+                                             event.isAutoRepeat(), event.count())))
+        self._ultima_tecla = instante
+        # Uma pausa também fecha a rajada (scanners sem Enter no fim, ou uma pessoa a escrever)
+        self._timer.start(self.intervalo_maximo * 3)
+        return True
+
+    def _fim_de_rajada(self):
+        self._timer.stop()
+        if len(self._retidas) >= self.comprimento_minimo:
+            self._emitir()
+        else:
+            self._reenviar()
+
+    def _emitir(self):
+        self._timer.stop()
+        codigo = ''.join(evento.text() for _, evento in self._retidas).strip()
+        self._retidas = []
+        if codigo:
+            self.codigo_lido.emit(codigo, self._inicio)
+
+    def _reenviar(self):
+        """Entrega as teclas retidas ao widget a que se destinavam (era uma pessoa a escrever)"""
+        self._timer.stop()
+        retidas, self._retidas = self._retidas, []
+        self._reenviando = True
+        try:
+            for widget, evento in retidas:
+                QApplication.sendEvent(widget, evento)
+        except RuntimeError:
+            pass  # Widget destruído entretanto
+        finally:
+            self._reenviando = False
 
 class Scanner(QObject):
-    codigo_lido = pyqtSignal(str)  # Sinal emitido quando um código é lido
-    
+    # Código lido e instante da captura (time.monotonic()), para medir a latência até ao carrinho
+    codigo_lido = pyqtSignal(str, float)
+    ligacao_alterada = pyqtSignal(bool)  # Scanner COM ligado/desligado
+
+    # Sem terminador ao fim de tantos bytes é ruído na linha: o buffer é descartado
+    TAMANHO_MAXIMO = 256
+    ESPERA_INICIAL = 0.5
+
     def __init__(self, config):
         super().__init__()
         self.config = config
         self.serial_conn = None
         self.leitura_ativa = False
         self.thread_leitura = None
+        self.tipo = 'usb'
+        self.timeout = 1
+        self._parar = threading.Event()
+        # Buffer de enquadramento reutilizado entre leituras
+        self._buffer = bytearray()
+        self.detetor = None
         self.setup_scanner()
-    
+
     def setup_scanner(self):
         """Configura conexão com scanner baseado no tipo"""
         try:
-            tipo = self.config.get('Scanner', 'tipo', fallback='usb')
-            
-            if tipo == 'com':
-                porta = self.config.get('Scanner', 'porta_com', fallback='COM1')
-                velocidade = self.config.getint('Scanner', 'velocidade', fallback=9600)
-                
-                print(f"🔌 Tentando conectar scanner na porta {porta}...")
-                self.serial_conn = serial.Serial(
-                    port=porta,
-                    baudrate=velocidade,
-                    bytesize=serial.EIGHTBITS,
-                    parity=serial.PARITY_NONE,
-                    stopbits=serial.STOPBITS_ONE,
-                    timeout=1
-                )
-                print(f"✅ Scanner conectado na porta {porta}")
-                
-            elif tipo == 'usb':
-                print("🔌 Scanner USB - Aguardando leitura via emulação de teclado")
-                # Para scanners USB que emulam teclado, não precisa de configuração serial
-                
+            self.tipo = self.config.get('Scanner', 'tipo', fallback='usb')
+
+            if self.tipo == 'com':
+                self.porta = self.config.get('Scanner', 'porta_com', fallback='COM1')
+                self.velocidade = self.config.getint('Scanner', 'velocidade', fallback=9600)
+                # A leitura bloqueia no máximo este tempo: é o atraso máximo para parar a thread
+                self.timeout = self.config.getint('Scanner', 'timeout', fallback=1)
+                self.espera_maxima = self.config.getint('Scanner', 'reconexao_maxima', fallback=30)
+                terminadores = ler_terminadores(self.config.get('Scanner', 'terminadores', fallback='CR,LF'))
+                self._fim_codigo = re.compile(b'[' + re.escape(terminadores) + b']')
+                self._ligar()
+
             else:
-                print("🔌 Scanner Windows - Usando entrada padrão")
-                
+                # Scanners USB que emulam teclado: as leituras são reconhecidas pelo ritmo das teclas
+                self.detetor = DetetorTeclado(self.config, self)
+                self.detetor.codigo_lido.connect(self.codigo_lido.emit)
+                print("🔌 Scanner USB - Aguardando leitura via emulação de teclado")
+
         except Exception as e:
             print(f"❌ Erro ao conectar scanner: {e}")
-    
+
+    def _ligar(self):
+        """Abre a porta COM; False se não foi possível (a thread de leitura volta a tentar)"""
+        # pyserial só é necessário (e importado) para scanners em porta COM
+        import serial
+
+        print(f"🔌 Tentando conectar scanner na porta {self.porta}...")
+        try:
+            self.serial_conn = serial.Serial(
+                port=self.porta,
+                baudrate=self.velocidade,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                timeout=self.timeout
+            )
+        except (serial.SerialException, OSError, ValueError) as e:
+            print(f"❌ Erro ao conectar scanner: {e}")
+            self.serial_conn = None
+            return False
+
+        self._buffer.clear()
+        print(f"✅ Scanner conectado na porta {self.porta}")
+        self.ligacao_alterada.emit(True)
+        return True
+
+    def _desligar(self):
+        if self.serial_conn is not None:
+            try:
+                self.serial_conn.close()
+            except Exception:
+                pass
+            self.serial_conn = None
+            self.ligacao_alterada.emit(False)
+
     def iniciar_leitura(self):
         """Inicia a leitura contínua do scanner"""
         if self.leitura_ativa:
             return
-            
+
         self.leitura_ativa = True
-        
-        # Se for scanner COM, inicia thread de leitura
-        if self.serial_conn and self.config.get('Scanner', 'tipo') == 'com':
-            self.thread_leitura = threading.Thread(target=self._ler_serial_continuo)
+
+        # Se for scanner COM, inicia thread de leitura (que também religa a porta se cair)
+        if self.tipo == 'com':
+            self._parar.clear()
+            self.thread_leitura = threading.Thread(target=self._ler_serial_continuo, name='scanner-com')
             self.thread_leitura.daemon = True
             self.thread_leitura.start()
             print("📡 Iniciando leitura contínua do scanner COM...")
         else:
             print("📡 Scanner pronto para leitura (USB/Teclado)")
-    
+
     def parar_leitura(self):
         """Para a leitura do scanner"""
         self.leitura_ativa = False
+        self._parar.set()
+        if self.serial_conn is not None and hasattr(self.serial_conn, 'cancel_read'):
+            # Acorda o read() bloqueado em vez de esperar pelo timeout
+            self.serial_conn.cancel_read()
         if self.thread_leitura:
-            self.thread_leitura.join(timeout=1)
+            self.thread_leitura.join(timeout=self.timeout + 1 if self.tipo == 'com' else 1)
+            self.thread_leitura = None
         print("⏹️ Leitura do scanner parada")
-    
+
     def _ler_serial_continuo(self):
-        """Lê dados continuamente da porta serial (para scanners COM)"""
-        buffer = ""
-        while self.leitura_ativa:
+        """Lê a porta serial em modo bloqueante (para scanners COM).
+
+        A thread dorme dentro do read() até chegar um byte; não há polling. Se a porta falhar,
+        volta a abri-la com espera crescente (ESPERA_INICIAL a dobrar até reconexao_maxima).
+        """
+        espera = self.ESPERA_INICIAL
+        while not self._parar.is_set():
+            if self.serial_conn is None:
+                if not self._ligar():
+                    self._parar.wait(espera)
+                    espera = min(espera * 2, self.espera_maxima)
+                    continue
+                espera = self.ESPERA_INICIAL
+
             try:
-                if self.serial_conn and self.serial_conn.in_waiting:
-                    dados = self.serial_conn.read(self.serial_conn.in_waiting).decode('utf-8', errors='ignore')
-                    
-                    for char in dados:
-                        if char == '\r' or char == '\n':  # Fim do código
-                            if buffer.strip():
-                                codigo = buffer.strip()
-                                print(f"📦 Código lido: {codigo}")
-                                self.codigo_lido.emit(codigo)
-                                buffer = ""
-                        else:
-                            buffer += char
-                            
-                time.sleep(0.01)  # Pequena pausa para não sobrecarregar
-                
+                # Bloqueia até ao primeiro byte (ou ao timeout) e depois leva o que já chegou
+                dados = self.serial_conn.read(1)
+                if not dados:
+                    continue
+                capturado = time.monotonic()
+                pendentes = self.serial_conn.in_waiting
+                if pendentes:
+                    dados += self.serial_conn.read(pendentes)
+                self._enquadrar(dados, capturado)
+
             except Exception as e:
-                print(f"❌ Erro na leitura serial: {e}")
-                time.sleep(1)  # Espera antes de tentar novamente
-    
+                if self._parar.is_set():
+                    break
+                print(f"❌ Erro na leitura serial: {e}; a religar o scanner")
+                self._desligar()
+
+    def _enquadrar(self, dados, capturado):
+        """Junta os bytes ao buffer e emite cada código terminado"""
+        buffer = self._buffer
+        buffer += dados
+        inicio = 0
+        for fim in self._fim_codigo.finditer(buffer):
+            codigo = buffer[inicio:fim.start()].decode('utf-8', errors='ignore').strip()
+            inicio = fim.end()
+            if codigo:
+                self.codigo_lido.emit(codigo, capturado)
+        del buffer[:inicio]
+
+        if len(buffer) > self.TAMANHO_MAXIMO:
+            print(f"⚠️ Scanner: {len(buffer)} bytes sem terminador descartados")
+            buffer.clear()
+
     def simular_leitura_teclado(self, codigo):
         """Simula leitura de código para scanners USB/teclado"""
         if self.leitura_ativa:
             print(f"📦 Código simulado: {codigo}")
-            self.codigo_lido.emit(codigo)
-    
-    def processar_entrada_teclado(self, event):
-        """Processa entrada de teclado para capturar códigos de barras"""
-        # Esta função será chamada pelo evento de teclado da interface
-        if hasattr(event, 'text') and event.text().strip():
-            # Para scanners que emulam teclado, geralmente enviam o código rapidamente
-            # Podemos acumular caracteres e detectar quando o código completo foi lido
-            print(f"Tecla pressionada: {event.text()}")
-    
+            self.codigo_lido.emit(codigo, time.monotonic())
+
+    def captar_teclado(self, ativo):
+        """Liga/desliga o detetor de leituras por teclado (só enquanto o ecrã de vendas está visível)"""
+        if self.detetor is None:
+            return
+        if ativo:
+            self.detetor.instalar()
+        else:
+            self.detetor.remover()
+
+    def reconfigurar(self):
+        """Volta a ligar o scanner com as definições atuais (porta, velocidade ou tipo alterados)"""
+        estava_ativa = self.leitura_ativa
+        captava = self.detetor is not None and self.detetor.instalado
+        self.fechar()
+        self.detetor = None
+        self.setup_scanner()
+        if estava_ativa:
+            self.iniciar_leitura()
+        self.captar_teclado(captava)
+
     def fechar(self):
         """Fecha a conexão com o scanner"""
         self.parar_leitura()
+        self.captar_teclado(False)
         if self.serial_conn and self.serial_conn.is_open:
-            self.serial_conn.close()
-            print("🔌 Conexão serial fechada")
\ No newline at end of file
+            self._desligar()
+            print("🔌 Conexão serial fechada")